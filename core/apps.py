@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        # Connexion des receivers de signaux (invalidation du cache, etc.)
+        from . import signals  # noqa: F401
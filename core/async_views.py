@@ -0,0 +1,238 @@
+import asyncio
+import json
+from datetime import date as date_type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotAuthenticated,
+    NotFound,
+    ValidationError,
+)
+from rest_framework.request import Request
+
+from .authentication import ClaimsUser, CookieJWTAuthentication
+from .cache import aget_generation, record, response_cache_key
+from .db_router import use_primary
+from .fast_serializers import fast_serializer_for, page_values
+from .live import broadcaster
+from .models import Room, Talk
+from .pagination import RoomCursorPagination, TalkCursorPagination
+from .querysets import filter_talks, optimize_queryset
+from .renderers import FastJSONRenderer
+from .serializers import RoomSerializer, TalkSerializer
+
+# Vues de lecture asynchrones (ASGI) du planning : même JSON et mêmes curseurs que les
+# vues DRF, mais l'attente de la base ne bloque pas un thread par connexion ouverte.
+
+
+class AsyncReadView(View):
+    """
+    Base des vues de lecture asynchrones. Une sous-classe fournit read() et les attributs
+    listés dans required_attributes, vérifiés par as_view().
+
+    Les lectures n'exigent qu'un utilisateur authentifié et actif, comme IsAuthenticated
+    sur les vues DRF ; l'utilisateur est lu via user_cache, une fois par jeton.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+    serializer_class = None
+    renderer = FastJSONRenderer()
+    required_attributes = ('read',)
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Vue incomplète : erreur au chargement des URL plutôt qu'à la première requête
+        missing = [name for name in cls.required_attributes if getattr(cls, name, None) is None]
+        if missing:
+            raise ImproperlyConfigured(f"{cls.__name__} doit définir {', '.join(missing)}.")
+        return super().as_view(**initkwargs)
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.user = await self.authenticate(request)
+            data = await self.read(Request(request), **kwargs)
+        except APIException as exc:
+            response = self.render({'detail': exc.detail}, exc.status_code)
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                response['WWW-Authenticate'] = CookieJWTAuthentication().authenticate_header(request)
+            return response
+        return self.render(data)
+
+    async def authenticate(self, request):
+        authentication = CookieJWTAuthentication()
+        token = authentication.get_request_token(request)
+        if token is None:
+            raise NotAuthenticated()
+        if settings.AUTH_USER_CACHE['STATELESS']:
+            # Mode sans état, comme les lectures DRF : seules les claims du jeton
+            return ClaimsUser(token)
+        user = await authentication.aget_user(token)
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive or deleted.')
+        return user
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(data), status=status_code, content_type='application/json'
+        )
+
+
+class AsyncListView(AsyncReadView):
+    """
+    Liste paginée, mise en cache comme les listes DRF (clé liée à la génération du
+    planning) : une page en cache est servie sans passer par la base.
+    """
+
+    pagination_class = None
+    # get_queryset(request, **kwargs) : requête de la liste, à définir par la sous-classe
+    required_attributes = ('serializer_class', 'pagination_class', 'get_queryset')
+
+    async def read(self, request, **kwargs):
+        endpoint = type(self).__name__
+        key = response_cache_key(endpoint, request, await aget_generation())
+        data = await cache.aget(key)
+        if data is not None:
+            record(endpoint, 'hits')
+            return data
+
+        record(endpoint, 'misses')
+        # Mise en cache sous la génération : page lue sur le primaire
+        with use_primary():
+            data = await self.read_page(request, **kwargs)
+        await cache.aset(key, data, settings.SCHEDULE_CACHE_TIMEOUT)
+        return data
+
+    async def read_page(self, request, **kwargs):
+        queryset = optimize_queryset(self.get_queryset(request, **kwargs), self.serializer_class)
+        paginator = self.pagination_class()
+        page_queryset = paginator.get_page_queryset(queryset, request)
+        fast = fast_serializer_for(self.serializer_class)
+        if fast is not None:
+            page_queryset = page_values(fast, page_queryset, paginator.ordering)
+        page = paginator.set_page([obj async for obj in page_queryset.aiterator()])
+        if fast is not None:
+            data = fast.serialize(page)
+        else:
+            data = self.serializer_class(page, many=True).data
+        return paginator.get_paginated_response(data).data
+
+
+class AsyncDetailView(AsyncReadView):
+    model = None
+    required_attributes = ('serializer_class', 'model')
+
+    async def read(self, request, pk):
+        queryset = optimize_queryset(self.model.objects.filter(pk=pk), self.serializer_class)
+        obj = await queryset.afirst()
+        if obj is None:
+            raise NotFound()
+        return self.serializer_class(obj).data
+
+
+class AsyncTalkListView(AsyncListView):
+    serializer_class = TalkSerializer
+    pagination_class = TalkCursorPagination
+
+    def get_queryset(self, request):
+        return filter_talks(Talk.objects.all(), request.query_params)
+
+
+class AsyncTalksByDateView(AsyncListView):
+    serializer_class = TalkSerializer
+    pagination_class = TalkCursorPagination
+
+    def get_queryset(self, request, date):
+        return Talk.objects.filter(startdate=date)
+
+
+class AsyncTalkDetailView(AsyncDetailView):
+    model = Talk
+    serializer_class = TalkSerializer
+
+
+class AsyncRoomListView(AsyncListView):
+    serializer_class = RoomSerializer
+    pagination_class = RoomCursorPagination
+
+    def get_queryset(self, request):
+        return Room.objects.all()
+
+
+class AsyncRoomDetailView(AsyncDetailView):
+    model = Room
+    serializer_class = RoomSerializer
+
+
+class LiveTalkFeedView(AsyncReadView):
+    """
+    Flux SSE des changements de talks, filtrable par ?date=AAAA-MM-JJ et ?room=<id>.
+    Un événement `reset` demande au client de recharger le programme (événements perdus).
+    Servi seulement sous ASGI : une requête WSGI reçoit aussitôt un 501.
+    """
+
+    required_attributes = ()
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            # Sous WSGI, le flux asynchrone ne serait jamais envoyé et bloquerait un worker
+            return self.render(
+                {'detail': "Flux disponible uniquement sur le serveur ASGI."},
+                status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        try:
+            self.user = await self.authenticate(request)
+            filters = self.get_filters(request.GET)
+        except APIException as exc:
+            response = self.render({'detail': exc.detail}, exc.status_code)
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                response['WWW-Authenticate'] = CookieJWTAuthentication().authenticate_header(request)
+            return response
+
+        response = StreamingHttpResponse(self.stream(filters), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Pas de mise en mémoire tampon par nginx
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def get_filters(params):
+        filters = {}
+        if params.get('date'):
+            try:
+                filters['date'] = date_type.fromisoformat(params['date']).isoformat()
+            except ValueError:
+                raise ValidationError({'date': "Format attendu : AAAA-MM-JJ."})
+        if params.get('room'):
+            try:
+                filters['room'] = int(params['room'])
+            except ValueError:
+                raise ValidationError({'room': "Identifiant de salle invalide."})
+        return filters
+
+    async def stream(self, filters):
+        subscription = broadcaster.subscribe(**filters)
+        heartbeat = settings.LIVE_FEED['HEARTBEAT']
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    change = await subscription.get(heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': ping\n\n'
+                    continue
+                if change is None:
+                    yield 'event: reset\ndata: {}\n\n'
+                else:
+                    yield f"event: talk.{change['event']}\ndata: {json.dumps(change)}\n\n"
+        finally:
+            # Déconnexion du client : Django annule le générateur
+            broadcaster.unsubscribe(subscription)
@@ -1,18 +1,119 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import permissions
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.exceptions import AuthenticationFailed
 
+
+class UserCache:
+    """
+    Cache LRU borné, avec durée de vie, des utilisateurs authentifiés par jeton.
+    Propre au processus : la durée de vie borne le retard sur les autres workers.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, key, user):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    max_size=settings.AUTH_USER_CACHE['MAX_SIZE'], ttl=settings.AUTH_USER_CACHE['TTL']
+)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Utilisateur reconstruit à partir des claims du jeton (id, role), sans requête.
+    Suffit aux classes de core.permissions, qui ne lisent que role et is_authenticated.
+    """
+
+
 class CookieJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
-        # Récupérer le token JWT depuis les cookies
-        raw_token = request.COOKIES.get('access_token')
-        if not raw_token:
-            return None  # Aucun token trouvé dans les cookies
+        validated_token = self.get_request_token(request)
+        if validated_token is None:
+            return None  # Aucun token trouvé
+
+        if settings.AUTH_USER_CACHE['STATELESS'] and request.method in permissions.SAFE_METHODS:
+            # Mode sans état : les lectures n'ont besoin que du rôle porté par le jeton
+            return (ClaimsUser(validated_token), validated_token)
 
-        # Valider le token JWT
-        validated_token = self.get_validated_token(raw_token)
         user = self.get_user(validated_token)
 
         if not user.is_active:
             raise AuthenticationFailed('User is inactive or deleted.')
 
-        return (user, validated_token)
\ No newline at end of file
+        return (user, validated_token)
+
+    def get_request_token(self, request):
+        # Récupérer le token JWT depuis les cookies, sinon depuis l'en-tête Authorization :
+        # une seule classe d'authentification, donc un seul décodage par requête
+        raw_token = request.COOKIES.get('access_token')
+        if not raw_token:
+            header = self.get_header(request)
+            if header is None:
+                return None
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+
+        # Valider le token JWT
+        return self.get_validated_token(raw_token)
+
+    @staticmethod
+    def user_cache_key(validated_token):
+        return (str(validated_token.get(api_settings.USER_ID_CLAIM)), validated_token.get('jti'))
+
+    def get_user(self, validated_token):
+        key = self.user_cache_key(validated_token)
+        user = user_cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        # Copie : une vue ne doit pas pouvoir modifier l'instance partagée
+        return copy.copy(user)
+
+    async def aget_user(self, validated_token):
+        """get_user pour les vues asynchrones : sans passer par un thread si l'utilisateur est en cache"""
+        user = user_cache.get(self.user_cache_key(validated_token))
+        if user is not None:
+            return copy.copy(user)
+        return await sync_to_async(self.get_user)(validated_token)
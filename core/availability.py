@@ -0,0 +1,201 @@
+import bisect
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from rest_framework import serializers
+
+from .cache import get_generation
+from .db_router import use_primary
+from .models import Room, Talk
+
+# Occupation des salles, par jour : {salle: (débuts, fins)}, en secondes depuis l'epoch,
+# avec tous les talks qui chevauchent le jour (ceux qui passent minuit comptent des deux côtés).
+#
+# Les talks d'une salle sont fusionnés en intervalles disjoints triés : les fins sont
+# donc triées elles aussi, et une fenêtre se trouve par bisection. Chaque jour est mis
+# en cache sous la génération du planning (core.cache) : toute écriture sur un talk ou
+# une salle rend les jours déjà calculés inaccessibles dans tous les workers, et seuls
+# les jours manquants sont relus, en une requête. Tous les talks placés comptent, quel
+# que soit leur statut, comme pour la détection des conflits.
+
+# Nombre maximal de jours par requête
+MAX_AVAILABILITY_DAYS = 92
+
+
+class AvailabilityRequestSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    end_date = serializers.DateField(required=False)
+    start = serializers.TimeField(default=datetime.time(0))
+    # Sans heure de fin : jusqu'à minuit
+    end = serializers.TimeField(required=False)
+    room = serializers.ListField(child=serializers.IntegerField(), required=False)
+    min_duration = serializers.IntegerField(min_value=0, default=0, help_text="Minutes")
+
+    def validate(self, attrs):
+        attrs.setdefault('end_date', attrs['date'])
+        days = (attrs['end_date'] - attrs['date']).days + 1
+        if days < 1:
+            raise serializers.ValidationError({'end_date': "Doit suivre date."})
+        if days > MAX_AVAILABILITY_DAYS:
+            raise serializers.ValidationError(f"Au plus {MAX_AVAILABILITY_DAYS} jours par requête.")
+        if attrs.get('end') is not None and attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': "Doit suivre start."})
+        return attrs
+
+
+def _cache_key(generation, name):
+    return f'availability:{generation}:{name}'
+
+
+def _merge(rows):
+    """Intervalles (début, fin) triés par début -> (débuts, fins) disjoints"""
+    starts, ends = [], []
+    for start, end in rows:
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(0)))
+
+
+def build_occupancy(days):
+    """
+    Occupation des jours donnés, en une requête : {jour: {salle: (débuts, fins)}}.
+    Les talks sont choisis par chevauchement avec chaque jour (début < fin du jour et
+    fin > début du jour) : un talk qui passe minuit compte dans les deux jours.
+    """
+    days = sorted(days)
+    window_start = _day_start(days[0])
+    window_end = _day_start(days[-1] + datetime.timedelta(days=1))
+    rows = (
+        Talk.objects.filter(room__isnull=False, start__lt=window_end, end__gt=window_start)
+        .order_by('start')
+        .values_list('room_id', 'start', 'end')
+    )
+    wanted = set(days)
+    intervals = defaultdict(list)
+    for room, start, end in rows.iterator(chunk_size=2000):
+        day = max(timezone.localtime(start).date(), days[0])
+        while day <= days[-1] and _day_start(day) < end:
+            if day in wanted:
+                intervals[day, room].append((start.timestamp(), end.timestamp()))
+            day += datetime.timedelta(days=1)
+
+    occupancy = {day: {} for day in days}
+    for (day, room), day_intervals in intervals.items():
+        occupancy[day][room] = _merge(day_intervals)
+    return occupancy
+
+
+def get_occupancy(days):
+    """Occupation des jours donnés, depuis le cache ; les jours manquants sont recalculés"""
+    generation = get_generation()
+    keys = {_cache_key(generation, day.isoformat()): day for day in days}
+    cached = cache.get_many(list(keys))
+    occupancy = {keys[key]: value for key, value in cached.items()}
+
+    missing = [day for day in days if day not in occupancy]
+    if missing:
+        # Mis en cache sous la génération : lu sur le primaire
+        with use_primary():
+            built = build_occupancy(missing)
+        cache.set_many(
+            {_cache_key(generation, day.isoformat()): value for day, value in built.items()},
+            settings.SCHEDULE_CACHE_TIMEOUT,
+        )
+        occupancy.update(built)
+    return occupancy
+
+
+def get_rooms():
+    """(id, nom) des salles par nom, en cache sous la même génération"""
+    key = _cache_key(get_generation(), 'rooms')
+    rooms = cache.get(key)
+    if rooms is None:
+        with use_primary():
+            rooms = list(Room.objects.order_by('name', 'id').values_list('id', 'name'))
+        cache.set(key, rooms, settings.SCHEDULE_CACHE_TIMEOUT)
+    return rooms
+
+
+def free_slots(starts, ends, window_start, window_end):
+    """Créneaux libres et temps occupé d'une salle dans [window_start, window_end["""
+    free, busy = [], 0
+    cursor = window_start
+    # Premier intervalle qui finit après le début de la fenêtre
+    for index in range(bisect.bisect_right(ends, window_start), len(starts)):
+        start, end = starts[index], ends[index]
+        if start >= window_end:
+            break
+        if start > cursor:
+            free.append((cursor, start))
+        busy += min(end, window_end) - max(start, cursor)
+        cursor = end
+    if cursor < window_end:
+        free.append((cursor, window_end))
+    return free, busy
+
+
+def _windows(params):
+    """Fenêtre [début, fin[ de chaque jour demandé, en secondes depuis l'epoch"""
+    day = params['date']
+    while day <= params['end_date']:
+        next_day = day + datetime.timedelta(days=1)
+        start = datetime.datetime.combine(day, params['start'])
+        end = (
+            datetime.datetime.combine(next_day, datetime.time(0)) if params.get('end') is None
+            else datetime.datetime.combine(day, params['end'])
+        )
+        yield day, timezone.make_aware(start).timestamp(), timezone.make_aware(end).timestamp()
+        day = next_day
+
+
+def _iso(timestamp):
+    # Même rendu que l'API pour les dates en UTC
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return moment.isoformat().replace('+00:00', 'Z')
+
+
+def room_availability(params):
+    """
+    Créneaux libres et taux d'occupation de chaque salle sur la fenêtre demandée
+    (de start à end, chaque jour de date à end_date).
+    """
+    windows = list(_windows(params))
+    occupancy = get_occupancy([day for day, _, _ in windows])
+    total = sum(end - start for _, start, end in windows)
+    min_duration = params['min_duration'] * 60
+    selected = set(params.get('room') or ())
+
+    rooms = []
+    for room_id, name in get_rooms():
+        if selected and room_id not in selected:
+            continue
+        free, busy = [], 0
+        for day, window_start, window_end in windows:
+            starts, ends = occupancy[day].get(room_id, ((), ()))
+            slots, occupied = free_slots(starts, ends, window_start, window_end)
+            free.extend(slot for slot in slots if slot[1] - slot[0] >= min_duration)
+            busy += occupied
+        rooms.append({
+            'id': room_id,
+            'name': name,
+            'is_free': busy == 0,
+            'occupancy': round(busy / total, 4) if total else 0,
+            'busy_minutes': round(busy / 60),
+            'free': [{'start': _iso(start), 'end': _iso(end)} for start, end in free],
+        })
+    return {
+        'start': _iso(windows[0][1]),
+        'end': _iso(windows[-1][2]),
+        'rooms': rooms,
+    }
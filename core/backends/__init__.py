@@ -0,0 +1,11 @@
+from core.metrics import timed_connect
+
+# Moteurs de base de données de Django, avec mesure des ouvertures de connexion
+# (exposées sur /metrics/). ENGINE : 'core.backends.postgresql' ou 'core.backends.sqlite3'.
+
+
+class TimedConnectionMixin:
+    def get_new_connection(self, conn_params):
+        # Avec OPTIONS['pool'], mesure l'emprunt d'une connexion au pool, attente comprise
+        with timed_connect(self):
+            return super().get_new_connection(conn_params)
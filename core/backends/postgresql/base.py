@@ -0,0 +1,7 @@
+from django.db.backends.postgresql import base
+
+from core.backends import TimedConnectionMixin
+
+
+class DatabaseWrapper(TimedConnectionMixin, base.DatabaseWrapper):
+    pass
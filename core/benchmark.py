@@ -0,0 +1,315 @@
+import datetime
+import json
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict, namedtuple
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import resolve
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Room, Talk, User
+from .seeding import WORDS
+
+# Scénarios de benchmark de l'API, joués en processus par le client de test de Django
+# (manage.py benchmark). Chaque scénario est un générateur qui produit des appels et
+# reçoit les réponses, pour suivre une pagination ou réutiliser les cookies de connexion.
+
+# client : 'organizer', 'speaker' (jeton d'accès en cookie) ou 'anonymous'
+Call = namedtuple('Call', ['method', 'path', 'data', 'client'])
+Sample = namedtuple('Sample', ['endpoint', 'status', 'elapsed', 'queries', 'size'])
+
+
+def get(path, client='organizer'):
+    return Call('GET', path, None, client)
+
+
+def post(path, data=None, client='organizer'):
+    return Call('POST', path, data, client)
+
+
+def put(path, data, client='organizer'):
+    return Call('PUT', path, data, client)
+
+
+class BenchmarkData:
+    """
+    Identifiants tirés du jeu de données de seed_data (même préfixe) pour paramétrer
+    les scénarios.
+    """
+
+    def __init__(self, prefix='seed', password='benchmark', sample=200):
+        self.password = password
+        self.organizer = (
+            User.objects.filter(username__startswith=f'{prefix}-organizer-').order_by('username').first()
+        )
+        self.speakers = list(
+            User.objects.filter(username__startswith=f'{prefix}-speaker-')
+            .order_by('username').values_list('id', 'username')[:sample]
+        )
+        self.rooms = list(
+            Room.objects.filter(name__startswith=f'{prefix} salle ').values_list('id', flat=True)
+        )
+        talks = Talk.objects.filter(room__in=self.rooms)
+        self.days = list(talks.order_by('startdate').values_list('startdate', flat=True).distinct())
+        self.talks = list(
+            talks.order_by('start', 'id').values('id', 'speaker_id', 'room_id', 'status')[:sample]
+        )
+        if not (self.organizer and self.speakers and self.rooms and self.talks):
+            raise ValueError(f"Aucun jeu de données « {prefix} » : lancer d'abord manage.py seed_data.")
+
+    def counts(self):
+        return {'rooms': len(self.rooms), 'days': len(self.days), 'talks': Talk.objects.count()}
+
+
+def browse(data, rng):
+    """Consultation du programme par un participant"""
+    yield get('/rooms/', client='speaker')
+    response = yield get('/talks/?page_size=50', client='speaker')
+    for _ in range(2):
+        next_url = response.json().get('next')
+        if not next_url:
+            break
+        response = yield get(next_url, client='speaker')
+    day = rng.choice(data.days)
+    yield get(f'/talks/date/{day}/', client='speaker')
+    yield get(f'/talks/date/{day}/grid/', client='speaker')
+    talk = rng.choice(data.talks)
+    yield get(f"/talks/{talk['id']}/", client='speaker')
+    yield get(f"/rooms/{talk['room_id']}/", client='speaker')
+    yield get(f"/talks/room/{talk['room_id']}/", client='speaker')
+    yield get(f"/talks/speaker/{talk['speaker_id']}/", client='speaker')
+    yield get(f'/talks/export/ndjson/?start_date={day}', client='speaker')
+
+
+def browse_async(data, rng):
+    """Même consultation par les vues asynchrones"""
+    talk = rng.choice(data.talks)
+    yield get('/async/rooms/', client='speaker')
+    yield get(f"/async/rooms/{talk['room_id']}/", client='speaker')
+    yield get('/async/talks/?page_size=50', client='speaker')
+    yield get(f"/async/talks/{talk['id']}/", client='speaker')
+    yield get(f'/async/talks/date/{rng.choice(data.days)}/', client='speaker')
+
+
+def search(data, rng):
+    """Recherche dans le programme"""
+    yield get(f'/talks/?search={rng.choice(WORDS)}', client='speaker')
+    yield get(f"/talks/?search={'+'.join(rng.sample(WORDS, 2))}", client='speaker')
+    yield get(f'/talks/?search={rng.choice(data.speakers)[1]}', client='speaker')
+    yield get(f'/talks/?search={rng.choice(WORDS)[:4]}&status=accepted', client='speaker')
+    yield get('/rooms/?search=salle', client='speaker')
+
+
+def auth(data, rng):
+    """Connexion, rafraîchissements du jeton d'accès puis déconnexion (rotation des jetons)"""
+    username = rng.choice(data.speakers)[1]
+    yield post('/login/', {'username': username, 'password': data.password}, client='anonymous')
+    for _ in range(3):
+        yield post('/refresh/', client='anonymous')
+    yield get('/hello/', client='anonymous')
+    yield post('/logout/', client='anonymous')
+
+
+def organizer(data, rng):
+    """
+    Travail d'un organisateur : ses talks, relecture (statut modifié puis rétabli, le jeu
+    de données reste stable) et import de programme en simulation (?dry_run=1).
+    """
+    yield get(f'/talks/organizer/{data.organizer.id}/')
+    yield get('/users/')
+    talk = rng.choice(data.talks)
+    other = 'rejected' if talk['status'] == 'accepted' else 'accepted'
+    for status in (other, talk['status']):
+        yield put(f"/talks/{talk['id']}/update/", {
+            'status': status, 'speaker': str(talk['speaker_id']), 'room': talk['room_id'],
+        })
+
+    # Jour hors du programme généré : aucun conflit avec les talks existants
+    day = data.days[-1] + datetime.timedelta(days=30)
+    rows = []
+    for index in range(20):
+        # Créneaux de 30 min à la suite dans une salle : ni salle ni conférencier en double
+        start = datetime.datetime.combine(day, datetime.time(8)) + datetime.timedelta(minutes=30 * index)
+        rows.append({
+            'title': f'Import {index}', 'level': 'beginner',
+            'start': f'{start.isoformat()}Z', 'end': f'{(start + datetime.timedelta(minutes=25)).isoformat()}Z',
+            'speaker': str(data.speakers[index % len(data.speakers)][0]),
+            'room': data.rooms[0],
+        })
+    yield post('/talks/import/?dry_run=1', rows)
+
+
+def review(data, rng):
+    """
+    Session de relecture en masse : 50 talks acceptés ou refusés en une requête, puis
+    statuts d'origine rétablis de la même façon.
+    """
+    talks = rng.sample(data.talks, min(50, len(data.talks)))
+    yield post('/talks/review/', {'decisions': [
+        {'id': str(talk['id']), 'status': rng.choice(('accepted', 'rejected'))} for talk in talks
+    ]})
+    yield post('/talks/review/', {'decisions': [
+        {'id': str(talk['id']), 'status': talk['status']} for talk in talks
+    ]})
+
+
+SCENARIOS = {
+    'browse': browse,
+    'async': browse_async,
+    'search': search,
+    'auth': auth,
+    'organizer': organizer,
+    'review': review,
+}
+
+
+class QueryCounter:
+    """Wrapper d'exécution SQL : compte les requêtes de la connexion du thread"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def make_clients(data):
+    clients = {'anonymous': Client()}
+    speaker = User.objects.get(pk=data.speakers[0][0])
+    for name, user in (('organizer', data.organizer), ('speaker', speaker)):
+        clients[name] = Client()
+        clients[name].cookies['access_token'] = str(AccessToken.for_user(user))
+    return clients
+
+
+def play(scenario, data, rng, clients, counter, cold, samples):
+    calls = scenario(data, rng)
+    response = None
+    while True:
+        try:
+            call = calls.send(response)
+        except StopIteration:
+            return
+        if cold:
+            cache.clear()
+        endpoint = f'{call.method} {resolve(urlsplit(call.path).path).url_name}'
+        client = clients[call.client]
+        queries = counter.count
+        started = time.perf_counter()
+        if call.method == 'GET':
+            response = client.get(call.path)
+        else:
+            response = client.generic(
+                call.method, call.path, json.dumps(call.data or {}), content_type='application/json'
+            )
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        elapsed = time.perf_counter() - started
+        samples.append(Sample(endpoint, response.status_code, elapsed, counter.count - queries, size))
+
+
+def run_benchmark(data, scenarios, iterations=10, workers=1, cold=False, seed=0):
+    """
+    Joue iterations fois chaque scénario dans chaque worker (un thread et une connexion
+    par worker). Retourne les mesures et la durée totale.
+    """
+    samples = []
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        clients = make_clients(data)
+        counter = QueryCounter()
+        local = []
+        with connection.execute_wrapper(counter):
+            for _ in range(iterations):
+                for name in scenarios:
+                    play(SCENARIOS[name], data, rng, clients, counter, cold, local)
+        with lock:
+            samples.extend(local)
+
+    def threaded_worker(index):
+        try:
+            worker(index)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    if workers == 1:
+        worker(0)
+    else:
+        threads = [threading.Thread(target=threaded_worker, args=(i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return samples, time.perf_counter() - started
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(samples, wall_time):
+    """Rapport par endpoint : latences (ms), requêtes SQL par appel, erreurs, débit"""
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+
+    endpoints = {}
+    for endpoint, group in sorted(by_endpoint.items()):
+        latencies = sorted(sample.elapsed * 1000 for sample in group)
+        queries = [sample.queries for sample in group]
+        endpoints[endpoint] = {
+            'count': len(group),
+            'errors': sum(1 for sample in group if sample.status >= 400),
+            'p50_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(_percentile(latencies, 0.95), 3),
+            'p99_ms': round(_percentile(latencies, 0.99), 3),
+            # Débit d'un worker sur cet endpoint seul
+            'rps': round(len(group) / (sum(latencies) / 1000), 1),
+            'queries_mean': round(statistics.mean(queries), 2),
+            'queries_max': max(queries),
+            'bytes_mean': round(statistics.mean(sample.size for sample in group)),
+        }
+    return {
+        'requests': len(samples),
+        'wall_time_s': round(wall_time, 3),
+        'throughput_rps': round(len(samples) / wall_time, 1) if wall_time else None,
+        'endpoints': endpoints,
+    }
+
+
+def uncovered_endpoints(report):
+    """Routes nommées de core/urls.py qu'aucun scénario n'a appelées"""
+    from . import urls
+
+    covered = {endpoint.split(' ', 1)[1] for endpoint in report['endpoints']}
+    return sorted(pattern.name for pattern in urls.urlpatterns if pattern.name not in covered)
+
+
+def compare(baseline, report, threshold=0.2):
+    """
+    Régressions par rapport à un rapport précédent : p95 plus lent de plus de threshold,
+    ou davantage de requêtes SQL par appel (mesure exacte, indépendante de la machine).
+    """
+    regressions = []
+    for endpoint, current in report['endpoints'].items():
+        previous = baseline['endpoints'].get(endpoint)
+        if previous is None:
+            continue
+        if current['queries_max'] > previous['queries_max']:
+            regressions.append((endpoint, 'queries_max', previous['queries_max'], current['queries_max']))
+        if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append((endpoint, 'p95_ms', previous['p95_ms'], current['p95_ms']))
+    return regressions
@@ -0,0 +1,183 @@
+import csv
+import json
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+
+from rest_framework import serializers
+
+from .cache import invalidate_schedule
+from .day_grid import invalidate_day_grids
+from .models import Room, Talk, User
+from .scheduling import describe_conflict, find_batch_conflicts
+from .signals import talks_saved_in_bulk
+
+
+class TalkImportRowSerializer(serializers.Serializer):
+    """
+    Validation d'une ligne d'import, sans accès à la base :
+    speaker et room sont résolus ensuite pour tout le lot en une requête chacun.
+    """
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default='')
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    startdate = serializers.DateField(required=False)
+    level = serializers.ChoiceField(choices=Talk.LEVEL_CHOICES)
+    status = serializers.ChoiceField(choices=Talk.STATUS_CHOICES, default='pending')
+    speaker = serializers.UUIDField()
+    room = serializers.IntegerField(required=False, allow_null=True)
+
+    def to_internal_value(self, data):
+        # Les cellules CSV vides valent "non renseigné"
+        data = {key: value for key, value in data.items() if value not in ('', None)}
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError("L'heure de fin doit être après l'heure de début.")
+        startdate = attrs.setdefault('startdate', attrs['start'].date())
+        if attrs['start'].date() != startdate:
+            raise serializers.ValidationError("La date de début doit correspondre au jour indiqué.")
+        return attrs
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        # Erreurs par numéro de ligne (à partir de 1 ; 0 pour le lot entier)
+        self.errors = defaultdict(list)
+        # Insertion annulée par la base : rien n'a été importé, même avec partial
+        self.aborted = False
+
+    def add_error(self, row, error):
+        if isinstance(error, dict):
+            for field, messages in error.items():
+                self.errors[row].extend(f'{field}: {message}' for message in messages)
+        elif isinstance(error, list):
+            self.errors[row].extend(str(message) for message in error)
+        else:
+            self.errors[row].append(str(error))
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'errors': [
+                {'row': row, 'errors': messages} for row, messages in sorted(self.errors.items())
+            ],
+        }
+
+
+def read_rows(stream, fmt):
+    """
+    Lit les lignes d'un flux texte : 'csv' (en-têtes = noms de champs),
+    'ndjson' (un objet JSON par ligne) ou 'json' (liste d'objets).
+    """
+    if fmt == 'csv':
+        return list(csv.DictReader(stream))
+    if fmt == 'ndjson':
+        return [json.loads(line) for line in stream if line.strip()]
+    data = json.load(stream)
+    return data.get('talks', []) if isinstance(data, dict) else data
+
+
+def import_talks(rows, organizer=None, chunk_size=500, partial=False, dry_run=False):
+    """
+    Importe un lot de talks :
+    validation ligne à ligne en mémoire, puis dans une seule transaction : résolution des
+    conférenciers et salles en deux requêtes (lignes verrouillées), détection des
+    chevauchements en une requête et bulk_create par paquets.
+
+    Par défaut l'import est tout ou rien ; avec partial=True, les lignes valides sont
+    insérées malgré les erreurs des autres.
+    """
+    result = ImportResult()
+    row_serializer = TalkImportRowSerializer()
+    validated = []
+
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            result.add_error(number, "Ligne invalide : un objet est attendu.")
+            continue
+        try:
+            validated.append((number, row_serializer.run_validation(row)))
+        except serializers.ValidationError as exc:
+            result.add_error(number, exc.detail)
+
+    try:
+        with transaction.atomic():
+            _check_and_insert(result, validated, organizer, chunk_size, partial, dry_run)
+    except IntegrityError:
+        # Créneau pris entre-temps par une écriture qui ne verrouille pas (contrainte unique)
+        result.created = 0
+        result.aborted = True
+        result.add_error(0, "Conflit avec une écriture concurrente : rien n'a été importé, réessayez.")
+    return result
+
+
+def _check_and_insert(result, validated, organizer, chunk_size, partial, dry_run):
+    """
+    Résolution, détection des chevauchements et insertion, dans la transaction de
+    import_talks. Les salles et conférenciers du lot restent verrouillés jusqu'au commit :
+    deux imports qui les partagent ne peuvent pas valider le même créneau en parallèle.
+    """
+    speaker_ids = {data['speaker'] for _, data in validated}
+    room_ids = {data['room'] for _, data in validated if data.get('room') is not None}
+    # Verrous pris dans l'ordre des id, pour ne pas s'interbloquer entre imports
+    speakers = {
+        user.id: user
+        for user in User.objects.select_for_update().filter(id__in=speaker_ids, role='speaker')
+        .order_by('pk').only('id', 'username', 'email')
+    }
+    rooms = Room.objects.select_for_update().order_by('pk').in_bulk(room_ids)
+
+    talks, row_numbers = [], {}
+    for number, data in validated:
+        speaker = speakers.get(data['speaker'])
+        room_id = data.get('room')
+        if speaker is None:
+            result.add_error(number, {'speaker': ["Conférencier introuvable."]})
+            continue
+        if room_id is not None and room_id not in rooms:
+            result.add_error(number, {'room': ["Salle introuvable."]})
+            continue
+
+        talk = Talk(
+            title=data['title'],
+            description=data['description'],
+            start=data['start'],
+            end=data['end'],
+            startdate=data['startdate'],
+            level=data['level'],
+            status=data['status'],
+            speaker=speaker,
+            organizer=organizer,
+            room=rooms.get(room_id),
+        )
+        # bulk_create n'appelle pas Talk.save : copies renseignées ici, objets liés déjà chargés
+        talk.refresh_snapshots()
+        talks.append(talk)
+        row_numbers[id(talk)] = number
+
+    for conflict in find_batch_conflicts(talks):
+        message = describe_conflict(conflict)
+        if id(conflict.other) in row_numbers:
+            message = f"{message} (ligne {row_numbers[id(conflict.other)]})"
+        result.add_error(row_numbers[id(conflict.talk)], message)
+
+    if result.errors and not partial:
+        return
+
+    talks = [talk for talk in talks if row_numbers[id(talk)] not in result.errors]
+    if dry_run:
+        result.created = len(talks)
+        return
+
+    for offset in range(0, len(talks), chunk_size):
+        Talk.objects.bulk_create(talks[offset:offset + chunk_size])
+    # bulk_create n'émet pas post_save : invalidation explicite du cache et des grilles
+    invalidate_schedule()
+    invalidate_day_grids(talk.startdate for talk in talks)
+    talks_saved_in_bulk.send(sender=Talk, talks=talks, created=True, previous=None)
+    result.created = len(talks)
@@ -0,0 +1,173 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
+
+from .db_router import use_primary
+from .models import ScheduleGeneration
+
+# Compteur de génération du planning : toute écriture sur Talk, Room ou User l'incrémente,
+# ce qui rend inaccessibles d'un coup toutes les réponses mises en cache avant elle.
+#
+# Il n'est partagé entre workers qu'avec un cache partagé (REDIS_URL). Avec un cache en
+# mémoire locale et plusieurs workers (WEB_CONCURRENCY), il est tenu en base
+# (SCHEDULE_GENERATION_STORE = 'database', une requête par lecture) : chaque worker garde
+# ses réponses en mémoire, mais sous la même génération que les autres. Avec un seul
+# worker, la clé en mémoire locale expire après SCHEDULE_CACHE_TIMEOUT, filet de sécurité
+# si plusieurs processus ont été lancés sans renseigner WEB_CONCURRENCY.
+#
+# Tout ce qui est enregistré sous une génération (ou renvoyé avec un ETag qui en dérive)
+# est lu sur le primaire (use_primary) : lu sur un réplica en retard, il associerait à la
+# génération d'après une écriture des données d'avant celle-ci.
+GENERATION_KEY = 'schedule:generation'
+
+LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _initial_generation():
+    # Si la clé a été expulsée du cache, on ne doit pas retomber sur une génération
+    # déjà utilisée : on repart de l'horloge, toujours au-dessus des anciennes valeurs
+    return int(time.time() * 1000)
+
+
+def generation_timeout():
+    # Sans expiration avec un cache partagé : toute écriture y est vue par tous les workers
+    if settings.CACHES['default']['BACKEND'] in LOCAL_BACKENDS:
+        return settings.SCHEDULE_CACHE_TIMEOUT
+    return None
+
+
+def in_database():
+    return settings.SCHEDULE_GENERATION_STORE == 'database'
+
+
+def _db_generation():
+    with use_primary():
+        generation = ScheduleGeneration.objects.filter(pk=1).values_list('value', flat=True).first()
+        if generation is None:
+            ScheduleGeneration.objects.bulk_create(
+                [ScheduleGeneration(pk=1, value=_initial_generation())], ignore_conflicts=True,
+            )
+            generation = ScheduleGeneration.objects.values_list('value', flat=True).get(pk=1)
+    return generation
+
+
+def get_generation():
+    if in_database():
+        return _db_generation()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=generation_timeout())
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+async def aget_generation():
+    if in_database():
+        return await sync_to_async(_db_generation)()
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, _initial_generation(), timeout=generation_timeout())
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    if in_database():
+        if not ScheduleGeneration.objects.filter(pk=1).update(value=F('value') + 1):
+            _db_generation()
+        return _db_generation()
+    # incr garde l'expiration de la clé
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=generation_timeout())
+        return cache.get(GENERATION_KEY)
+
+
+def invalidate_schedule():
+    """
+    Invalide les réponses du planning. Dans une transaction, on incrémente aussi au
+    commit : une lecture concurrente a pu mettre en cache les données d'avant le commit.
+
+    En base, seulement au commit (hors transaction : tout de suite), sans verrouiller la
+    ligne du compteur pendant la transaction de l'écriture.
+    """
+    if in_database():
+        transaction.on_commit(bump_generation)
+        return
+    bump_generation()
+    if connection.in_atomic_block:
+        transaction.on_commit(bump_generation)
+
+
+def response_cache_key(prefix, request, generation=None):
+    # L'URL absolue (hôte compris) car les liens de pagination sont absolus
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    if generation is None:
+        generation = get_generation()
+    return f'response:{prefix}:{generation}:{url}'
+
+
+def record(endpoint, outcome):
+    with _stats_lock:
+        _stats[(endpoint, outcome)] += 1
+
+
+def cache_stats():
+    """Compteurs hit/miss par endpoint pour ce processus"""
+    with _stats_lock:
+        items = list(_stats.items())
+    stats = {}
+    for (endpoint, outcome), count in items:
+        stats.setdefault(endpoint, {'hits': 0, 'misses': 0})[outcome] = count
+    return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class CachedResponseMixin:
+    """
+    Met en cache les réponses de liste (GET) par endpoint et par URL. Les clés contiennent
+    la génération courante du planning : une écriture les rend inaccessibles dans tous
+    les workers (génération partagée par le cache ou tenue en base).
+    """
+
+    cache_timeout = None
+
+    def get_cache_prefix(self):
+        return type(self).__name__
+
+    def list(self, request, *args, **kwargs):
+        endpoint = self.get_cache_prefix()
+        key = response_cache_key(endpoint, request)
+
+        data = cache.get(key)
+        if data is not None:
+            record(endpoint, 'hits')
+            return Response(data)
+
+        record(endpoint, 'misses')
+        with use_primary():
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.cache_timeout or settings.SCHEDULE_CACHE_TIMEOUT
+            cache.set(key, response.data, timeout)
+        return response
@@ -0,0 +1,94 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generation
+from .db_router import use_primary
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+class ConditionalListMixin:
+    """
+    ETag fort sur les listes, sans requête SQL : dérivé de la génération du planning
+    (core.cache, avancée par toute écriture sur un talk, une salle ou un utilisateur), de
+    l'URL et du format négocié. Un If-None-Match correspondant renvoie 304 sans lire la page.
+La page renvoyée avec cet ETag est lue sur le primaire, jamais sur un réplica en retard.
+
+    Pas de Last-Modified sur les listes : une suppression ne le ferait pas avancer.
+    """
+
+    def get_list_etag(self, request):
+        renderer = request.accepted_renderer
+        return make_etag(
+            get_generation(), request.build_absolute_uri(),
+            request.META.get('HTTP_ACCEPT', ''), renderer.format, request.accepted_media_type,
+        )
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            patch_vary_headers(not_modified, ['Accept'])
+            return not_modified
+
+        with use_primary():
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            patch_vary_headers(response, ['Accept'])
+        return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    ETag sur un objet, lu par une requête sur la seule colonne updated_at. La réponse
+    embarque aussi des lignes liées (conférencier, organisateur, salle) dont les
+    modifications ne touchent pas toujours updated_at : l'ETag contient donc aussi la
+    génération du planning, et le format négocié.
+
+    Last-Modified n'est qu'indicatif : il ne suit que l'objet lui-même, seul l'ETag
+    permet un 304.
+    """
+
+    lookup_url_kwarg = 'pk'
+
+    def get_detail_etag(self, request, pk, updated_at):
+        renderer = request.accepted_renderer
+        return make_etag(
+            pk, updated_at.isoformat(), get_generation(),
+            request.META.get('HTTP_ACCEPT', ''), renderer.format, request.accepted_media_type,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # ETag dérivé de la génération : objet lu sur le primaire (voir core.cache)
+        with use_primary():
+            return self.retrieve_conditional(request, *args, **kwargs)
+
+    def retrieve_conditional(self, request, *args, **kwargs):
+        pk = self.kwargs[self.lookup_url_kwarg]
+        updated_at = (
+            self.get_queryset().model.objects.filter(pk=pk)
+            .values_list('updated_at', flat=True).first()
+        )
+        if updated_at is None:
+            # Objet absent : la vue renverra son 404 habituel
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = self.get_detail_etag(request, pk, updated_at)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            patch_vary_headers(not_modified, ['Accept'])
+            return not_modified
+
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(int(updated_at.timestamp()))
+            patch_vary_headers(response, ['Accept'])
+        return response
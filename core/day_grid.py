@@ -0,0 +1,115 @@
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .db_router import use_primary
+from .models import DayGrid, Talk
+
+# Grille salle × créneau d'une journée, matérialisée dans DayGrid.
+#
+# Invalidation : toute écriture touchant un talk du jour incrémente DayGrid.version et
+# vide data, une fois tout de suite et une fois au commit. Une grille n'est enregistrée
+# que si la version n'a pas bougé pendant sa construction : une lecture concurrente
+# d'une écriture ne peut donc pas figer une grille périmée.
+
+GRID_FIELDS = (
+    'id', 'title', 'start', 'end', 'level', 'status',
+    'speaker_id', 'speakerName', 'room_id', 'room_name',
+)
+
+
+def _iso(value):
+    # Même rendu que l'API pour les dates en UTC
+    return value.isoformat().replace('+00:00', 'Z')
+
+
+def build_grid(day):
+    """
+    Construit la grille d'un jour en une requête sans jointure (noms copiés dans Talk) :
+    salles par nom, talks par heure de début
+    """
+    rows = list(
+        Talk.objects.filter(startdate=day).order_by('start', 'id').values(*GRID_FIELDS)
+    )
+    return build_grid_from_rows(day, rows)
+
+
+def build_grid_from_rows(day, rows):
+    """Grille d'un jour à partir de ses talks (GRID_FIELDS), triés par début"""
+    slots = sorted({row['start'] for row in rows})
+    slot_index = {start: index for index, start in enumerate(slots)}
+
+    rooms, unassigned = {}, []
+    for row in rows:
+        talk = {
+            'id': str(row['id']),
+            'title': row['title'],
+            'start': _iso(row['start']),
+            'end': _iso(row['end']),
+            'slot': slot_index[row['start']],
+            'level': row['level'],
+            'status': row['status'],
+            'speaker': {'id': str(row['speaker_id']), 'username': row['speakerName']},
+        }
+        if row['room_id'] is None:
+            unassigned.append(talk)
+            continue
+        room = rooms.setdefault(
+            row['room_id'], {'id': row['room_id'], 'name': row['room_name'], 'talks': []}
+        )
+        room['talks'].append(talk)
+
+    return {
+        'date': day.isoformat(),
+        'slots': [_iso(start) for start in slots],
+        'rooms': sorted(rooms.values(), key=lambda room: room['name']),
+        'unassigned': unassigned,
+    }
+
+
+def get_day_grid(day):
+    """
+    Grille du jour : une seule lecture si elle est à jour, sinon reconstruction et
+    enregistrement conditionnel (version inchangée). Un jour sans talk ni grille
+    enregistrée renvoie une grille vide, sans rien écrire.
+    """
+    grid = DayGrid.objects.filter(day=day).first()
+    if grid is not None and grid.data is not None:
+        return grid
+
+    if grid is None:
+        if not Talk.objects.filter(startdate=day).exists():
+            # Pas de ligne : version None, distincte de toute version enregistrée (ETag)
+            return DayGrid(day=day, version=None, data=build_grid_from_rows(day, []))
+        # La ligne existe avant la construction, pour que les écritures concurrentes
+        # puissent incrémenter sa version. Elle est conservée ensuite, même si le jour se
+        # vide : la version d'un jour ne revient jamais en arrière.
+        grid, _ = DayGrid.objects.get_or_create(day=day)
+
+    # Grille enregistrée : construite sur le primaire, pas sur un réplica en retard
+    with use_primary():
+        data = build_grid(day)
+    built_at = timezone.now()
+    DayGrid.objects.filter(day=day, version=grid.version).update(data=data, built_at=built_at)
+
+    grid.data, grid.built_at = data, built_at
+    return grid
+
+
+def invalidate_day_grids(days=None):
+    """
+    Invalide les grilles des jours donnés (toutes si days vaut None). Dans une transaction,
+    on invalide aussi au commit : une lecture a pu reconstruire la grille entre-temps.
+    """
+    if days is not None:
+        days = set(days)
+        if not days:
+            return
+
+    def bump():
+        grids = DayGrid.objects.all() if days is None else DayGrid.objects.filter(day__in=days)
+        grids.update(version=F('version') + 1, data=None)
+
+    bump()
+    if connection.in_atomic_block:
+        transaction.on_commit(bump)
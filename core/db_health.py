@@ -0,0 +1,54 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+
+def check_databases():
+    """
+    Aller-retour SELECT 1 sur chaque base configurée (primaire et réplicas) :
+    {alias: {'ok': bool, 'ms': durée, 'error': message}}.
+    """
+    results = {}
+    for alias in settings.DATABASES:
+        started = time.perf_counter()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except DatabaseError as exc:
+            results[alias] = {'ok': False, 'error': str(exc).strip()}
+        else:
+            results[alias] = {'ok': True}
+        results[alias]['ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return results
+
+
+def warm_up_connections():
+    """
+    Ouvre les connexions au démarrage d'un worker (gunicorn.conf.py) : la première
+    requête ne paie pas la connexion. Avec OPTIONS['pool'], remplit le pool jusqu'à
+    min_size. Une base injoignable est journalisée sans empêcher le démarrage.
+    Retourne la durée d'ouverture par alias (ms).
+    """
+    timings = {}
+    for alias, config in settings.DATABASES.items():
+        wrapper = connections[alias]
+        started = time.perf_counter()
+        try:
+            if config.get('OPTIONS', {}).get('pool'):
+                wrapper.pool.open(wait=True)
+            wrapper.ensure_connection()
+        except Exception as exc:
+            # Erreurs Django ou du pool psycopg (PoolTimeout) : le worker démarre quand même
+            logger.warning("Base %s injoignable au démarrage : %s", alias, exc)
+            continue
+        finally:
+            if config.get('OPTIONS', {}).get('pool'):
+                # Connexion rendue au pool ; le thread des requêtes en empruntera une
+                wrapper.close()
+        timings[alias] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
@@ -0,0 +1,126 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Lectures sur réplica : seules les requêtes HTTP de lecture (GET, HEAD, OPTIONS) y ont
+# droit, via ReplicaRoutingMiddleware ; les commandes, workers et tests restent sur le
+# primaire. Après une écriture, le client garde un cookie quelques secondes pendant
+# lesquelles ses lectures restent sur le primaire (il relit ce qu'il vient d'écrire).
+
+PIN_COOKIE = 'db_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    def __init__(self, replica=None):
+        # Réplica choisi pour toute la requête (None : primaire)
+        self.replica = replica
+        self.wrote = False
+
+
+_state = ContextVar('db_routing', default=None)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def use_primary():
+    """Lectures sur le primaire dans le bloc (données dérivées enregistrées ensuite)"""
+    token = _state.set(None)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Lectures sur le réplica choisi par ReplicaRoutingMiddleware, écritures sur le
+    primaire. Une fois qu'une requête a écrit, ou dans une transaction, elle ne lit
+    plus que le primaire.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.replica is None or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Mêmes données partout : un objet lu sur un réplica peut être lié à un autre
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Les réplicas reçoivent le schéma par la réplication
+        if db in replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choisit un réplica par requête de lecture, sauf si le client a écrit récemment
+    (cookie PIN_COOKIE) ; pose ce cookie après une requête d'écriture qui a écrit.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(request, response, state)
+
+    @staticmethod
+    def start(request):
+        available = replicas()
+        replica = None
+        if available and request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES:
+            replica = random.choice(available)
+        state = RoutingState(replica)
+        return state, _state.set(state)
+
+    @staticmethod
+    def finish(request, response, state):
+        # Les écritures annexes d'une lecture (grille du jour...) n'épinglent pas le client
+        if state.wrote and request.method not in SAFE_METHODS and replicas():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
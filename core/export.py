@@ -0,0 +1,91 @@
+import csv
+import datetime
+
+from rest_framework.utils.encoders import JSONEncoder
+
+# Colonnes de l'export, à plat : nom de colonne -> champ de Talk (les noms sont les
+# copies dénormalisées : lecture de la seule table des talks)
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'start': 'start',
+    'end': 'end',
+    'startdate': 'startdate',
+    'level': 'level',
+    'status': 'status',
+    'speaker_id': 'speaker_id',
+    'speaker_name': 'speakerName',
+    'room_id': 'room_id',
+    'room_name': 'room_name',
+    'organizer_id': 'organizer_id',
+    'organizer_name': 'organizer_name',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+
+def export_rows(queryset, chunk_size=2000):
+    """
+    Lignes de l'export (tuples dans l'ordre de EXPORT_COLUMNS), lues par paquets de
+    chunk_size avec iterator() : ni instances de modèle ni cache de queryset,
+    la mémoire reste constante quelle que soit la taille du programme.
+    """
+    rows = queryset.order_by('start', 'id').values_list(*EXPORT_COLUMNS.values())
+    return rows.iterator(chunk_size=chunk_size)
+
+
+def ndjson_lines(rows):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    names = list(EXPORT_COLUMNS)
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+class _Echo:
+    # csv.writer écrit dans un fichier : on récupère simplement la ligne formatée
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        # Même rendu que l'API pour les dates en UTC
+        return value.isoformat().replace('+00:00', 'Z')
+    return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([_cell(value) for value in row])
+
+
+def export_lines(fmt, rows, buffer_size=64 * 1024):
+    """
+    Lignes regroupées en blocs d'environ buffer_size caractères : un envoi réseau par
+    bloc plutôt que par talk. La première ligne part seule, sans attendre le bloc.
+    """
+    lines = ndjson_lines(rows) if fmt == 'ndjson' else csv_lines(rows)
+    first = next(lines, None)
+    if first is None:
+        return
+    yield first
+
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
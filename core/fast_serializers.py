@@ -0,0 +1,194 @@
+import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from .metrics import timed_serialization
+
+# Sérialisation rapide des listes : un serializer de modèle est « compilé » une fois en
+# plan (clé de sortie, colonne de .values(), conversion), puis chaque ligne de la page
+# est transformée en dictionnaire sans instance de modèle ni machinerie des champs DRF.
+# Le JSON produit est identique octet pour octet à celui de serializer_class(many=True).
+
+# Champs dont la représentation DRF est la valeur lue en base, telle quelle
+_IDENTITY_FIELDS = (
+    serializers.CharField, serializers.EmailField, serializers.ChoiceField,
+    serializers.IntegerField, serializers.BooleanField, serializers.PrimaryKeyRelatedField,
+)
+
+_plans = {}
+
+
+class UnsupportedSerializer(Exception):
+    pass
+
+
+def _converter(field):
+    """Conversion d'une valeur non nulle, ou None si la valeur est rendue telle quelle"""
+    field_type = type(field)
+    if field_type in _IDENTITY_FIELDS and not getattr(field, 'pk_field', None):
+        return None
+    if field_type is serializers.UUIDField and field.uuid_format == 'hex_verbose':
+        return str
+    if field_type is serializers.DateField and _iso_format(field, api_settings.DATE_FORMAT):
+        return datetime.date.isoformat
+    if field_type is serializers.DateTimeField and _iso_format(field, api_settings.DATETIME_FORMAT):
+        # Fuseau résolu à chaque sérialisation (timezone.activate), comme DRF
+        return _DateTime(field)
+    return field.to_representation
+
+
+def _iso_format(field, default):
+    output_format = getattr(field, 'format', default)
+    return output_format is not None and output_format.lower() == 'iso-8601'
+
+
+class _DateTime:
+    def __init__(self, field):
+        self.field = field
+
+    def bind(self):
+        field = self.field
+        tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if tz is None:
+            return field.to_representation
+
+        def convert(value):
+            if value.tzinfo is None:
+                return field.to_representation(value)
+            text = value.astimezone(tz).isoformat()
+            return text[:-6] + 'Z' if text.endswith('+00:00') else text
+        return convert
+
+
+def _compile(serializer, model, prefix=''):
+    """Plan d'un serializer : liste de (clé, colonne, conversion, sous-plan)"""
+    own = type(serializer).to_representation
+    if own is not serializers.Serializer.to_representation and not hasattr(serializer, 'RENAMED_FIELDS'):
+        raise UnsupportedSerializer(type(serializer).__name__)
+
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            raise UnsupportedSerializer(f'{type(serializer).__name__}.{name}')
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise UnsupportedSerializer(f'{type(serializer).__name__}.{name}')
+        column = prefix + field.source
+
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not model_field.many_to_one:
+                raise UnsupportedSerializer(f'{type(serializer).__name__}.{name}')
+            # Objet lié absent (clé étrangère nulle) : None, comme DRF
+            sub_plan = _compile(field, model_field.related_model, column + '__')
+            plan.append((name, column, None, sub_plan))
+        elif model_field.concrete and not model_field.many_to_many:
+            plan.append((name, column, _converter(field), None))
+        else:
+            raise UnsupportedSerializer(f'{type(serializer).__name__}.{name}')
+
+    # Renommages de to_representation (TalkSerializer.RENAMED_FIELDS) appliqués au plan :
+    # les identifiants simples disparaissent, les objets détaillés passent en fin sous leur nom
+    renamed = getattr(serializer, 'RENAMED_FIELDS', {})
+    if renamed:
+        entries = {entry[0]: entry for entry in plan}
+        plan = [entry for entry in plan if entry[0] not in renamed and entry[0] not in renamed.values()]
+        plan += [(target, *entries[source][1:]) for source, target in renamed.items() if source in entries]
+    return plan
+
+
+def _columns(plan):
+    for _, column, _, sub_plan in plan:
+        yield column
+        if sub_plan is not None:
+            yield from _columns(sub_plan)
+
+
+class FastListSerializer:
+    """
+    Pendant rapide de serializer_class(many=True).data, sur des lignes de .values(columns).
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        self.plan = _compile(serializer, serializer.Meta.model)
+        self.columns = tuple(dict.fromkeys(_columns(self.plan)))
+
+    def _bind(self, plan):
+        bound = []
+        for key, column, convert, sub_plan in plan:
+            if isinstance(convert, _DateTime):
+                convert = convert.bind()
+            bound.append((key, column, convert, self._bind(sub_plan) if sub_plan else None))
+        return bound
+
+    def serialize(self, rows):
+        """
+        Un objet lié (salle, conférencier...) n'est construit qu'une fois par page : les
+        lignes qui le référencent partagent le même dictionnaire, à ne pas modifier.
+        """
+        plan = self._bind(self.plan)
+        # Objets liés déjà construits, par colonne de clé étrangère puis par valeur
+        related = {}
+
+        def build(row, plan):
+            item = {}
+            for key, column, convert, sub_plan in plan:
+                value = row[column]
+                if value is None:
+                    item[key] = None
+                elif sub_plan is not None:
+                    built = related.setdefault(column, {})
+                    if value not in built:
+                        built[value] = build(row, sub_plan)
+                    item[key] = built[value]
+                elif convert is None:
+                    item[key] = value
+                else:
+                    item[key] = convert(value)
+            return item
+
+        with timed_serialization():
+            return [build(row, plan) for row in rows]
+
+
+def fast_serializer_for(serializer_class):
+    """FastListSerializer de la classe, ou None si un champ ne peut pas être compilé"""
+    if serializer_class not in _plans:
+        try:
+            _plans[serializer_class] = FastListSerializer(serializer_class)
+        except UnsupportedSerializer:
+            _plans[serializer_class] = None
+    return _plans[serializer_class]
+
+
+def page_values(fast, page_queryset, ordering):
+    """Requête de la page en .values() : colonnes du plan et colonnes de tri (curseur)"""
+    extra = [field.lstrip('-') for field in ordering if field.lstrip('-') not in fast.columns]
+    return page_queryset.values(*fast.columns, *extra)
+
+
+class FastListMixin:
+    """
+    Mixin pour les vues de liste paginées par KeysetCursorPagination : la page est lue
+    en .values() et sérialisée par FastListSerializer, sans instance de modèle.
+    Repli sur le chemin DRF habituel si le serializer n'est pas compilable.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fast = fast_serializer_for(self.get_serializer_class())
+        paginator = self.paginator
+        if fast is None or not hasattr(paginator, 'get_page_queryset'):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page_queryset = paginator.get_page_queryset(queryset, request, view=self)
+        if page_queryset is None:
+            return super().list(request, *args, **kwargs)
+        page = paginator.set_page(list(page_values(fast, page_queryset, paginator.ordering)))
+        return self.get_paginated_response(fast.serialize(page))
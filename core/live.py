@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+# Flux en direct des changements de talks (Server-Sent Events, serveur ASGI).
+# Une écriture publie un seul message ; chaque processus ASGI le reçoit une fois
+# (LISTEN/NOTIFY sur PostgreSQL, directement en mémoire sinon) et le distribue à
+# toutes les connexions ouvertes dont le filtre (jour, salle) correspond.
+
+# Un NOTIFY porte au plus 8000 octets : les écritures en masse sont découpées en
+# messages dont le JSON encodé reste sous cette taille, marge comprise
+NOTIFY_MAX_BYTES = 7500
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def talk_change(event, talk, previous=None):
+    """Événement compact : ce qu'il faut pour mettre à jour une vue du programme"""
+    previous = previous or {}
+    return {
+        'event': event,
+        'id': str(talk.pk),
+        'title': talk.title,
+        'start': _iso(talk.start),
+        'end': _iso(talk.end),
+        'startdate': _iso(talk.startdate),
+        'status': talk.status,
+        'level': talk.level,
+        'room': talk.room_id,
+        'speakerName': talk.speakerName,
+        'previous_startdate': _iso(previous.get('startdate')),
+        'previous_room': previous.get('room_id'),
+        'previous_status': previous.get('status'),
+    }
+
+
+def uses_notify():
+    return connection.vendor == 'postgresql'
+
+
+def publish(changes):
+    """
+    Publie des changements. Sur PostgreSQL, NOTIFY est transactionnel : il n'est livré
+    qu'au commit, à tous les processus à l'écoute. Ailleurs, diffusion en mémoire au commit.
+    """
+    if not changes:
+        return
+    if not uses_notify():
+        transaction.on_commit(lambda: broadcaster.publish(changes))
+        return
+    channel = settings.LIVE_FEED['CHANNEL']
+    with connection.cursor() as cursor:
+        for payload in notify_payloads(changes):
+            cursor.execute('SELECT pg_notify(%s, %s)', [channel, payload])
+
+
+def notify_payloads(changes, limit=NOTIFY_MAX_BYTES):
+    """
+    Tableaux JSON de changements, chacun sous `limit` octets une fois encodé en UTF-8.
+    Un changement (titre de 255 caractères au plus) tient toujours seul dans un message.
+    """
+    batch, size = [], 2  # crochets du tableau
+    for change in changes:
+        encoded = json.dumps(change, cls=JSONEncoder, ensure_ascii=False)
+        length = len(encoded.encode())
+        if batch and size + 1 + length > limit:
+            yield '[' + ','.join(batch) + ']'
+            batch, size = [], 2
+        batch.append(encoded)
+        size += length + (len(batch) > 1)
+    if batch:
+        yield '[' + ','.join(batch) + ']'
+
+
+class Subscription:
+    """
+    Connexion abonnée : file bornée, remplie depuis n'importe quel thread via la boucle
+    asyncio de la connexion. Si le client ne suit pas, on vide la file et on lui signale
+    de recharger plutôt que d'accumuler des événements en mémoire.
+    """
+
+    def __init__(self, loop, date=None, room=None, queue_size=100):
+        self.loop = loop
+        self.date = date
+        self.room = room
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def matches(self, change):
+        if self.date and self.date not in (change['startdate'], change['previous_startdate']):
+            return False
+        if self.room is not None and self.room not in (change['room'], change['previous_room']):
+            return False
+        return True
+
+    def _put(self, change):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self._reset()
+
+    def _reset(self):
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    def deliver(self, change):
+        self.loop.call_soon_threadsafe(self._put, change)
+
+    def reset(self):
+        self.loop.call_soon_threadsafe(self._reset)
+
+    async def get(self, timeout):
+        """Prochain événement ; None si le client a décroché (à recharger)"""
+        change = await asyncio.wait_for(self.queue.get(), timeout)
+        if change is None:
+            self.overflowed = False
+        return change
+
+
+class Broadcaster:
+    """
+    Diffuseur du processus : un seul abonnement à la base, quel que soit le nombre
+    de connexions SSE.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def subscribe(self, date=None, room=None):
+        subscription = Subscription(
+            asyncio.get_running_loop(), date=date, room=room,
+            queue_size=settings.LIVE_FEED['QUEUE_SIZE'],
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if uses_notify() and self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name='live-feed-listener', daemon=True
+                )
+                self._listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def publish(self, changes):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for change in changes:
+            for subscription in subscriptions:
+                if subscription.matches(change):
+                    subscription.deliver(change)
+
+    def reset(self):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.reset()
+
+    def _listen(self):
+        # Connexion dédiée, en autocommit, hors des connexions de requête et hors du pool
+        # (OPTIONS['pool']) : elle reste ouverte tant que le processus écoute
+        channel = settings.LIVE_FEED['CHANNEL']
+        reconnecting = False
+        while True:
+            wrapper = listener_connection()
+            try:
+                wrapper.ensure_connection()
+                raw = wrapper.connection
+                with raw.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{channel}"')
+                if reconnecting:
+                    # Des notifications ont pu être perdues pendant la coupure
+                    self.reset()
+                for payload in notifications(raw):
+                    self.publish(json.loads(payload))
+            except Exception:
+                logger.exception("Écoute du flux en direct interrompue, reconnexion")
+                reconnecting = True
+                time.sleep(1)
+            finally:
+                wrapper.close()
+
+
+def listener_connection():
+    """Nouvelle connexion à la base par défaut, sans pool"""
+    default = connections['default']
+    options = {key: value for key, value in default.settings_dict['OPTIONS'].items() if key != 'pool'}
+    return type(default)(
+        dict(default.settings_dict, OPTIONS=options, CONN_MAX_AGE=0), alias='live-feed'
+    )
+
+
+def notifications(raw, timeout=30):
+    """Contenus des NOTIFY reçus, avec psycopg2 comme avec psycopg 3"""
+    if hasattr(raw, 'poll'):
+        # psycopg2 : attente sur le socket, puis lecture de la file de la connexion
+        while True:
+            if select.select([raw], [], [], timeout) == ([], [], []):
+                continue
+            raw.poll()
+            while raw.notifies:
+                yield raw.notifies.pop(0).payload
+    else:
+        # psycopg 3 : générateur bloquant (timeout à partir de psycopg 3.2)
+        while True:
+            try:
+                received = raw.notifies(timeout=timeout)
+            except TypeError:
+                received = raw.notifies()
+            for notify in received:
+                yield notify.payload
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,131 @@
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+
+from core.benchmark import (
+    SCENARIOS,
+    BenchmarkData,
+    compare,
+    run_benchmark,
+    summarize,
+    uncovered_endpoints,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de l'API sur le jeu de données de seed_data : scénarios joués en processus "
+        "(consultation, vues asynchrones, recherche, connexions, travail d'organisateur), "
+        "latences, débit et requêtes SQL par endpoint. --output enregistre le rapport JSON, "
+        "--compare le confronte à un rapport précédent pour repérer les régressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help=f"Liste séparée par des virgules parmi : {', '.join(SCENARIOS)}")
+        parser.add_argument('--iterations', type=int, default=20, help="Passages par worker")
+        parser.add_argument('--workers', type=int, default=1, help="Threads (une connexion chacun)")
+        parser.add_argument('--warmup', type=int, default=1, help="Passages non mesurés")
+        parser.add_argument('--cold', action='store_true',
+                            help="Vide le cache avant chaque appel (mesure le chemin base de données)")
+        parser.add_argument('--prefix', default='seed')
+        parser.add_argument('--password', default='benchmark')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Fichier JSON du rapport")
+        parser.add_argument('--compare', help="Rapport JSON de référence")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Ralentissement du p95 toléré avant régression (0.2 : +20 %%)")
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Scénarios inconnus : {', '.join(sorted(unknown))}")
+        try:
+            data = BenchmarkData(prefix=options['prefix'], password=options['password'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        with override_settings(ALLOWED_HOSTS=hosts):
+            if options['warmup']:
+                run_benchmark(data, scenarios, options['warmup'], options['workers'],
+                              options['cold'], options['seed'])
+            samples, wall_time = run_benchmark(
+                data, scenarios, options['iterations'], options['workers'], options['cold'],
+                options['seed'] + 1000,
+            )
+
+        report = summarize(samples, wall_time)
+        report['meta'] = {
+            'created_at': timezone.now().isoformat(),
+            'revision': self.revision(),
+            'database': connection.vendor,
+            'dataset': data.counts(),
+            'options': {
+                key: options[key]
+                for key in ('scenarios', 'iterations', 'workers', 'cold', 'seed', 'prefix')
+            },
+        }
+        self.print_report(report)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Rapport enregistré : {options['output']}")
+
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare(baseline, report, options['threshold'])
+            self.print_regressions(baseline, regressions)
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} régression(s)")
+
+    def print_report(self, report):
+        meta = report['meta']
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{meta['database']} {meta['dataset']}, révision {meta['revision'] or '?'}"
+        ))
+        self.stdout.write(
+            f"{'endpoint':<34} {'appels':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'req/s':>8} {'SQL moy':>7} {'SQL max':>7} {'octets':>8}"
+        )
+        for endpoint, row in report['endpoints'].items():
+            line = (
+                f"{endpoint:<34} {row['count']:>6} {row['errors']:>4} {row['p50_ms']:>8.2f} "
+                f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['rps']:>8.1f} "
+                f"{row['queries_mean']:>7.1f} {row['queries_max']:>7} {row['bytes_mean']:>8}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+        self.stdout.write(
+            f"\n{report['requests']} appels en {report['wall_time_s']:.1f} s : "
+            f"{report['throughput_rps']} req/s"
+        )
+        uncovered = uncovered_endpoints(report)
+        if uncovered:
+            self.stdout.write(f"Endpoints non couverts : {', '.join(uncovered)}")
+
+    def print_regressions(self, baseline, regressions):
+        revision = baseline.get('meta', {}).get('revision') or '?'
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"Aucune régression par rapport à {revision}"))
+            return
+        self.stdout.write(self.style.ERROR(f"Régressions par rapport à {revision} :"))
+        for endpoint, metric, before, after in regressions:
+            self.stdout.write(f"  {endpoint:<34} {metric:<12} {before} -> {after}")
+
+    @staticmethod
+    def revision():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
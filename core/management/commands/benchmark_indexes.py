@@ -0,0 +1,125 @@
+import datetime
+import statistics
+import time
+
+from django.contrib.postgres.indexes import GinIndex
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Talk
+from core.seeding import seed_schedule
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données, puis compare plans EXPLAIN et latences des requêtes "
+        "de talks sans puis avec les index de Talk.Meta.indexes. "
+        "Tout est annulé à la fin (transaction) : à lancer sur une base de test, "
+        "les index supprimés verrouillent la table pendant la mesure."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--talks', type=int, default=50000)
+        parser.add_argument('--rooms', type=int, default=30)
+        parser.add_argument('--speakers', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20, help="Exécutions par requête")
+        parser.add_argument('--no-explain', action='store_true', help="N'affiche pas les plans")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = seed_schedule(
+                talks=options['talks'], rooms=options['rooms'], speakers=options['speakers'],
+                prefix='bench',
+            )
+            self.stdout.write(f"Jeu de données : {counts}")
+            self.analyze()
+
+            queries = self.build_queries()
+            # L'éditeur sert uniquement à générer le SQL : pas de __enter__, que SQLite
+            # refuse dans un bloc atomique
+            editor = connection.schema_editor()
+            editor.deferred_sql = []
+
+            # L'index GIN de recherche n'existe que sur PostgreSQL : voir benchmark_search
+            indexes = [index for index in Talk._meta.indexes if not isinstance(index, GinIndex)]
+            self.run_sql([str(index.remove_sql(Talk, editor)) for index in indexes])
+            self.analyze()
+            before = self.measure(queries, 'AVANT (sans index)', options)
+
+            self.run_sql([str(index.create_sql(Talk, editor)) for index in indexes])
+            self.analyze()
+            after = self.measure(queries, 'APRÈS (avec index)', options)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("\nRésumé (médiane, ms)"))
+            for label in queries:
+                gain = before[label] / after[label] if after[label] else float('inf')
+                self.stdout.write(
+                    f"  {label:<28} {before[label]:>9.3f} -> {after[label]:>9.3f}  (x{gain:.1f})"
+                )
+
+            # Rien ne doit rester en base : données et index reviennent à l'état initial
+            transaction.set_rollback(True)
+
+    def build_queries(self):
+        talk = Talk.objects.order_by('start', 'id')[Talk.objects.count() // 2]
+        window_start = talk.start - datetime.timedelta(minutes=30)
+        window_end = talk.start + datetime.timedelta(minutes=30)
+
+        return {
+            'planning jour + salle': lambda: list(
+                Talk.objects.filter(startdate=talk.startdate, room_id=talk.room_id).order_by('start')
+            ),
+            'chevauchement conférencier': lambda: Talk.objects.filter(
+                speaker_id=talk.speaker_id, start__lt=window_end, end__gt=window_start
+            ).exists(),
+            'talks d\'un organisateur': lambda: list(
+                Talk.objects.filter(organizer_id=talk.organizer_id).order_by('start')[:50]
+            ),
+            'talks en attente': lambda: list(
+                Talk.objects.filter(status='pending').order_by('start')[:50]
+            ),
+            'page curseur (start, id)': lambda: list(
+                Talk.objects.filter(start__gt=talk.start).order_by('start', 'id')[:50]
+            ),
+        }
+
+    def measure(self, queries, title, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{title}"))
+        results = {}
+        for label, run in queries.items():
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[label] = statistics.median(timings)
+            self.stdout.write(f"  {label:<28} médiane {results[label]:.3f} ms")
+
+            if not options['no_explain']:
+                with connection.execute_wrapper(self.capture):
+                    self.captured = None
+                    run()
+                for line in self.explain(self.captured).splitlines():
+                    self.stdout.write(f"      {line}")
+        return results
+
+    def capture(self, execute, sql, params, many, context):
+        self.captured = (sql, params)
+        return execute(sql, params, many, context)
+
+    def explain(self, query):
+        sql, params = query
+        prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+    def run_sql(self, statements):
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def analyze(self):
+        # Statistiques à jour pour que le planificateur voie les nouvelles lignes
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
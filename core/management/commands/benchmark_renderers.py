@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_serializers import fast_serializer_for
+from core.models import Talk
+from core.renderers import FastJSONRenderer, orjson
+from core.seeding import seed_schedule
+from core.serializers import TalkSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le rendu JSON des réponses de /talks/ (pages de --sizes talks) par JSONRenderer "
+        "de DRF et par FastJSONRenderer (orjson si installé), et vérifie que les octets sont "
+        "identiques. Sans --existing, les talks sont générés dans une transaction annulée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--talks', type=int, default=5000)
+        parser.add_argument('--sizes', default='50,500,5000', help="Tailles de page, séparées par des virgules")
+        parser.add_argument('--rounds', type=int, default=20, help="Mesures par rendu (meilleure gardée)")
+        parser.add_argument('--existing', action='store_true', help="Utilise les données en base")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson n'est pas installé : FastJSONRenderer utilise json"))
+        if options['existing']:
+            self.run(sizes, options['rounds'])
+            return
+        try:
+            with transaction.atomic():
+                seed_schedule(talks=options['talks'], rooms=30, speakers=max(1, options['talks'] // 5),
+                              organizers=10, prefix='bench-renderers', seed=0)
+                self.run(sizes, options['rounds'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, sizes, rounds):
+        fast = fast_serializer_for(TalkSerializer)
+        rows = list(Talk.objects.order_by('start', 'id').values(*fast.columns)[:max(sizes)])
+        drf, renderer = JSONRenderer(), FastJSONRenderer()
+
+        self.stdout.write(f"{'talks':>6} {'Ko':>8} {'DRF ms':>8} {'rapide ms':>10} {'Mo/s':>7} {'gain':>6}")
+        for size in sizes:
+            # Corps d'une page de /talks/ (KeysetCursorPagination)
+            data = {'next': None, 'previous': None, 'results': fast.serialize(rows[:size])}
+            (drf_time, expected), (fast_time, actual) = (
+                self.measure(drf, data, rounds), self.measure(renderer, data, rounds)
+            )
+            if expected != actual:
+                raise CommandError(f"Page de {size} talks : JSON différent de JSONRenderer")
+            self.stdout.write(
+                f"{len(data['results']):>6} {len(actual) / 1024:>8.1f} {drf_time * 1000:>8.2f} "
+                f"{fast_time * 1000:>10.2f} {len(actual) / fast_time / 2 ** 20:>7.0f} "
+                f"{drf_time / fast_time:>5.1f}x"
+            )
+        self.stdout.write(self.style.SUCCESS("JSON identique octet pour octet"))
+
+    @staticmethod
+    def measure(renderer, data, rounds):
+        best, content = None, None
+        for _ in range(max(1, rounds)):
+            started = time.perf_counter()
+            content = renderer.render(data)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
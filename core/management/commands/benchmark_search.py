@@ -0,0 +1,100 @@
+import operator
+import statistics
+import time
+from functools import reduce
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from core.models import Talk
+from core.search import RANK_ANNOTATION, TalkSearchFilter
+from core.seeding import seed_schedule
+from core.talk_views import TalkListCreateView
+
+SEARCHES = ['python', 'docker cache', 'observ', 'bench-speaker-42']
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un corpus de talks, puis compare ?search= en ILIKE (SearchFilter de DRF) et "
+        "en plein texte (tsvector + GIN, PostgreSQL uniquement) : première page et comptage. "
+        "Tout est annulé à la fin (transaction)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--talks', type=int, default=100000)
+        parser.add_argument('--rooms', type=int, default=40)
+        parser.add_argument('--speakers', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=10, help="Exécutions par requête")
+
+    def handle(self, *args, **options):
+        full_text = TalkSearchFilter.is_supported()
+        if not full_text:
+            self.stdout.write(self.style.WARNING(
+                "Base non PostgreSQL : seule la recherche ILIKE est mesurée."
+            ))
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            counts = seed_schedule(
+                talks=options['talks'], rooms=options['rooms'], speakers=options['speakers'],
+                prefix='bench',
+            )
+            self.stdout.write(f"Jeu de données : {counts} ({time.perf_counter() - started:.1f} s)")
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+            headers = ['ILIKE page', 'ILIKE nb'] + (['FTS page', 'FTS nb'] if full_text else [])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{'recherche':<20}" + ''.join(f' {header:>10}' for header in headers)
+                + "   (médiane, ms)"
+            ))
+            for search in SEARCHES:
+                terms = search.split()
+                ilike = self.ilike(terms)
+                timings = [
+                    self.measure(lambda: list(ilike.order_by('start', 'id')[:50]), options),
+                    self.measure(lambda: ilike.aggregate(n=Count('pk')), options),
+                ]
+                if full_text:
+                    fts = self.full_text(terms)
+                    ranked = fts.order_by('-' + RANK_ANNOTATION, 'id')
+                    timings += [
+                        self.measure(lambda: list(ranked[:50]), options),
+                        self.measure(lambda: fts.aggregate(n=Count('pk')), options),
+                    ]
+                columns = ''.join(f' {timing:>10.2f}' for timing in timings)
+                self.stdout.write(f"{search:<20}{columns}")
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def ilike(terms):
+        # Même condition que filters.SearchFilter : chaque terme dans l'un des champs
+        fields = TalkListCreateView.search_fields
+        return Talk.objects.filter(reduce(operator.and_, (
+            reduce(operator.or_, (Q(**{f'{field}__icontains': term}) for field in fields))
+            for term in terms
+        )))
+
+    @staticmethod
+    def full_text(terms):
+        return TalkSearchFilter().filter_queryset(
+            _SearchRequest(terms), Talk.objects.all(), TalkListCreateView
+        )
+
+    @staticmethod
+    def measure(run, options):
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+
+class _SearchRequest:
+    # Requête minimale pour SearchFilter.get_search_terms
+    def __init__(self, terms):
+        self.query_params = {TalkSearchFilter.search_param: ' '.join(terms)}
@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_serializers import fast_serializer_for
+from core.models import Talk
+from core.querysets import optimize_queryset
+from core.seeding import seed_schedule
+from core.serializers import RoomSerializer, TalkCompactSerializer, TalkSerializer
+
+SERIALIZERS = {
+    'talk': TalkSerializer,
+    'compact': TalkCompactSerializer,
+    'room': RoomSerializer,
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit (lignes/s) de serializer_class(many=True) et de la sérialisation "
+        "rapide de core.fast_serializers, requête comprise, et vérifie que le JSON est identique. "
+        "Sans --existing, les talks sont générés dans une transaction annulée à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--talks', type=int, default=5000)
+        parser.add_argument('--rounds', type=int, default=5, help="Mesures par chemin (meilleure gardée)")
+        parser.add_argument('--existing', action='store_true', help="Utilise les données en base")
+
+    def handle(self, *args, **options):
+        if options['existing']:
+            self.run(options['rounds'])
+            return
+        try:
+            with transaction.atomic():
+                seed_schedule(talks=options['talks'], rooms=30, speakers=max(1, options['talks'] // 5),
+                              organizers=10, prefix='bench-serializers', seed=0)
+                self.run(options['rounds'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, rounds):
+        self.stdout.write(f"{'serializer':<12} {'lignes':>7} {'DRF l/s':>10} {'rapide l/s':>11} {'gain':>6}")
+        for name, serializer_class in SERIALIZERS.items():
+            fast = fast_serializer_for(serializer_class)
+            if fast is None:
+                raise CommandError(f"{serializer_class.__name__} n'a pas de chemin rapide")
+            model = serializer_class.Meta.model
+            queryset = model.objects.order_by('pk')
+
+            def drf():
+                return serializer_class(optimize_queryset(queryset, serializer_class), many=True).data
+
+            def fast_path():
+                return fast.serialize(queryset.values(*fast.columns))
+
+            (drf_time, expected), (fast_time, actual) = self.measure(drf, rounds), self.measure(fast_path, rounds)
+            renderer = JSONRenderer()
+            if renderer.render(expected) != renderer.render(actual):
+                raise CommandError(f"{serializer_class.__name__} : JSON différent du chemin DRF")
+
+            rows = len(expected)
+            self.stdout.write(
+                f"{name:<12} {rows:>7} {rows / drf_time:>10.0f} {rows / fast_time:>11.0f} "
+                f"{drf_time / fast_time:>5.1f}x"
+            )
+        self.stdout.write(self.style.SUCCESS("JSON identique octet pour octet"))
+
+    @staticmethod
+    def measure(serialize, rounds):
+        best, data = None, None
+        for _ in range(max(1, rounds)):
+            started = time.perf_counter()
+            data = serialize()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
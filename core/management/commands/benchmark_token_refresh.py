@@ -0,0 +1,85 @@
+import datetime
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.models import User
+from core.token_blacklist import FilteredRefreshToken, blacklist_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit de POST /refresh/ avec N jetons en circulation, avec puis sans le "
+        "filtre de liste noire en mémoire. Tout est annulé à la fin (transaction)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tokens', type=int, default=1_000_000)
+        parser.add_argument('--blacklisted', type=float, default=0.1,
+                            help="Part des jetons générés mis en liste noire")
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(
+                username=f'bench-{uuid.uuid4().hex[:8]}', email=f'{uuid.uuid4().hex}@bench.local',
+                role='speaker', password=make_password(None),
+            )
+            self.seed(user, options)
+            refresh = str(FilteredRefreshToken.for_user(user))
+
+            results = {}
+            for label, enabled in (('filtre en mémoire', True), ('base seule', False)):
+                blacklist_index.reset()
+                filter_options = {**settings.TOKEN_BLACKLIST_FILTER, 'ENABLED': enabled}
+                hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+                with override_settings(TOKEN_BLACKLIST_FILTER=filter_options, ALLOWED_HOSTS=hosts):
+                    results[label] = self.measure(refresh, options['requests'])
+                self.stdout.write(f"  {label:<18} {results[label]:>8.0f} refresh/s")
+
+            gain = results['filtre en mémoire'] / results['base seule']
+            self.stdout.write(self.style.SUCCESS(f"Gain : x{gain:.2f}"))
+            transaction.set_rollback(True)
+        blacklist_index.reset()
+
+    def seed(self, user, options):
+        started = time.perf_counter()
+        now = timezone.now()
+        expires_at = now + datetime.timedelta(days=7)
+        every = int(1 / options['blacklisted']) if options['blacklisted'] else 0
+
+        for offset in range(0, options['tokens'], options['batch_size']):
+            size = min(options['batch_size'], options['tokens'] - offset)
+            tokens = OutstandingToken.objects.bulk_create([
+                OutstandingToken(user=user, jti=uuid.uuid4().hex, token='', created_at=now,
+                                 expires_at=expires_at)
+                for _ in range(size)
+            ])
+            if every:
+                BlacklistedToken.objects.bulk_create(
+                    [BlacklistedToken(token=token) for token in tokens[::every]]
+                )
+        self.stdout.write(
+            f"{options['tokens']} jetons générés en {time.perf_counter() - started:.1f} s"
+        )
+
+    def measure(self, refresh, requests):
+        client = Client()
+        client.cookies['refresh_token'] = refresh
+        # Premier appel hors mesure : construction du filtre
+        client.post('/refresh/')
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = client.post('/refresh/')
+            assert response.status_code == 200, response.content
+        return requests / (time.perf_counter() - started)
@@ -0,0 +1,57 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_import import import_talks, read_rows
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Importe un programme de talks depuis un fichier CSV, JSON ou NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier à importer ('-' pour l'entrée standard)")
+        parser.add_argument('--format', choices=['csv', 'json', 'ndjson'],
+                            help="Déduit de l'extension du fichier par défaut")
+        parser.add_argument('--organizer', help="E-mail de l'organisateur à associer aux talks")
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--partial', action='store_true',
+                            help="Insère les lignes valides même si d'autres sont en erreur")
+        parser.add_argument('--dry-run', action='store_true', help="Valide sans rien insérer")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if fmt not in ('csv', 'json', 'ndjson'):
+            raise CommandError("Format inconnu : utilisez --format csv, json ou ndjson.")
+
+        organizer = None
+        if options['organizer']:
+            try:
+                organizer = User.objects.get(email=options['organizer'], role='organizer')
+            except User.DoesNotExist:
+                raise CommandError(f"Organisateur introuvable : {options['organizer']}")
+
+        started = time.perf_counter()
+        if path == '-':
+            rows = read_rows(sys.stdin, fmt)
+        else:
+            with open(path, encoding='utf-8', newline='') as stream:
+                rows = read_rows(stream, fmt)
+
+        result = import_talks(
+            rows, organizer=organizer, chunk_size=options['chunk_size'],
+            partial=options['partial'], dry_run=options['dry_run'],
+        )
+        elapsed = time.perf_counter() - started
+
+        for error in result.as_dict()['errors']:
+            self.stderr.write(f"Ligne {error['row']} : " + ' ; '.join(error['errors']))
+        if result.errors and (not options['partial'] or result.aborted):
+            raise CommandError(f"{len(result.errors)} ligne(s) en erreur, rien n'a été importé.")
+
+        verb = "seraient importés" if options['dry_run'] else "importés"
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.created} talk(s) {verb} en {elapsed:.2f} s."
+        ))
@@ -0,0 +1,121 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Test de charge HTTP : N connexions simultanées sur chaque URL donnée, par exemple "
+        "/talks/ servi par gunicorn (WSGI) et /async/talks/ servi par uvicorn (ASGI). "
+        "Chaque client ouvre une connexion par requête ; --slow-send étale l'envoi de la "
+        "requête comme un mobile sur un réseau lent, --think espace deux requêtes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help="URLs complètes à comparer")
+        parser.add_argument('--concurrency', type=int, default=500)
+        parser.add_argument('--duration', type=float, default=10.0, help="Durée par URL (s)")
+        parser.add_argument('--think', type=float, default=0.0,
+                            help="Pause de chaque client entre deux requêtes (s)")
+        parser.add_argument('--slow-send', type=float, default=0.0,
+                            help="Durée d'envoi de chaque requête, en deux moitiés (s)")
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--user', help="Nom d'utilisateur pour lequel générer un jeton d'accès")
+        parser.add_argument('--token', help="Jeton d'accès déjà émis")
+
+    def handle(self, *args, **options):
+        token = options['token']
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Utilisateur introuvable : {options['user']}")
+            token = str(AccessToken.for_user(user))
+
+        self.stdout.write(
+            f"{options['concurrency']} clients, {options['duration']:.0f} s par URL, "
+            f"envoi {options['slow_send']} s, pause {options['think']} s"
+        )
+        for url in options['urls']:
+            result = asyncio.run(self.run(url, token, options))
+            self.report(url, result, options['duration'])
+
+    async def run(self, url, token, options):
+        parts = urlsplit(url)
+        if parts.scheme != 'http':
+            raise CommandError("Seul http:// est pris en charge.")
+        target = parts.path + (f'?{parts.query}' if parts.query else '')
+        headers = [f'GET {target} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: close']
+        if token:
+            headers.append(f'Authorization: Bearer {token}')
+        request = ('\r\n'.join(headers) + '\r\n\r\n').encode()
+
+        result = {'latencies': [], 'statuses': {}, 'errors': 0}
+        deadline = time.monotonic() + options['duration']
+        clients = [
+            self.client(parts.hostname, parts.port or 80, request, deadline, result, options)
+            for _ in range(options['concurrency'])
+        ]
+        await asyncio.gather(*clients)
+        return result
+
+    async def client(self, host, port, request, deadline, result, options):
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                status = await asyncio.wait_for(
+                    self.fetch(host, port, request, options['slow_send']),
+                    timeout=options['timeout'],
+                )
+            except (OSError, asyncio.TimeoutError, ValueError):
+                result['errors'] += 1
+            else:
+                result['latencies'].append(time.monotonic() - started)
+                result['statuses'][status] = result['statuses'].get(status, 0) + 1
+            if options['think']:
+                await asyncio.sleep(options['think'])
+
+    @staticmethod
+    async def fetch(host, port, request, slow_send):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            if slow_send:
+                # Un worker synchrone qui a déjà accepté la connexion attend la seconde moitié
+                middle = len(request) // 2
+                writer.write(request[:middle])
+                await writer.drain()
+                await asyncio.sleep(slow_send)
+                request = request[middle:]
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            # Lecture complète de la réponse : Connection: close, le serveur ferme à la fin
+            await reader.read()
+        finally:
+            writer.close()
+        return int(status_line.split()[1])
+
+    def report(self, url, result, duration):
+        latencies = sorted(result['latencies'])
+        self.stdout.write(f"\n{url}")
+        if not latencies:
+            self.stdout.write(self.style.ERROR(f"  aucune réponse ({result['errors']} erreurs)"))
+            return
+
+        def percentile(value):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * value))] * 1000
+
+        statuses = ', '.join(f'{code}: {count}' for code, count in sorted(result['statuses'].items()))
+        self.stdout.write(f"  {len(latencies) / duration:>8.0f} req/s   ({statuses})")
+        self.stdout.write(
+            f"  latence médiane {statistics.median(latencies) * 1000:.0f} ms, "
+            f"p95 {percentile(0.95):.0f} ms, p99 {percentile(0.99):.0f} ms"
+        )
+        if result['errors']:
+            self.stdout.write(self.style.WARNING(f"  {result['errors']} erreurs (connexion ou délai)"))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from core.token_blacklist import blacklist_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime les jetons expirés (OutstandingToken et, en cascade, BlacklistedToken) "
+        "par tranches d'id, pour ne jamais verrouiller la table longtemps."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--dry-run', action='store_true', help="Compte sans supprimer")
+
+    def handle(self, *args, **options):
+        now = aware_utcnow()
+        bounds = OutstandingToken.objects.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            self.stdout.write("Aucun jeton.")
+            return
+
+        expired = OutstandingToken.objects.filter(expires_at__lte=now)
+        deleted = 0
+        # Parcours par plages de clé primaire : chaque tranche est un scan d'index borné
+        for start in range(bounds['first'], bounds['last'] + 1, options['batch_size']):
+            batch = expired.filter(id__gte=start, id__lt=start + options['batch_size'])
+            if options['dry_run']:
+                deleted += batch.count()
+                continue
+            with transaction.atomic():
+                count, _ = batch.delete()
+            deleted += count
+
+        if not options['dry_run']:
+            # Le filtre de ce processus repart de la table ; les autres workers gardent
+            # des jti supprimés, sans conséquence (faux positifs vérifiés en base)
+            blacklist_index.reset()
+
+        verb = "à supprimer" if options['dry_run'] else "supprimé(s)"
+        self.stdout.write(self.style.SUCCESS(f"{deleted} enregistrement(s) {verb}."))
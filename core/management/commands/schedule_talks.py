@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.solver import (
+    ScheduleConflict,
+    ScheduleProblem,
+    ScheduleRequestSerializer,
+    apply_schedule,
+    solve_schedule,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Place automatiquement les talks acceptés : salle et heure de début sans conflit de "
+        "salle ni de conférencier, au plus près des heures demandées, appliqué en une transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', action='append', dest='dates', help="Jour à planifier (répétable)")
+        parser.add_argument('--room', action='append', dest='rooms', type=int,
+                            help="Salle utilisable (répétable ; toutes par défaut)")
+        parser.add_argument('--day-start', default='08:00')
+        parser.add_argument('--day-end', default='20:00')
+        parser.add_argument('--step', type=int, default=15, help="Pas des heures de début (min)")
+        parser.add_argument('--room-gap', type=int, default=0, help="Battement entre deux talks d'une salle (min)")
+        parser.add_argument('--max-parallel-per-level', type=int,
+                            help="Nombre maximal de talks d'un même niveau en même temps")
+        parser.add_argument('--availability',
+                            help="Fichier JSON des disponibilités : [{speaker, start, end}, ...]")
+        parser.add_argument('--time-limit', type=float, default=10)
+        parser.add_argument('--dry-run', action='store_true', help="Calcule sans rien enregistrer")
+
+    def handle(self, *args, **options):
+        data = {
+            'day_start': options['day_start'],
+            'day_end': options['day_end'],
+            'step': options['step'],
+            'room_gap': options['room_gap'],
+            'max_parallel_per_level': options['max_parallel_per_level'],
+            'time_limit': options['time_limit'],
+        }
+        for key in ('dates', 'rooms'):
+            if options[key]:
+                data[key] = options[key]
+        if options['availability']:
+            with open(options['availability'], encoding='utf-8') as stream:
+                data['availability'] = json.load(stream)
+
+        params = ScheduleRequestSerializer(data=data)
+        if not params.is_valid():
+            raise CommandError(json.dumps(params.errors, ensure_ascii=False))
+        settings = dict(params.validated_data)
+        time_limit = settings.pop('time_limit')
+
+        result = solve_schedule(ScheduleProblem.from_database(**settings), time_limit)
+        summary = result.as_dict()
+        for change in summary['changes']:
+            self.stdout.write(
+                f"{change['title'][:40]:<40} salle {change['previous_room']} -> {change['room']}, "
+                f"{timezone.localtime(change['previous_start']):%d/%m %H:%M} -> "
+                f"{timezone.localtime(change['start']):%d/%m %H:%M}"
+            )
+        for talk in summary['unplaced']:
+            self.stderr.write(f"Sans place : {talk['title']} ({talk['speakerName']})")
+        self.stdout.write(
+            f"{summary['talks']} talk(s), {summary['moved']} déplacé(s), "
+            f"{summary['displacement_minutes']} min d'écart cumulé, en {summary['elapsed_ms']} ms"
+        )
+        if result.unplaced:
+            raise CommandError(f"{len(result.unplaced)} talk(s) sans place, rien n'a été enregistré.")
+        if options['dry_run']:
+            return
+
+        try:
+            apply_schedule(result)
+        except ScheduleConflict as exc:
+            raise CommandError("Le programme a changé pendant le calcul :\n" + '\n'.join(exc.messages))
+        self.stdout.write(self.style.SUCCESS(f"{summary['moved']} talk(s) enregistré(s)."))
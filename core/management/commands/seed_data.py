@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from core.cache import invalidate_schedule
+from core.day_grid import invalidate_day_grids
+from core.models import Room, Talk, User
+from core.seeding import seed_schedule
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données de programme (conférenciers, organisateurs, salles, talks) "
+        "pour le développement et les benchmarks. Les comptes partagent le mot de passe "
+        "--password ; --replace supprime d'abord les données du même préfixe."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--talks', type=int, default=5000)
+        parser.add_argument('--rooms', type=int, default=30)
+        parser.add_argument('--speakers', type=int, default=1000)
+        parser.add_argument('--organizers', type=int, default=10)
+        parser.add_argument('--prefix', default='seed', help="Préfixe des noms d'utilisateurs et de salles")
+        parser.add_argument('--seed', type=int, default=0, help="Graine aléatoire (reproductibilité)")
+        parser.add_argument('--password', default='benchmark')
+        parser.add_argument('--replace', action='store_true')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options['replace']:
+                deleted = self.delete(prefix)
+                self.stdout.write(f"Supprimé : {deleted}")
+            counts = seed_schedule(
+                talks=options['talks'], rooms=options['rooms'], speakers=options['speakers'],
+                organizers=options['organizers'], prefix=prefix, seed=options['seed'],
+                password=options['password'],
+            )
+            # bulk_create n'émet pas de signaux
+            invalidate_schedule()
+            invalidate_day_grids()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Créé : {counts} en {time.perf_counter() - started:.1f} s"
+        ))
+
+    @staticmethod
+    def delete(prefix):
+        users = User.objects.filter(username__startswith=f'{prefix}-')
+        rooms = Room.objects.filter(name__startswith=f'{prefix} salle ')
+        talks = Talk.objects.filter(Q(speaker__in=users) | Q(organizer__in=users) | Q(room__in=rooms))
+        # DELETE direct : pas de signal par talk (webhooks, flux en direct) pour des données de test
+        return {
+            'talks': talks._raw_delete(talks.db),
+            'rooms': rooms.delete()[0],
+            'users': users.delete()[0],
+        }
@@ -0,0 +1,339 @@
+import logging
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .cache import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# Mesures par route (latence, requêtes SQL, sérialisation, taille de réponse), agrégées
+# dans le processus en histogrammes à buckets fixes : la mémoire ne dépend que du
+# nombre de routes (borné par MAX_ROUTES), pas du nombre de requêtes.
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CONNECT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+OTHER_ROUTE = '<other>'
+UNMATCHED_ROUTE = '<unmatched>'
+# Requêtes SQL gardées par requête HTTP pour le journal des requêtes lentes
+MAX_LOGGED_QUERIES = 100
+
+# Mesures de la requête HTTP en cours ; suit la requête dans les threads de sync_to_async
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'sql')
+
+    def __init__(self, capture_sql=False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.sql = [] if capture_sql else None
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Dernière case : au-delà du plus grand bucket (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class RouteMetrics:
+    __slots__ = ('duration', 'queries', 'size', 'db_time', 'serializer_time', 'statuses')
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+        # Ouvertures de connexion (ou emprunts au pool) par alias de base
+        self._connects = {}
+        self._wrappers = weakref.WeakSet()
+
+    def observe_connect(self, wrapper, duration):
+        with self._lock:
+            histogram = self._connects.get(wrapper.alias)
+            if histogram is None:
+                histogram = self._connects[wrapper.alias] = Histogram(CONNECT_BUCKETS)
+            histogram.observe(duration)
+            self._wrappers.add(wrapper)
+
+    def observe(self, method, route, status_code, duration, stats, size):
+        key = (method, route)
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                if len(self._routes) >= settings.PERFORMANCE['MAX_ROUTES']:
+                    key = (method, OTHER_ROUTE)
+                metrics = self._routes.setdefault(key, RouteMetrics())
+            metrics.duration.observe(duration)
+            metrics.queries.observe(stats.queries)
+            metrics.db_time += stats.db_time
+            metrics.serializer_time += stats.serializer_time
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+            if size is not None:
+                metrics.size.observe(size)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._connects.clear()
+
+    def render(self):
+        """Format texte d'exposition Prometheus"""
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+            self._render_counter(
+                lines, 'talkback_http_requests_total', "Requêtes HTTP traitées",
+                ((labels, f'status="{code}"', count)
+                 for labels, metrics in self._labelled(routes)
+                 for code, count in sorted(metrics.statuses.items())),
+            )
+            for name, attribute, help_text in (
+                ('talkback_http_request_duration_seconds', 'duration', "Latence des requêtes HTTP"),
+                ('talkback_db_queries_per_request', 'queries', "Requêtes SQL par requête HTTP"),
+                ('talkback_http_response_size_bytes', 'size', "Taille des réponses (hors flux)"),
+            ):
+                self._render_histogram(lines, name, help_text, (
+                    (labels, getattr(metrics, attribute)) for labels, metrics in self._labelled(routes)
+                ))
+            for name, attribute, help_text in (
+                ('talkback_db_query_seconds_total', 'db_time', "Temps passé en base"),
+                ('talkback_serializer_seconds_total', 'serializer_time', "Temps de sérialisation"),
+            ):
+                self._render_counter(lines, name, help_text, (
+                    (labels, None, round(getattr(metrics, attribute), 6))
+                    for labels, metrics in self._labelled(routes)
+                ))
+        self._render_counter(
+            lines, 'talkback_cache_requests_total', "Cache des réponses du planning",
+            ((f'endpoint="{endpoint}"', f'outcome="{outcome}"', count)
+             for endpoint, outcomes in sorted(cache_stats().items())
+             for outcome, count in sorted(outcomes.items())),
+        )
+        self._render_connections(lines)
+        return '\n'.join(lines) + '\n'
+
+    def _render_connections(self, lines):
+        with self._lock:
+            connects = sorted(self._connects.items())
+            # Connexions du processus ouvertes en ce moment (une par thread et par alias)
+            opened = {}
+            for wrapper in list(self._wrappers):
+                if wrapper.connection is not None:
+                    opened[wrapper.alias] = opened.get(wrapper.alias, 0) + 1
+        self._render_histogram(
+            lines, 'talkback_db_connect_seconds', "Ouverture d'une connexion ou emprunt au pool",
+            ((f'alias="{alias}"', histogram) for alias, histogram in connects),
+        )
+        self._render_gauge(
+            lines, 'talkback_db_connections_open', "Connexions ouvertes par le processus",
+            ((f'alias="{alias}"', opened.get(alias, 0)) for alias, _ in connects),
+        )
+
+        # Pool psycopg (OPTIONS['pool']) : partagé par les threads du processus
+        pools = sorted((alias, pool.get_stats()) for alias, pool in pool_stats_sources())
+        for name, help_text, value in (
+            ('talkback_db_pool_size', "Connexions du pool", lambda s: s.get('pool_size', 0)),
+            ('talkback_db_pool_in_use', "Connexions du pool empruntées",
+             lambda s: s.get('pool_size', 0) - s.get('pool_available', 0)),
+            ('talkback_db_pool_waiting', "Demandes en attente d'une connexion",
+             lambda s: s.get('requests_waiting', 0)),
+        ):
+            if pools:
+                self._render_gauge(lines, name, help_text, (
+                    (f'alias="{alias}"', value(stats)) for alias, stats in pools
+                ))
+        for name, help_text, value in (
+            ('talkback_db_pool_waits_total', "Demandes qui ont dû attendre",
+             lambda s: s.get('requests_queued', 0)),
+            ('talkback_db_pool_wait_seconds_total', "Temps d'attente d'une connexion",
+             lambda s: s.get('requests_wait_ms', 0) / 1000),
+            ('talkback_db_pool_connect_seconds_total', "Temps d'ouverture des connexions du pool",
+             lambda s: s.get('connections_ms', 0) / 1000),
+        ):
+            if pools:
+                self._render_counter(lines, name, help_text, (
+                    (f'alias="{alias}"', None, value(stats)) for alias, stats in pools
+                ))
+
+    @staticmethod
+    def _labelled(routes):
+        for (method, route), metrics in routes:
+            yield f'method="{method}",route="{_escape(route)}"', metrics
+
+    @staticmethod
+    def _render_counter(lines, name, help_text, samples):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for labels, extra, value in samples:
+            labels = f'{labels},{extra}' if extra else labels
+            lines.append(f'{name}{{{labels}}} {value}')
+
+    @staticmethod
+    def _render_gauge(lines, name, help_text, samples):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+        for labels, value in samples:
+            lines.append(f'{name}{{{labels}}} {value}')
+
+    @staticmethod
+    def _render_histogram(lines, name, help_text, histograms):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for labels, histogram in histograms:
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {round(histogram.sum, 6)}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def pool_stats_sources():
+    """(alias, pool psycopg) des bases configurées avec OPTIONS['pool']"""
+    for alias, config in settings.DATABASES.items():
+        if config.get('OPTIONS', {}).get('pool'):
+            yield alias, connections[alias].pool
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def timed_connect(wrapper):
+    """Mesure l'ouverture d'une connexion (core.backends)"""
+    started = time.perf_counter()
+    yield
+    registry.observe_connect(wrapper, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """Wrapper d'exécution SQL (installé sur chaque connexion, cf. core.signals)"""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.db_time += elapsed
+        if stats.sql is not None and len(stats.sql) < MAX_LOGGED_QUERIES:
+            stats.sql.append((elapsed, sql))
+
+
+def instrument(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed_serialization():
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += time.perf_counter() - started
+
+
+class PerformanceMiddleware:
+    """
+    Mesure chaque requête et l'agrège par route (gabarit d'URL : 'talks/<uuid:pk>/').
+    Au-delà de PERFORMANCE['SLOW_REQUEST_MS'], la requête est journalisée avec ses
+    requêtes SQL les plus lentes si PERFORMANCE['LOG_SQL'] est activé.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        stats, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    @staticmethod
+    def start():
+        options = settings.PERFORMANCE
+        stats = RequestStats(capture_sql=options['LOG_SQL'] and options['SLOW_REQUEST_MS'] is not None)
+        return stats, _current.set(stats), time.perf_counter()
+
+    @staticmethod
+    def finish(request, response, stats, started):
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        route = match.route if match else UNMATCHED_ROUTE
+        size = None if response.streaming else len(response.content)
+        registry.observe(request.method, route, response.status_code, duration, stats, size)
+
+        threshold = settings.PERFORMANCE['SLOW_REQUEST_MS']
+        if threshold is not None and duration * 1000 >= threshold:
+            message = "Requête lente : %s %s -> %s en %.0f ms (%d requêtes SQL, %.0f ms en base)"
+            args = [request.method, request.get_full_path(), response.status_code,
+                    duration * 1000, stats.queries, stats.db_time * 1000]
+            if stats.sql:
+                slowest = sorted(stats.sql, key=lambda item: item[0], reverse=True)[:10]
+                message += ''.join('\n  %.1f ms  %s' for _ in slowest)
+                for elapsed, sql in slowest:
+                    args += [elapsed * 1000, sql]
+            logger.warning(message, *args)
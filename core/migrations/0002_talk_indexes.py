@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="talk",
+            index=models.Index(
+                fields=["startdate", "room", "start"], name="talk_day_room_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="talk",
+            index=models.Index(fields=["speaker", "start", "end"], name="talk_speaker_slot_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="talk",
+            index=models.Index(fields=["organizer", "start"], name="talk_organizer_start_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="talk",
+            index=models.Index(fields=["start", "id"], name="talk_start_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="talk",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["start"],
+                name="talk_pending_start_idx",
+            ),
+        ),
+    ]
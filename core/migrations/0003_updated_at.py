@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_talk_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Date de modification"),
+        ),
+        migrations.AddField(
+            model_name="talk",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Date de modification"),
+        ),
+    ]
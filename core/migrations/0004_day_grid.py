@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DayGrid",
+            fields=[
+                ("day", models.DateField(primary_key=True, serialize=False, verbose_name="Jour")),
+                ("version", models.PositiveIntegerField(default=0, verbose_name="Version")),
+                ("data", models.JSONField(blank=True, null=True, verbose_name="Grille")),
+                (
+                    "built_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Date de construction"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Grille du jour",
+                "verbose_name_plural": "Grilles des jours",
+            },
+        ),
+    ]
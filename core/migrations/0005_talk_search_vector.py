@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:54
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Vecteur de recherche d'un talk, pondéré : titre (A), conférencier (B), niveau (C),
+# description (D). La configuration doit rester celle de core.search.SEARCH_CONFIG.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION core_talk_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('french', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('french', coalesce(NEW."speakerName", '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.level, '')), 'C') ||
+        setweight(to_tsvector('french', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_talk_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description, "speakerName", level ON core_talk
+FOR EACH ROW EXECUTE FUNCTION core_talk_search_vector_update();
+
+-- Remplissage des lignes existantes par le trigger
+UPDATE core_talk SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS core_talk_search_vector_trigger ON core_talk;
+DROP FUNCTION IF EXISTS core_talk_search_vector_update();
+"""
+
+CREATE_INDEX = 'CREATE INDEX "talk_search_vector_idx" ON "core_talk" USING gin ("search_vector");'
+DROP_INDEX = 'DROP INDEX IF EXISTS "talk_search_vector_idx";'
+
+
+def postgresql_only(sql):
+    # Trigger et index GIN n'existent que sur PostgreSQL : rien à faire ailleurs
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_day_grid"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="talk",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(postgresql_only(CREATE_TRIGGER), postgresql_only(DROP_TRIGGER)),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="talk",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="talk_search_vector_idx"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(postgresql_only(CREATE_INDEX), postgresql_only(DROP_INDEX)),
+            ],
+        ),
+    ]
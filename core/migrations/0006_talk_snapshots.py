@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:07
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_snapshots(apps, schema_editor):
+    # Copie initiale, en UPDATE ... SET col = (SELECT ...) : sans charger les talks
+    Talk = apps.get_model("core", "Talk")
+    User = apps.get_model("core", "User")
+    Room = apps.get_model("core", "Room")
+
+    def column(model, relation, source):
+        value = model.objects.filter(pk=OuterRef(relation)).values(source)[:1]
+        return Coalesce(Subquery(value), Value(""))
+
+    Talk.objects.update(
+        speakerName=column(User, "speaker_id", "username"),
+        speaker_email=column(User, "speaker_id", "email"),
+        organizer_name=column(User, "organizer_id", "username"),
+        room_name=column(Room, "room_id", "name"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_talk_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="talk",
+            name="organizer_name",
+            field=models.CharField(
+                blank=True, max_length=150, verbose_name="Nom de l'organisateur"
+            ),
+        ),
+        migrations.AddField(
+            model_name="talk",
+            name="room_name",
+            field=models.CharField(blank=True, max_length=255, verbose_name="Nom de la salle"),
+        ),
+        migrations.AddField(
+            model_name="talk",
+            name="speaker_email",
+            field=models.EmailField(
+                blank=True, max_length=255, verbose_name="Email du conférencier"
+            ),
+        ),
+        migrations.RunPython(fill_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-17 21:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_organizer_email(apps, schema_editor):
+    # Copie initiale en un UPDATE ... SET col = (SELECT ...), comme 0006
+    Talk = apps.get_model("core", "Talk")
+    User = apps.get_model("core", "User")
+    email = User.objects.filter(pk=OuterRef("organizer_id")).values("email")[:1]
+    Talk.objects.update(organizer_email=Coalesce(Subquery(email), Value("")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_talk_snapshots"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="talk",
+            name="organizer_email",
+            field=models.EmailField(
+                blank=True, max_length=255, verbose_name="Email de l'organisateur"
+            ),
+        ),
+        migrations.RunPython(fill_organizer_email, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Synchronisation du filtre de liste noire (core.token_blacklist) par blacklisted_at :
+    # index sur la table de simplejwt, créé ici, l'application ne le déclarant pas
+
+    dependencies = [
+        ("core", "0007_talk_organizer_email"),
+        ("token_blacklist", "0012_alter_outstandingtoken_user"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX blacklistedtoken_at_idx "
+            "ON token_blacklist_blacklistedtoken (blacklisted_at)",
+            "DROP INDEX blacklistedtoken_at_idx",
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_blacklisted_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("value", models.BigIntegerField(verbose_name="Génération")),
+            ],
+            options={
+                "verbose_name": "Génération du planning",
+            },
+        ),
+    ]
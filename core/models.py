@@ -1,5 +1,7 @@
 import uuid
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 
@@ -47,6 +49,7 @@ class Room(models.Model):
     # id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     name = models.CharField(max_length=255, unique=True, verbose_name="Nom")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
 
     class Meta:
         verbose_name = "Salle"
@@ -55,6 +58,12 @@ class Room(models.Model):
     def __str__(self):
         return self.name
 
+class TalkManager(models.Manager):
+    def get_queryset(self):
+        # search_vector ne sert qu'au filtrage en SQL : inutile de le transférer
+        return super().get_queryset().defer("search_vector")
+
+
 class Talk(models.Model):
     """
     Modèle pour les présentations/conférences
@@ -94,6 +103,7 @@ class Talk(models.Model):
         verbose_name="Conférencier",
     )
     speakerName = models.CharField(max_length=150, verbose_name="Nom du conférencier", blank=True)
+    speaker_email = models.EmailField(max_length=255, blank=True, verbose_name="Email du conférencier")
     
     # Relation avec l'organisateur
     organizer = models.ForeignKey(
@@ -107,6 +117,8 @@ class Talk(models.Model):
         null=True,
         blank=True,
     )
+    organizer_name = models.CharField(max_length=150, blank=True, verbose_name="Nom de l'organisateur")
+    organizer_email = models.EmailField(max_length=255, blank=True, verbose_name="Email de l'organisateur")
     
     room = models.ForeignKey(
         Room,
@@ -116,7 +128,26 @@ class Talk(models.Model):
         blank=True,
         verbose_name="Salle",
     )
+    room_name = models.CharField(max_length=255, blank=True, verbose_name="Nom de la salle")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    # Sert aux ETag / Last-Modified ; les UPDATE en masse doivent le renseigner eux-mêmes
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Date de modification")
+    # Recherche plein texte (core.search) : calculé par un trigger PostgreSQL, y compris
+    # pour bulk_create et les UPDATE en masse ; reste vide sur les autres bases
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TalkManager()
+
+    # Copies dénormalisées des objets liés (champ du talk -> champ source), pour les listes
+    # sans jointure (?fields=compact). Tenues à jour par core.signals quand la source change.
+    SNAPSHOTS = {
+        "speaker": {"speakerName": "username", "speaker_email": "email"},
+        "organizer": {"organizer_name": "username", "organizer_email": "email"},
+        "room": {"room_name": "name"},
+    }
+
+    # Champs relevés au chargement : état précédent transmis aux receivers de post_save
+    TRACKED_STATE = ("startdate", "status", "room_id")
 
     class Meta:
         verbose_name = "Présentation"
@@ -129,15 +160,70 @@ class Talk(models.Model):
                 name="unique_room_time_slot",
             ),
         ]
+        # Index alignés sur les chemins d'accès des vues (le filtre par salle est
+        # déjà couvert par l'index de unique_room_time_slot)
+        indexes = [
+            # Planning d'un jour, salle par salle, dans l'ordre chronologique
+            models.Index(fields=["startdate", "room", "start"], name="talk_day_room_start_idx"),
+            # Détection des chevauchements d'un conférencier (Talk.clean)
+            models.Index(fields=["speaker", "start", "end"], name="talk_speaker_slot_idx"),
+            models.Index(fields=["organizer", "start"], name="talk_organizer_start_idx"),
+            # Pagination par curseur (start, id)
+            models.Index(fields=["start", "id"], name="talk_start_id_idx"),
+            # File de relecture : seuls les talks en attente sont indexés
+            models.Index(
+                fields=["start"],
+                condition=models.Q(status="pending"),
+                name="talk_pending_start_idx",
+            ),
+            # Recherche plein texte (créé par la migration sur PostgreSQL uniquement)
+            GinIndex(fields=["search_vector"], name="talk_search_vector_idx"),
+        ]
 
     def __str__(self):
         return self.title
         
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Relations au chargement : une copie n'est relue que si sa relation a changé
+        instance._loaded_relations = {
+            relation: instance.__dict__.get(f"{relation}_id", models.DEFERRED)
+            for relation in cls.SNAPSHOTS
+        }
+        instance._loaded_state = instance.current_state()
+        return instance
+
     def save(self, *args, **kwargs):
-        # Sauvegarde du nom du conférencier pour éviter des requêtes supplémentaires
-        if self.speaker and not self.speakerName:
-            self.speakerName = self.speaker.username
+        # Copie des noms affichés pour éviter des requêtes supplémentaires
+        self.refresh_snapshots()
         super().save(*args, **kwargs)
+        self._loaded_state = self.current_state()
+
+    def current_state(self):
+        return {name: self.__dict__.get(name, models.DEFERRED) for name in self.TRACKED_STATE}
+
+    def refresh_snapshots(self):
+        """
+        Met à jour les copies des champs des objets liés, sans requête si l'objet lié est
+        déjà chargé ou si la relation n'a pas changé depuis le chargement.
+        """
+        loaded = getattr(self, "_loaded_relations", {})
+        for relation, fields in self.SNAPSHOTS.items():
+            field = self._meta.get_field(relation)
+            related_id = getattr(self, field.attname)
+            if not field.is_cached(self) and related_id is not None:
+                unchanged = loaded.get(relation, models.DEFERRED) == related_id
+                if unchanged and all(getattr(self, name) for name in fields):
+                    continue
+            related = getattr(self, relation)
+            for name, source in fields.items():
+                setattr(self, name, getattr(related, source) if related is not None else "")
+
+    @classmethod
+    def snapshot_values(cls, relation, instance):
+        """Valeurs des copies de `relation` pour l'objet lié `instance`"""
+        return {name: getattr(instance, source) for name, source in cls.SNAPSHOTS[relation].items()}
 
     def clean(self):
         """Validation supplémentaire"""
@@ -155,15 +241,43 @@ class Talk(models.Model):
         if self.start and self.startdate and self.start.date() != self.startdate:
             raise ValidationError("La date de début doit correspondre au jour indiqué.")
             
-        # Vérifier qu'il n'y a pas de chevauchement pour ce conférencier
-        if self.speaker and self.start and self.end:
-            overlapping_talks = Talk.objects.filter(
-                speaker=self.speaker,
-                start__lt=self.end,
-                end__gt=self.start
-            ).exclude(pk=self.pk)
-
-            if overlapping_talks.exists():
-                raise ValidationError(
-                    "Ce conférencier a déjà un talk programmé sur ce créneau horaire."
-                )
+        # Vérifier qu'il n'y a pas de chevauchement pour ce conférencier ni pour cette salle,
+        # en une seule requête, et signaler tous les talks en conflit à la fois
+        from .scheduling import describe_conflict, find_conflicts
+
+        conflicts = find_conflicts(self)
+        if conflicts:
+            raise ValidationError([describe_conflict(conflict) for conflict in conflicts])
+
+
+class DayGrid(models.Model):
+    """
+    Grille salle × créneau d'une journée, précalculée (voir core.day_grid).
+    Une écriture sur les talks du jour incrémente version et vide data ;
+    la grille est reconstruite à la lecture suivante.
+    """
+
+    day = models.DateField(primary_key=True, verbose_name="Jour")
+    version = models.PositiveIntegerField(default=0, verbose_name="Version")
+    data = models.JSONField(null=True, blank=True, verbose_name="Grille")
+    built_at = models.DateTimeField(null=True, blank=True, verbose_name="Date de construction")
+
+    class Meta:
+        verbose_name = "Grille du jour"
+        verbose_name_plural = "Grilles des jours"
+
+    def __str__(self):
+        return str(self.day)
+
+
+class ScheduleGeneration(models.Model):
+    """
+    Compteur de génération du planning tenu en base (voir core.cache), quand le cache
+    est propre à chaque processus et que plusieurs workers servent l'application.
+    Une seule ligne (pk=1).
+    """
+
+    value = models.BigIntegerField(verbose_name="Génération")
+
+    class Meta:
+        verbose_name = "Génération du planning"
@@ -0,0 +1,20 @@
+import codecs
+import csv
+
+from django.conf import settings
+
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    """
+    Parse un corps text/csv en liste de dictionnaires (une entrée par ligne,
+    clés = en-têtes de colonnes).
+    """
+
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return list(csv.DictReader(codecs.getreader(encoding)(stream)))
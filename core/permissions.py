@@ -1,3 +1,6 @@
+import hmac
+
+from django.conf import settings
 from rest_framework import permissions
 
 class IsOrganizer(permissions.BasePermission):
@@ -51,3 +54,16 @@ class IsSpeakerOrReadOnly(permissions.BasePermission):
             
         # Organisateurs peuvent modifier tous les talks
         return request.user.role == 'organizer'
+
+
+class HasMetricsToken(permissions.BasePermission):
+    """
+    Accès aux métriques par jeton (en-tête « Authorization: Bearer <jeton> »), pour un
+    collecteur Prometheus. Sans jeton configuré (METRICS_TOKEN), accès refusé.
+    """
+    def has_permission(self, request, view):
+        token = settings.PERFORMANCE['METRICS_TOKEN']
+        if not token:
+            return False
+        supplied = request.META.get('HTTP_AUTHORIZATION', '')
+        return hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode())
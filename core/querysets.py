@@ -0,0 +1,113 @@
+from django.core.exceptions import FieldDoesNotExist
+
+from rest_framework import serializers
+
+# Cache des projections calculées, une entrée par classe de serializer
+_projections = {}
+
+
+def _collect(serializer, model, prefix, related, only):
+    """
+    Parcourt les champs du serializer et remplit les listes select_related / only.
+    Retourne False si un champ ne peut pas être projeté (méthode, source '*', etc.).
+    """
+    projectable = True
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        source = field.source
+        if source == '*' or '.' in source:
+            projectable = False
+            continue
+
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            # Propriété ou méthode du modèle : impossible de savoir quelles colonnes charger
+            projectable = False
+            continue
+
+        if isinstance(field, serializers.ListSerializer) or model_field.many_to_many:
+            projectable = False
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            if not (model_field.many_to_one or model_field.one_to_one) or model_field.auto_created:
+                projectable = False
+                continue
+            # Relation imbriquée : une jointure au lieu d'une requête par ligne
+            related.append(prefix + source)
+            only.append(prefix + source)
+            nested_model = model_field.related_model
+            only.append(prefix + source + '__' + nested_model._meta.pk.name)
+            if not _collect(field, nested_model, prefix + source + '__', related, only):
+                projectable = False
+            continue
+
+        if model_field.concrete:
+            only.append(prefix + source)
+
+    return projectable
+
+
+def get_projection(serializer_class):
+    """
+    Calcule (select_related, only) pour une classe de serializer.
+    only vaut None quand la projection des colonnes n'est pas sûre.
+    """
+    if serializer_class not in _projections:
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        related, only = [], [model._meta.pk.name]
+        projectable = _collect(serializer, model, '', related, only)
+        _projections[serializer_class] = (
+            tuple(dict.fromkeys(related)),
+            tuple(dict.fromkeys(only)) if projectable else None,
+        )
+    return _projections[serializer_class]
+
+
+def optimize_queryset(queryset, serializer_class):
+    """
+    Applique select_related et only() d'après les champs imbriqués du serializer,
+    pour que la sérialisation d'une liste ne déclenche aucune requête supplémentaire.
+    """
+    related, only = get_projection(serializer_class)
+    if related:
+        queryset = queryset.select_related(*related)
+    if only:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+class OptimizedQuerysetMixin:
+    """
+    Mixin pour les vues génériques : le queryset filtré est projeté selon le serializer.
+    Passe par filter_queryset pour fonctionner même quand la vue redéfinit get_queryset.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimize_queryset(queryset, self.get_serializer_class())
+
+
+# Paramètres de requête acceptés pour filtrer les talks, et champ correspondant
+TALK_FILTERS = {
+    'room': 'room_id',
+    'speaker': 'speaker_id',
+    'organizer': 'organizer_id',
+    'status': 'status',
+    'level': 'level',
+    'start_date': 'startdate',
+}
+
+
+def filter_talks(queryset, params):
+    """Filtres par paramètres de requête, partagés par les vues synchrones et asynchrones"""
+    for param, field in TALK_FILTERS.items():
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{field: value})
+    return queryset
@@ -0,0 +1,35 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# UUID, dates et datetimes encodés par orjson lui-même, au format de l'encodeur DRF
+# (datetime UTC terminé par Z) ; les autres types passent par JSONEncoder.default
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encodé par orjson quand il est installé, sinon par json comme DRF.
+
+    Même sortie que JSONRenderer : JSON compact en UTF-8, \\u2028 et \\u2029 échappés.
+    Les cas qu'orjson ne couvre pas (indentation demandée par ?indent / Accept,
+    ensure_ascii, entier de plus de 64 bits...) repassent par JSONRenderer.
+    """
+
+    use_orjson = orjson is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_orjson or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Comme JSONRenderer : sous-ensemble strict de JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,102 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.utils import timezone
+
+from rest_framework import serializers
+
+from .cache import invalidate_schedule
+from .day_grid import invalidate_day_grids
+from .models import Talk
+from .signals import talks_saved_in_bulk
+
+# Résultat par id d'une décision de relecture
+UPDATED, UNCHANGED, NOT_FOUND, FORBIDDEN = 'updated', 'unchanged', 'not_found', 'forbidden'
+
+# Nombre maximal de talks par requête
+MAX_REVIEW_BATCH = 1000
+
+
+class ReviewDecisionSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=Talk.STATUS_CHOICES)
+
+
+class ReviewRequestSerializer(serializers.Serializer):
+    """
+    Décisions de relecture : {"decisions": [{"id", "status"}, ...]}, ou un même statut
+    pour plusieurs talks : {"status": "accepted", "ids": [...]}.
+    """
+
+    decisions = ReviewDecisionSerializer(many=True, required=False)
+    status = serializers.ChoiceField(choices=Talk.STATUS_CHOICES, required=False)
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    def validate(self, attrs):
+        decisions = {decision['id']: decision['status'] for decision in attrs.get('decisions', [])}
+        if attrs.get('ids'):
+            if 'status' not in attrs:
+                raise serializers.ValidationError({'status': "Un statut est requis avec ids."})
+            decisions.update(dict.fromkeys(attrs['ids'], attrs['status']))
+        if not decisions:
+            raise serializers.ValidationError("Aucune décision.")
+        if len(decisions) > MAX_REVIEW_BATCH:
+            raise serializers.ValidationError(f"Au plus {MAX_REVIEW_BATCH} talks par requête.")
+        return decisions
+
+
+def review_talks(user, decisions):
+    """
+    Applique des changements de statut {id: statut} en une transaction : une requête lit
+    les talks concernés (droits vérifiés sur tout le lot, comme IsSpeakerOrReadOnly), un
+    seul UPDATE écrit les nouveaux statuts. Retourne le résultat par id.
+    """
+    results = dict.fromkeys(decisions, NOT_FOUND)
+
+    with transaction.atomic():
+        # Verrouillés jusqu'à la fin : l'ancien statut transmis aux webhooks reste exact
+        talks = Talk.objects.select_for_update().filter(pk__in=list(decisions))
+        changed, previous = [], {}
+        for talk in talks.defer('description', 'search_vector'):
+            # Seuls les organisateurs modifient les talks des autres
+            if user.role != 'organizer' and talk.speaker_id != user.pk:
+                results[talk.pk] = FORBIDDEN
+                continue
+            status = decisions[talk.pk]
+            if talk.status == status:
+                results[talk.pk] = UNCHANGED
+                continue
+            previous[talk.pk] = talk.status
+            talk.status = status
+            results[talk.pk] = UPDATED
+            changed.append(talk)
+
+        if changed:
+            now = timezone.now()
+            by_status = defaultdict(list)
+            for talk in changed:
+                by_status[talk.status].append(talk.pk)
+            # Une branche par statut plutôt qu'une par talk
+            Talk.objects.filter(pk__in=previous).update(
+                status=Case(
+                    *[When(pk__in=pks, then=Value(status)) for status, pks in by_status.items()],
+                    output_field=CharField(),
+                ),
+                updated_at=now,
+            )
+            for talk in changed:
+                talk.updated_at = now
+            # UPDATE sans post_save : invalidation explicite du cache et des grilles
+            invalidate_schedule()
+            invalidate_day_grids({talk.startdate for talk in changed})
+            talks_saved_in_bulk.send(sender=Talk, talks=changed, created=False, previous=previous)
+    return results
+
+
+def summarize_review(results):
+    """Réponse compacte : résultat par id et total par résultat"""
+    return {
+        'results': {str(pk): result for pk, result in results.items()},
+        'counts': dict(Counter(results.values())),
+    }
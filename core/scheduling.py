@@ -0,0 +1,145 @@
+import bisect
+from collections import defaultdict, namedtuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Talk
+
+# Un conflit : kind vaut 'room' ou 'speaker', other est le talk déjà en place
+Conflict = namedtuple('Conflict', ['kind', 'talk', 'other'])
+
+# Colonnes utiles pour détecter et décrire un conflit
+CONFLICT_FIELDS = ('id', 'title', 'start', 'end', 'room', 'speaker')
+
+
+class IntervalIndex:
+    """
+    Index d'intervalles [start, end[ regroupés par clé (salle, conférencier...).
+
+    Les intervalles de chaque clé sont triés par début ; la durée maximale connue
+    borne la recherche, une requête ne parcourt donc que les voisins du créneau.
+    """
+
+    def __init__(self):
+        self._starts = defaultdict(list)
+        self._items = defaultdict(list)
+        self._longest = defaultdict(lambda: None)
+
+    def add(self, key, start, end, item):
+        position = bisect.bisect_right(self._starts[key], start)
+        self._starts[key].insert(position, start)
+        self._items[key].insert(position, (start, end, item))
+        longest = self._longest[key]
+        if longest is None or end - start > longest:
+            self._longest[key] = end - start
+
+    def remove(self, key, start, item):
+        """Retire un élément ajouté par add() ; la durée maximale connue reste un majorant"""
+        starts, items = self._starts[key], self._items[key]
+        position = bisect.bisect_left(starts, start)
+        while items[position][2] is not item:
+            position += 1
+        del starts[position]
+        del items[position]
+
+    def overlapping(self, key, start, end):
+        """Éléments de la clé dont l'intervalle chevauche [start, end["""
+        if key not in self._starts:
+            return []
+        starts = self._starts[key]
+        first = bisect.bisect_right(starts, start - self._longest[key])
+        last = bisect.bisect_left(starts, end)
+        return [
+            item for item_start, item_end, item in self._items[key][first:last]
+            if item_start < end and item_end > start
+        ]
+
+    def intervals(self, key):
+        """Intervalles (start, end, item) d'une clé, triés par début"""
+        return list(self._items.get(key, []))
+
+
+def find_conflicts(talk):
+    """
+    Retourne tous les talks existants qui chevauchent le talk donné, dans la même salle
+    ou pour le même conférencier, en une seule requête.
+    """
+    if not (talk.start and talk.end) or not (talk.speaker_id or talk.room_id):
+        return []
+
+    same_resource = Q()
+    if talk.speaker_id:
+        same_resource |= Q(speaker_id=talk.speaker_id)
+    if talk.room_id:
+        same_resource |= Q(room_id=talk.room_id)
+
+    others = (
+        Talk.objects.filter(same_resource, start__lt=talk.end, end__gt=talk.start)
+        .exclude(pk=talk.pk)
+        .only(*CONFLICT_FIELDS)
+        .order_by('start')
+    )
+
+    conflicts = []
+    for other in others:
+        if talk.room_id and other.room_id == talk.room_id:
+            conflicts.append(Conflict('room', talk, other))
+        if talk.speaker_id and other.speaker_id == talk.speaker_id:
+            conflicts.append(Conflict('speaker', talk, other))
+    return conflicts
+
+
+def find_batch_conflicts(talks):
+    """
+    Valide un lot de talks (nouveaux ou modifiés) contre la base et entre eux.
+
+    Une seule requête charge les talks existants des salles et conférenciers concernés
+    sur la fenêtre du lot ; le reste se fait en mémoire avec des IntervalIndex.
+    Retourne la liste de tous les conflits ; les talks du lot en conflit avec un talk
+    plus tôt dans le lot sont signalés avec ce dernier comme `other`.
+    """
+    candidates = [talk for talk in talks if talk.start and talk.end]
+    if not candidates:
+        return []
+
+    rooms, speakers = IntervalIndex(), IntervalIndex()
+    room_ids = {talk.room_id for talk in candidates if talk.room_id}
+    speaker_ids = {talk.speaker_id for talk in candidates if talk.speaker_id}
+    batch_pks = {talk.pk for talk in candidates if talk.pk and not talk._state.adding}
+
+    existing = Talk.objects.filter(
+        Q(room_id__in=room_ids) | Q(speaker_id__in=speaker_ids),
+        start__lt=max(talk.end for talk in candidates),
+        end__gt=min(talk.start for talk in candidates),
+    ).exclude(pk__in=batch_pks).only(*CONFLICT_FIELDS)
+
+    for other in existing:
+        if other.room_id in room_ids:
+            rooms.add(other.room_id, other.start, other.end, other)
+        if other.speaker_id in speaker_ids:
+            speakers.add(other.speaker_id, other.start, other.end, other)
+
+    conflicts = []
+    for talk in candidates:
+        if talk.room_id:
+            for other in rooms.overlapping(talk.room_id, talk.start, talk.end):
+                conflicts.append(Conflict('room', talk, other))
+            rooms.add(talk.room_id, talk.start, talk.end, talk)
+        if talk.speaker_id:
+            for other in speakers.overlapping(talk.speaker_id, talk.start, talk.end):
+                conflicts.append(Conflict('speaker', talk, other))
+            speakers.add(talk.speaker_id, talk.start, talk.end, talk)
+    return conflicts
+
+
+def describe_conflict(conflict):
+    """Message lisible pour un conflit"""
+    other = conflict.other
+    slot = f"{timezone.localtime(other.start):%d/%m %H:%M}–{timezone.localtime(other.end):%H:%M}"
+    if conflict.kind == 'room':
+        return f"La salle est déjà occupée sur ce créneau par « {other.title} » ({slot})."
+    return (
+        f"Ce conférencier a déjà un talk programmé sur ce créneau horaire : "
+        f"« {other.title} » ({slot})."
+    )
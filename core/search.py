@@ -0,0 +1,66 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast
+
+from rest_framework import filters
+
+# Configuration plein texte : doit rester celle du trigger de la migration 0005
+SEARCH_CONFIG = 'french'
+# Annotation de pertinence (entier : exact dans le curseur de pagination)
+RANK_ANNOTATION = 'search_rank'
+
+
+def prefix_tsquery(terms):
+    """
+    Texte tsquery : chaque mot doit apparaître, en préfixe (« perf » trouve
+    « performance »), comme les termes de ?search= qui doivent tous correspondre.
+    La ponctuation est écartée : elle a un sens dans la syntaxe tsquery.
+    """
+    words = [word for term in terms for word in re.findall(r'\w+', term)]
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def build_search_query(terms):
+    tsquery = prefix_tsquery(terms)
+    if not tsquery:
+        return None
+    return SearchQuery(tsquery, search_type='raw', config=SEARCH_CONFIG)
+
+
+class TalkSearchFilter(filters.SearchFilter):
+    """
+    ?search= sur PostgreSQL : colonne tsvector (titre, conférencier, niveau, description)
+    indexée en GIN et tenue à jour par trigger, résultats classés par pertinence.
+    Sur les autres bases, recherche ILIKE habituelle de DRF sur search_fields.
+    """
+
+    @staticmethod
+    def is_supported():
+        return connection.vendor == 'postgresql'
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.is_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        query = build_search_query(self.get_search_terms(request))
+        if query is None:
+            return queryset
+        rank = SearchRank(F('search_vector'), query) * 1_000_000
+        return queryset.filter(search_vector=query).annotate(
+            **{RANK_ANNOTATION: Cast(rank, IntegerField())}
+        )
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Tri proposé à la pagination par curseur : par pertinence lors d'une recherche
+        plein texte sans ?ordering= explicite, sinon celui d'OrderingFilter.
+        """
+        ordering_filter = filters.OrderingFilter()
+        if self.is_supported() and not request.query_params.get(ordering_filter.ordering_param):
+            if build_search_query(self.get_search_terms(request)) is not None:
+                return ('-' + RANK_ANNOTATION,)
+        return ordering_filter.get_ordering(request, queryset, view)
+
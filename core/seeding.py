@@ -0,0 +1,82 @@
+import datetime
+import math
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from .models import Room, Talk, User
+
+# Créneaux d'une journée : un talk par heure et par salle, de 8h à 19h
+FIRST_SLOT_HOUR = 8
+SLOTS_PER_DAY = 11
+
+LEVELS = [choice for choice, _ in Talk.LEVEL_CHOICES]
+STATUSES = [choice for choice, _ in Talk.STATUS_CHOICES]
+WORDS = [
+    'django', 'python', 'postgresql', 'performance', 'cache', 'index', 'async', 'api',
+    'sécurité', 'tests', 'déploiement', 'docker', 'observabilité', 'données', 'front',
+]
+
+
+def seed_schedule(talks=1000, rooms=20, speakers=200, organizers=5,
+                  first_day=datetime.date(2025, 6, 12), prefix='seed', seed=0, batch_size=1000,
+                  password=None):
+    """
+    Génère un jeu de données réaliste (utilisateurs, salles, talks) par bulk_create.
+    Les talks remplissent les salles jour après jour, sans doublon de créneau par salle.
+    Il faut au moins un conférencier et une salle. Sans password, les comptes ne
+    peuvent pas se connecter.
+    Retourne un dictionnaire avec le nombre d'objets créés par modèle.
+    """
+    rng = random.Random(seed)
+    # Un seul hachage partagé : évite son coût pour des milliers de comptes
+    password = make_password(password)
+
+    speaker_objs = [
+        User(username=f'{prefix}-speaker-{i}', email=f'{prefix}-speaker-{i}@example.com',
+             first_name=f'Speaker{i}', role='speaker', password=password)
+        for i in range(speakers)
+    ]
+    organizer_objs = [
+        User(username=f'{prefix}-organizer-{i}', email=f'{prefix}-organizer-{i}@example.com',
+             role='organizer', password=password)
+        for i in range(organizers)
+    ]
+    User.objects.bulk_create(speaker_objs + organizer_objs, batch_size=batch_size)
+
+    room_objs = Room.objects.bulk_create(
+        [Room(name=f'{prefix} salle {i}') for i in range(rooms)], batch_size=batch_size
+    )
+
+    talk_objs = []
+    days = max(1, math.ceil(talks / (rooms * SLOTS_PER_DAY)))
+    for index in range(talks):
+        day_index, rest = divmod(index, rooms * SLOTS_PER_DAY)
+        slot, room_index = divmod(rest, rooms)
+        day = first_day + datetime.timedelta(days=day_index)
+        start = timezone.make_aware(
+            datetime.datetime.combine(day, datetime.time(FIRST_SLOT_HOUR + slot))
+        )
+        speaker = rng.choice(speaker_objs)
+        talk_objs.append(Talk(
+            title=' '.join(rng.sample(WORDS, 3)).capitalize(),
+            description=' '.join(rng.choices(WORDS, k=40)),
+            start=start,
+            end=start + datetime.timedelta(minutes=rng.choice([30, 45, 55])),
+            startdate=day,
+            level=rng.choice(LEVELS),
+            status=rng.choice(STATUSES),
+            speaker=speaker,
+            organizer=rng.choice(organizer_objs) if organizer_objs else None,
+            room=room_objs[room_index],
+        ))
+        talk_objs[-1].refresh_snapshots()
+    Talk.objects.bulk_create(talk_objs, batch_size=batch_size)
+
+    return {
+        'users': len(speaker_objs) + len(organizer_objs),
+        'rooms': len(room_objs),
+        'talks': len(talk_objs),
+        'days': days,
+    }
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import User, Room, Talk
+from .metrics import timed_serialization
+from .scheduling import describe_conflict, find_conflicts
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.password_validation import validate_password
 
@@ -7,6 +9,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user: User):
         token = super().get_token(user)
+        # Le rôle voyage dans le jeton : les permissions peuvent se passer de la base
+        token['role'] = user.role
         return token
 
     def validate(self, attrs):
@@ -38,25 +42,47 @@ class RegisterSerializer(serializers.ModelSerializer):
         )
         return user
 
-class UserSerializer(serializers.ModelSerializer):
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Temps de sérialisation compté dans les métriques de la requête (core.metrics).
+    Les listes passent par TimedListSerializer (Meta.list_serializer_class).
+    """
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = User
         fields = ['id', 'email', 'username', 'role', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Room
         fields = ['id', 'name']
         read_only_fields = ['id']
 
-class TalkSerializer(serializers.ModelSerializer):
+class TalkSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     speaker_details = UserSerializer(source='speaker', read_only=True)
     room_details = RoomSerializer(source='room', read_only=True)
     organizer_details = UserSerializer(source='organizer', read_only=True)
 
     class Meta:
+        list_serializer_class = TimedListSerializer
         model = Talk
         fields = [
             'id', 'title', 'description', 'start', 'end', 'startdate',
@@ -65,22 +91,51 @@ class TalkSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'speakerName', 'speaker_details', 'room_details', 'organizer_details']
         
+    def validate(self, attrs):
+        # Refuse les chevauchements de salle ou de conférencier, en listant tous les conflits
+        candidate = Talk(pk=self.instance.pk if self.instance else None)
+        for field in ('start', 'end', 'speaker', 'room'):
+            value = attrs.get(field, getattr(self.instance, field, None))
+            setattr(candidate, field, value)
+
+        conflicts = find_conflicts(candidate)
+        if conflicts:
+            raise serializers.ValidationError([describe_conflict(conflict) for conflict in conflicts])
+        return attrs
+
+    # Objets détaillés renvoyés sous le nom du champ identifiant (lu aussi par core.fast_serializers)
+    RENAMED_FIELDS = {
+        'speaker_details': 'speaker',
+        'room_details': 'room',
+        'organizer_details': 'organizer',
+    }
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         # Pour les requêtes GET, nous voulons les détails complets
-        representation.pop('speaker', None)  # Supprime l'ID simple pour éviter la duplication
-        representation.pop('room', None)     # Supprime l'ID simple pour éviter la duplication
-        representation.pop('organizer', None)  # Supprime l'ID simple pour éviter la duplication
-        
+        for target in self.RENAMED_FIELDS.values():
+            representation.pop(target, None)  # Supprime l'ID simple pour éviter la duplication
+
         # Renomme les champs détaillés pour simplifier le JSON
-        if 'speaker_details' in representation:
-            representation['speaker'] = representation.pop('speaker_details')
-        if 'room_details' in representation:
-            representation['room'] = representation.pop('room_details')
-        if 'organizer_details' in representation:
-            representation['organizer'] = representation.pop('organizer_details')
-        
+        for source, target in self.RENAMED_FIELDS.items():
+            if source in representation:
+                representation[target] = representation.pop(source)
+
         return representation
 
 
+class TalkCompactSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Talk sans objets imbriqués (?fields=compact) : identifiants et copies des noms,
+    lus dans la seule table des talks.
+    """
 
+    class Meta:
+        list_serializer_class = TimedListSerializer
+        model = Talk
+        fields = [
+            'id', 'title', 'start', 'end', 'startdate', 'level', 'status',
+            'speaker', 'speakerName', 'speaker_email', 'organizer', 'organizer_name',
+            'room', 'room_name',
+        ]
+        read_only_fields = fields
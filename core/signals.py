@@ -0,0 +1,139 @@
+from django.db.backends.signals import connection_created
+from django.db.models import DEFERRED
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .authentication import user_cache
+from .cache import invalidate_schedule
+from .day_grid import invalidate_day_grids
+from .live import publish, talk_change
+from .metrics import instrument
+from .models import Room, Talk, User
+
+# Écritures en masse (bulk_create, UPDATE) qui n'émettent pas post_save.
+# Arguments : talks (instances à jour), created (bool), previous (ancien statut par id, ou None)
+talks_saved_in_bulk = Signal()
+
+# Copies des noms (Talk.SNAPSHOTS) réécrites par refresh_talk_snapshots, sans charger les talks.
+# Arguments : relation, values (nouvelles copies), rows ((id, jour, salle) des talks modifiés)
+talk_snapshots_refreshed = Signal()
+
+
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=User)
+def invalidate_schedule_cache(sender, **kwargs):
+    invalidate_schedule()
+
+
+@receiver(pre_save, sender=Talk)
+def remember_talk_state(sender, instance, raw=False, **kwargs):
+    # État avant modification, pour tous les receivers de post_save : ancien jour (grilles),
+    # ancien statut (webhooks), ancienne salle (flux en direct). Relevé au chargement du
+    # talk (Talk.from_db) ; relu en une requête seulement pour un talk construit sans
+    # passer par la base ou chargé sans ces champs.
+    instance._previous_state = None
+    if raw or instance._state.adding:
+        return
+    loaded = getattr(instance, '_loaded_state', None)
+    if loaded and DEFERRED not in loaded.values():
+        instance._previous_state = dict(loaded)
+    else:
+        instance._previous_state = (
+            Talk.objects.filter(pk=instance.pk).values(*Talk.TRACKED_STATE).first()
+        )
+
+
+@receiver(post_save, sender=Talk)
+@receiver(post_delete, sender=Talk)
+def invalidate_talk_day_grid(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_state', None) or {}
+    days = {instance.startdate, previous.get('startdate')}
+    invalidate_day_grids(day for day in days if day is not None)
+
+
+@receiver(post_save, sender=Talk)
+def publish_talk_change(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        event = 'created' if created else 'updated'
+        publish([talk_change(event, instance, getattr(instance, '_previous_state', None))])
+
+
+@receiver(post_delete, sender=Talk)
+def publish_talk_deletion(sender, instance, **kwargs):
+    publish([talk_change('deleted', instance)])
+
+
+@receiver(talks_saved_in_bulk)
+def publish_bulk_talk_changes(sender, talks, created, previous=None, **kwargs):
+    previous = previous or {}
+    event = 'created' if created else 'updated'
+    publish([
+        talk_change(event, talk, {'status': previous[talk.pk]} if talk.pk in previous else None)
+        for talk in talks
+    ])
+
+
+@receiver(talk_snapshots_refreshed)
+def publish_renamed_talks(sender, relation, values, rows, **kwargs):
+    # Seul le nom du conférencier figure dans les événements du flux
+    if 'speakerName' in values:
+        publish([
+            {
+                'event': 'renamed', 'id': str(pk), 'startdate': startdate.isoformat(), 'room': room_id,
+                'speakerName': values['speakerName'], 'previous_startdate': None, 'previous_room': None,
+            }
+            for pk, startdate, room_id in rows
+        ])
+
+
+def refresh_talk_snapshots(relation, instance):
+    """
+    Recopie les champs de `instance` dans les talks dont la copie diffère (Talk.SNAPSHOTS)
+    et avance leur date de modification, dans le même UPDATE ; les autres talks ne sont
+    pas touchés. Retourne les id des talks modifiés.
+    """
+    values = Talk.snapshot_values(relation, instance)
+    stale = Talk.objects.filter(**{relation: instance}).exclude(**values)
+    rows = list(stale.values_list('pk', 'startdate', 'room_id'))
+    if rows:
+        stale.filter(pk__in=[pk for pk, _, _ in rows]).update(**values, updated_at=Now())
+        # La grille affiche le conférencier et la salle, pas l'organisateur
+        if relation != 'organizer':
+            invalidate_day_grids({startdate for _, startdate, _ in rows})
+        talk_snapshots_refreshed.send(sender=Talk, relation=relation, values=values, rows=rows)
+    return [pk for pk, _, _ in rows]
+
+
+@receiver(post_save, sender=Room)
+def touch_room_talks(sender, instance, created, **kwargs):
+    # Les talks embarquent le nom de la salle : seuls ceux dont la copie change sont touchés
+    if not created:
+        refresh_talk_snapshots('room', instance)
+    invalidate_schedule()
+
+
+@receiver(post_save, sender=User)
+def touch_user_talks(sender, instance, created, update_fields=None, **kwargs):
+    # La mise à jour de last_login à la connexion ne change rien aux réponses du planning
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    if not created:
+        refresh_talk_snapshots('speaker', instance)
+        refresh_talk_snapshots('organizer', instance)
+    invalidate_schedule()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    # Désactivation, changement de rôle... : la prochaine requête relira l'utilisateur
+    user_cache.evict_user(instance.pk)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Comptage des requêtes SQL par requête HTTP (core.metrics.PerformanceMiddleware)
+    instrument(connection)
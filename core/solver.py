@@ -0,0 +1,412 @@
+import datetime
+import time
+from collections import Counter, defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from rest_framework import serializers
+
+from .cache import invalidate_schedule
+from .day_grid import invalidate_day_grids
+from .models import Room, Talk
+from .scheduling import IntervalIndex, describe_conflict, find_batch_conflicts
+from .signals import talks_saved_in_bulk
+
+# Placement automatique des talks acceptés : chaque talk garde son jour et sa durée,
+# le solveur choisit salle et heure de début. Glouton (talks les plus contraints
+# d'abord), puis recherche locale : déplacement d'un talk bloquant pour placer un talk
+# resté sans créneau, et rapprochement de chaque talk de son heure demandée.
+
+# Salle et créneau attribués à un talk
+Placement = namedtuple('Placement', ['room', 'start', 'end'])
+
+
+class AvailabilitySerializer(serializers.Serializer):
+    speaker = serializers.UUIDField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError("L'heure de fin doit être après l'heure de début.")
+        return attrs
+
+
+class ScheduleRequestSerializer(serializers.Serializer):
+    """
+    Paramètres d'un calcul de planning. Sans dates, tous les talks acceptés sont placés ;
+    sans salles, toutes les salles sont utilisées. availability liste les plages où un
+    conférencier est disponible (sans plage, il l'est toute la journée).
+    """
+
+    dates = serializers.ListField(child=serializers.DateField(), required=False)
+    rooms = serializers.ListField(child=serializers.IntegerField(), required=False)
+    day_start = serializers.TimeField(default=datetime.time(8))
+    day_end = serializers.TimeField(default=datetime.time(20))
+    step = serializers.IntegerField(min_value=1, max_value=240, default=15, help_text="Pas des débuts (min)")
+    room_gap = serializers.IntegerField(min_value=0, max_value=240, default=0,
+                                        help_text="Battement entre deux talks d'une salle (min)")
+    max_parallel_per_level = serializers.IntegerField(min_value=1, required=False, allow_null=True,
+                                                      help_text="Talks d'un même niveau en même temps")
+    availability = AvailabilitySerializer(many=True, required=False)
+    time_limit = serializers.FloatField(min_value=0.1, max_value=60, default=5)
+
+    def validate(self, attrs):
+        if attrs['day_start'] >= attrs['day_end']:
+            raise serializers.ValidationError("La journée doit finir après son début.")
+        return attrs
+
+
+class ScheduleConflict(Exception):
+    """Le programme a changé entre le calcul et l'application"""
+
+    def __init__(self, messages):
+        super().__init__(f"{len(messages)} conflit(s)")
+        self.messages = messages
+
+
+class ScheduleProblem:
+    """
+    Données d'un calcul : talks à placer, salles, talks déjà en place qu'on ne déplace
+    pas (autres statuts) et disponibilités des conférenciers.
+    """
+
+    def __init__(self, talks, rooms, fixed=(), availability=None, day_start=datetime.time(8),
+                 day_end=datetime.time(20), step=15, room_gap=0, max_parallel_per_level=None):
+        self.talks = list(talks)
+        self.rooms = list(rooms)
+        self.fixed = list(fixed)
+        self.availability = availability or {}
+        self.day_start = day_start
+        self.day_end = day_end
+        self.step = datetime.timedelta(minutes=step)
+        self.room_gap = datetime.timedelta(minutes=room_gap)
+        self.max_parallel_per_level = max_parallel_per_level
+
+    @classmethod
+    def from_database(cls, dates=None, rooms=None, availability=(), **options):
+        talks = Talk.objects.filter(status='accepted').select_related('room').order_by('start', 'id')
+        if dates:
+            talks = talks.filter(startdate__in=dates)
+        talks = list(talks)
+
+        room_queryset = Room.objects.order_by('name')
+        if rooms:
+            room_queryset = room_queryset.filter(id__in=rooms)
+        room_ids = list(room_queryset.values_list('id', flat=True))
+
+        windows = defaultdict(list)
+        for window in availability:
+            windows[window['speaker']].append((window['start'], window['end']))
+
+        problem = cls(talks, room_ids, availability=windows, **options)
+        if talks and room_ids:
+            days = {talk.startdate for talk in talks}
+            earliest, latest = problem.window(min(days))[0], problem.window(max(days))[1]
+            problem.fixed = list(
+                Talk.objects.filter(
+                    Q(room_id__in=room_ids) | Q(speaker_id__in={talk.speaker_id for talk in talks}),
+                    start__lt=latest + problem.room_gap, end__gt=earliest - problem.room_gap,
+                ).exclude(pk__in=[talk.pk for talk in talks]).only('id', 'start', 'end', 'room', 'speaker')
+            )
+        return problem
+
+    def window(self, day):
+        tz = timezone.get_current_timezone()
+        return (
+            timezone.make_aware(datetime.datetime.combine(day, self.day_start), tz),
+            timezone.make_aware(datetime.datetime.combine(day, self.day_end), tz),
+        )
+
+
+class ScheduleResult:
+    def __init__(self, problem, placements, unplaced, elapsed):
+        self.problem = problem
+        self.placements = placements
+        self.unplaced = unplaced
+        self.elapsed = elapsed
+
+    def changes(self):
+        """(talk, placement) des talks dont la salle ou le créneau change"""
+        return [
+            (talk, placement) for talk in self.problem.talks
+            for placement in [self.placements.get(talk.pk)]
+            if placement is not None and placement != (talk.room_id, talk.start, talk.end)
+        ]
+
+    def as_dict(self):
+        changes = self.changes()
+        displacement = sum(
+            (abs(placement.start - talk.start) for talk, placement in changes), datetime.timedelta()
+        )
+        return {
+            'talks': len(self.problem.talks),
+            'placed': len(self.placements),
+            'moved': len(changes),
+            'displacement_minutes': round(displacement.total_seconds() / 60),
+            'elapsed_ms': round(self.elapsed * 1000),
+            'unplaced': [
+                {'id': str(talk.pk), 'title': talk.title, 'speakerName': talk.speakerName}
+                for talk in self.unplaced
+            ],
+            'changes': [
+                {
+                    'id': str(talk.pk), 'title': talk.title,
+                    'room': placement.room, 'start': placement.start, 'end': placement.end,
+                    'previous_room': talk.room_id, 'previous_start': talk.start,
+                }
+                for talk, placement in changes
+            ],
+        }
+
+
+class Solver:
+    def __init__(self, problem):
+        self.problem = problem
+        self._candidates = {}
+        self.reset()
+
+    def reset(self):
+        # Occupation de toutes les salles dans un seul index : une requête par créneau
+        # donne les salles prises, les autres sont libres (éléments : (salle, talk))
+        self.occupancy, self.speakers, self.levels = IntervalIndex(), IntervalIndex(), IntervalIndex()
+        self.placements = {}
+        self._occupants = {}
+        for other in self.problem.fixed:
+            if other.room_id in self.problem.rooms:
+                self.occupancy.add(None, other.start, other.end, (other.room_id, other))
+            self.speakers.add(other.speaker_id, other.start, other.end, other)
+
+    def solve(self, time_limit=5):
+        started = time.perf_counter()
+        deadline = started + time_limit
+
+        # Créneaux les plus proches de l'heure demandée d'abord ; s'il reste des talks
+        # sans place, second essai en remplissant les salles dans l'ordre chronologique,
+        # qui laisse moins de trous inutilisables
+        best = None
+        for packed in (False, True):
+            self.reset()
+            unplaced = self.greedy(packed)
+            if best is None or len(unplaced) < len(best[1]):
+                best = (dict(self.placements), unplaced)
+            if not unplaced:
+                break
+
+        placements, unplaced = best
+        if placements != self.placements:
+            self.reset()
+            talks = {talk.pk: talk for talk in self.problem.talks}
+            for pk, placement in placements.items():
+                self.place(talks[pk], placement)
+        unplaced = [talk for talk in unplaced if not self.repair(talk, deadline)]
+        self.improve(deadline)
+        return ScheduleResult(self.problem, dict(self.placements), unplaced, time.perf_counter() - started)
+
+    def greedy(self, packed=False):
+        """Place les talks un par un, les plus contraints d'abord ; retourne ceux restés sans place"""
+        talks_per_speaker = Counter(talk.speaker_id for talk in self.problem.talks)
+        unplaced = []
+        for talk in sorted(self.problem.talks, key=lambda talk: (
+            len(self.candidates(talk)), talk.start - talk.end,
+            -talks_per_speaker[talk.speaker_id], talk.start, str(talk.pk),
+        )):
+            placement = self.find(talk, packed)
+            if placement is None:
+                unplaced.append(talk)
+            else:
+                self.place(talk, placement)
+        return unplaced
+
+    def candidates(self, talk):
+        """Créneaux (start, end) possibles du talk, du plus proche au plus éloigné de son début"""
+        if talk.pk not in self._candidates:
+            problem = self.problem
+            duration = talk.end - talk.start
+            window_start, window_end = problem.window(talk.startdate)
+            latest = window_end - duration
+            starts = set()
+            start = window_start
+            while start <= latest:
+                starts.add(start)
+                start += problem.step
+            # Un talk déjà bien placé peut rester à son heure, même hors du pas
+            if window_start <= talk.start <= latest:
+                starts.add(talk.start)
+
+            windows = problem.availability.get(talk.speaker_id)
+            self._candidates[talk.pk] = [
+                (start, start + duration)
+                for start in sorted(starts, key=lambda start: (abs(start - talk.start), start))
+                if windows is None or any(
+                    begin <= start and start + duration <= finish for begin, finish in windows
+                )
+            ]
+        return self._candidates[talk.pk]
+
+    def room_order(self, talk):
+        rooms = self.problem.rooms
+        if talk.room_id in rooms:
+            return [talk.room_id] + [room for room in rooms if room != talk.room_id]
+        return rooms
+
+    def room_users(self, start, end):
+        """(salle, talk) des salles occupées sur [start, end[, battement compris"""
+        gap = self.problem.room_gap
+        return self.occupancy.overlapping(None, start - gap, end + gap)
+
+    def level_allows(self, talk, start, end):
+        limit = self.problem.max_parallel_per_level
+        if limit is None:
+            return True
+        others = self.levels.overlapping(talk.level, start, end)
+        if len(others) < limit:
+            return True
+        # Nombre maximal de talks simultanés de ce niveau sur [start, end[
+        # Créneaux placés, pas les heures d'origine des talks
+        placed = [self.placements[other.pk] for other in others]
+        events = sorted(
+            [(max(other.start, start), 1) for other in placed]
+            + [(min(other.end, end), -1) for other in placed]
+        )
+        running = peak = 0
+        for _, delta in events:
+            running += delta
+            peak = max(peak, running)
+        return peak < limit
+
+    def find(self, talk, packed=False):
+        """
+        Meilleur placement possible : créneau le plus proche, salle actuelle d'abord
+        (packed : créneau le plus tôt).
+        """
+        rooms = self.room_order(talk)
+        candidates = self.candidates(talk)
+        if packed:
+            candidates = sorted(candidates)
+        for start, end in candidates:
+            if self.speakers.overlapping(talk.speaker_id, start, end):
+                continue
+            busy = {room for room, _ in self.room_users(start, end)}
+            if len(busy) >= len(rooms):
+                continue
+            if not self.level_allows(talk, start, end):
+                continue
+            for room in rooms:
+                if room not in busy:
+                    return Placement(room, start, end)
+        return None
+
+    def place(self, talk, placement):
+        self.placements[talk.pk] = placement
+        occupant = self._occupants[talk.pk] = (placement.room, talk)
+        self.occupancy.add(None, placement.start, placement.end, occupant)
+        self.speakers.add(talk.speaker_id, placement.start, placement.end, talk)
+        self.levels.add(talk.level, placement.start, placement.end, talk)
+
+    def unplace(self, talk):
+        placement = self.placements[talk.pk]
+        self.occupancy.remove(None, placement.start, self._occupants.pop(talk.pk))
+        self.speakers.remove(talk.speaker_id, placement.start, talk)
+        self.levels.remove(talk.level, placement.start, talk)
+        del self.placements[talk.pk]
+        return placement
+
+    def repair(self, talk, deadline):
+        """
+        Place un talk resté sans créneau en déplaçant l'unique talk qui le bloque
+        (salle ou conférencier), si celui-ci trouve une autre place.
+        """
+        for start, end in self.candidates(talk):
+            if time.perf_counter() > deadline:
+                return False
+            speaker_blockers = self.speakers.overlapping(talk.speaker_id, start, end)
+            if len(speaker_blockers) > 1:
+                continue
+            busy = defaultdict(list)
+            for room, other in self.room_users(start, end):
+                busy[room].append(other)
+            for room in self.room_order(talk):
+                blockers = {other.pk: other for other in busy[room] + speaker_blockers}
+                if len(blockers) != 1:
+                    continue
+                blocker = next(iter(blockers.values()))
+                if blocker.pk not in self.placements:
+                    continue  # talk fixe
+                previous = self.unplace(blocker)
+                if (not self.speakers.overlapping(talk.speaker_id, start, end)
+                        and all(room != used for used, _ in self.room_users(start, end))
+                        and self.level_allows(talk, start, end)):
+                    self.place(talk, Placement(room, start, end))
+                    moved = self.find(blocker)
+                    if moved is not None:
+                        self.place(blocker, moved)
+                        return True
+                    self.unplace(talk)
+                self.place(blocker, previous)
+        return False
+
+    def improve(self, deadline):
+        """Rapproche chaque talk de son heure demandée, tant que le programme s'améliore"""
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for talk in self.problem.talks:
+                if time.perf_counter() > deadline:
+                    return
+                current = self.placements.get(talk.pk)
+                if current is None or current == (talk.room_id, talk.start, talk.end):
+                    continue
+                self.unplace(talk)
+                # Le placement actuel reste possible : find ne renvoie jamais pire
+                placement = self.find(talk)
+                self.place(talk, placement)
+                if placement != current:
+                    improved = True
+
+
+def solve_schedule(problem, time_limit=5):
+    return Solver(problem).solve(time_limit)
+
+
+def apply_schedule(result):
+    """
+    Enregistre les changements du calcul en une transaction. Les salles des talks
+    déplacés sont d'abord vidées : deux talks peuvent échanger leur créneau sans heurter
+    la contrainte unique_room_time_slot pendant le bulk_update.
+    """
+    changes = result.changes()
+    if not changes:
+        return []
+
+    rooms = Room.objects.in_bulk({placement.room for _, placement in changes})
+    talks, days = [], set()
+    now = timezone.now()
+    for talk, placement in changes:
+        days.add(talk.startdate)
+        talk.room = rooms[placement.room]
+        talk.start, talk.end = placement.start, placement.end
+        talk.startdate = timezone.localdate(placement.start)
+        talk.updated_at = now
+        # Salle déjà chargée : copie du nom sans requête
+        talk.refresh_snapshots()
+        days.add(talk.startdate)
+        talks.append(talk)
+
+    with transaction.atomic():
+        # Le programme a pu changer depuis le calcul
+        conflicts = find_batch_conflicts(talks)
+        if conflicts:
+            raise ScheduleConflict([describe_conflict(conflict) for conflict in conflicts])
+
+        Talk.objects.filter(pk__in=[talk.pk for talk in talks]).update(room=None)
+        Talk.objects.bulk_update(
+            talks, ['room', 'room_name', 'start', 'end', 'startdate', 'updated_at'], batch_size=500
+        )
+        # bulk_update n'émet pas post_save : invalidation explicite du cache et des grilles
+        invalidate_schedule()
+        invalidate_day_grids(days)
+        talks_saved_in_bulk.send(sender=Talk, talks=talks, created=False, previous=None)
+    return talks
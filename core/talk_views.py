@@ -2,28 +2,71 @@ from rest_framework import generics, filters
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny, SAFE_METHODS
 
 from .models import User, Room, Talk
-from .serializers import UserSerializer, RoomSerializer, TalkSerializer
+from .serializers import UserSerializer, RoomSerializer, TalkSerializer, TalkCompactSerializer
 from .permissions import IsOrganizer, IsSpeaker, IsOrganizerOrReadOnly, IsSpeakerOrReadOnly
+from .querysets import OptimizedQuerysetMixin, filter_talks, optimize_queryset
+from .cache import CachedResponseMixin, cache_stats
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin, make_etag
+from .fast_serializers import FastListMixin
+from .pagination import RoomCursorPagination, TalkCursorPagination
+from .bulk_import import import_talks
+from .review import ReviewRequestSerializer, review_talks, summarize_review
+from .solver import ScheduleConflict, ScheduleProblem, ScheduleRequestSerializer, apply_schedule, solve_schedule
+from .parsers import CSVParser
+from .export import EXPORT_FORMATS, export_lines, export_rows
+from .day_grid import get_day_grid
+from .availability import AvailabilityRequestSerializer, room_availability
+from .search import TalkSearchFilter
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import NotFound
+from rest_framework.parsers import JSONParser
 import datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.views import APIView
 
+class AtomicWriteMixin:
+    """
+    Écritures (POST, PUT, PATCH, DELETE) en une transaction : l'objet, les copies mises à
+    jour par les signaux (core.signals) et l'outbox des webhooks sont validés ensemble.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
+
+class CompactFieldsMixin:
+    """
+    Listes de talks : ?fields=compact renvoie TalkCompactSerializer, servi par un
+    parcours de la table des talks sans jointure.
+    """
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.request.query_params.get('fields') == 'compact':
+            return TalkCompactSerializer
+        return super().get_serializer_class()
+
 # VUES CRUD POUR LES SALLES (ROOMS)
 
 # Vue pour lister et créer des salles
-class RoomListCreateView(generics.ListCreateAPIView):
+class RoomListCreateView(AtomicWriteMixin, ConditionalListMixin, CachedResponseMixin, FastListMixin, generics.ListCreateAPIView):
     queryset = Room.objects.all()
     serializer_class = RoomSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
     ordering_fields = ['name']
+    pagination_class = RoomCursorPagination
     permission_classes = [IsOrganizerOrReadOnly ,IsAuthenticated]
 
 # Vue pour récupérer, mettre à jour ou supprimer une salle spécifique
-class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RoomDetailView(AtomicWriteMixin, ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Room.objects.all()
     serializer_class = RoomSerializer
     permission_classes = [IsOrganizerOrReadOnly,IsAuthenticated]
@@ -34,39 +77,19 @@ class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
 # VUES CRUD POUR LES TALKS
 
 # Vue pour lister et créer des talks
-class TalkListCreateView(generics.ListCreateAPIView):
+class TalkListCreateView(AtomicWriteMixin, ConditionalListMixin, CachedResponseMixin, FastListMixin, CompactFieldsMixin, OptimizedQuerysetMixin, generics.ListCreateAPIView):
     queryset = Talk.objects.all()
     serializer_class = TalkSerializer
     permission_classes = [IsOrganizerOrReadOnly,IsAuthenticated ]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend]
+    # Plein texte classé sur PostgreSQL, ILIKE sur search_fields ailleurs
+    filter_backends = [TalkSearchFilter, filters.OrderingFilter, DjangoFilterBackend]
     search_fields = ['title', 'description', 'speakerName', 'level']
     ordering_fields = ['start', 'end', 'created_at', 'level', 'status']
+    pagination_class = TalkCursorPagination
     
     def get_queryset(self):
-        queryset = Talk.objects.all()
-        
         # Filtres par paramètres de requête
-        room_id = self.request.query_params.get('room')
-        speaker_id = self.request.query_params.get('speaker')
-        organizer_id = self.request.query_params.get('organizer')
-        status = self.request.query_params.get('status')
-        level = self.request.query_params.get('level')
-        start_date = self.request.query_params.get('start_date')
-        
-        if room_id:
-            queryset = queryset.filter(room_id=room_id)
-        if speaker_id:
-            queryset = queryset.filter(speaker_id=speaker_id)
-        if organizer_id:
-            queryset = queryset.filter(organizer_id=organizer_id)
-        if status:
-            queryset = queryset.filter(status=status)
-        if level:
-            queryset = queryset.filter(level=level)
-        if start_date:
-            queryset = queryset.filter(startdate=start_date)
-            
-        return queryset
+        return filter_talks(Talk.objects.all(), self.request.query_params)
     
     def perform_create(self, serializer):
         speaker_id = self.request.data.get('speaker')
@@ -86,12 +109,12 @@ class TalkListCreateView(generics.ListCreateAPIView):
         else:
             serializer.save(speaker=speaker, room=room)
 
-class UpdateTalkView(APIView):
+class UpdateTalkView(AtomicWriteMixin, APIView):
     permission_classes = [IsSpeakerOrReadOnly, IsAuthenticated]
 
     def put(self, request, pk):
         # Récupérer le talk à mettre à jour
-        talk = get_object_or_404(Talk, id=pk)
+        talk = get_object_or_404(optimize_queryset(Talk.objects.all(), TalkSerializer), id=pk)
 
         # Vérifier les données envoyées
         speaker_id = request.data.get('speaker')
@@ -112,14 +135,100 @@ class UpdateTalkView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+# Vue pour importer un programme complet en une requête (JSON ou CSV)
+class TalkBulkImportView(APIView):
+    permission_classes = [IsOrganizer]
+    parser_classes = [JSONParser, CSVParser]
+
+    def post(self, request):
+        rows = request.data
+        if isinstance(rows, dict):
+            rows = rows.get('talks', [])
+        if not isinstance(rows, list):
+            return Response({'detail': 'Une liste de talks est attendue.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        partial = request.query_params.get('partial') in ('1', 'true')
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        result = import_talks(rows, organizer=request.user, partial=partial, dry_run=dry_run)
+
+        if result.errors and (not partial or result.aborted):
+            return Response(result.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+        if dry_run:
+            return Response(result.as_dict(), status=status.HTTP_200_OK)
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)
+
+# Vue pour changer le statut de nombreux talks en une requête (relecture)
+class TalkReviewView(APIView):
+    permission_classes = [IsSpeakerOrReadOnly, IsAuthenticated]
+
+    def post(self, request):
+        params = ReviewRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        results = review_talks(request.user, params.validated_data)
+        return Response(summarize_review(results), status=status.HTTP_200_OK)
+
+# Vue pour placer automatiquement les talks acceptés (salle et heure), sans conflit
+class TalkScheduleView(APIView):
+    permission_classes = [IsOrganizer]
+
+    def post(self, request):
+        params = ScheduleRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        options = dict(params.validated_data)
+        time_limit = options.pop('time_limit')
+
+        result = solve_schedule(ScheduleProblem.from_database(**options), time_limit)
+        data = result.as_dict()
+        # Tout ou rien : un programme incomplet n'est pas appliqué
+        if result.unplaced:
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        if not dry_run:
+            try:
+                apply_schedule(result)
+            except ScheduleConflict as exc:
+                return Response(
+                    {'detail': "Le programme a changé pendant le calcul.", 'conflicts': exc.messages},
+                    status=status.HTTP_409_CONFLICT,
+                )
+        data['applied'] = not dry_run
+        return Response(data, status=status.HTTP_200_OK)
+
+# Vue pour exporter tout le programme en flux (NDJSON ou CSV), sans le charger en mémoire
+class TalkExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, fmt):
+        if fmt not in EXPORT_FORMATS:
+            raise NotFound('Format inconnu : ndjson ou csv.')
+        content_type, extension = EXPORT_FORMATS[fmt]
+
+        # Mêmes filtres que la liste des talks (?room=, ?start_date=, ...)
+        rows = export_rows(filter_talks(Talk.objects.all(), request.query_params))
+        response = StreamingHttpResponse(export_lines(fmt, rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="programme.{extension}"'
+        return response
+
+# Vue pour connaître les créneaux libres et l'occupation de toutes les salles (core.availability)
+class RoomAvailabilityView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = AvailabilityRequestSerializer(data={
+            **request.query_params.dict(), 'room': request.query_params.getlist('room'),
+        })
+        params.is_valid(raise_exception=True)
+        return Response(room_availability(params.validated_data), status=status.HTTP_200_OK)
+
 # Vue pour récupérer, mettre à jour ou supprimer un talk spécifique
-class TalkDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TalkDetailView(AtomicWriteMixin, ConditionalRetrieveMixin, OptimizedQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Talk.objects.all()
     serializer_class = TalkSerializer
     permission_classes = [IsSpeakerOrReadOnly, IsAuthenticated]
     
     def get_object(self):
-        return get_object_or_404(Talk, id=self.kwargs['pk'])
+        return get_object_or_404(self.filter_queryset(self.get_queryset()), id=self.kwargs['pk'])
     
     def perform_update(self, serializer):
         speaker_id = self.request.data.get('speaker')
@@ -136,33 +245,69 @@ class TalkDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer.save(speaker=speaker, room=room)
 
 # Vue pour récupérer les talks par conférencier
-class TalksBySpeakerView(generics.ListAPIView):
+class TalksBySpeakerView(ConditionalListMixin, CachedResponseMixin, FastListMixin, CompactFieldsMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     serializer_class = TalkSerializer
+    pagination_class = TalkCursorPagination
     
     def get_queryset(self):
         speaker_id = self.kwargs['speaker_id']
         return Talk.objects.filter(speaker_id=speaker_id)
 
 # Vue pour récupérer les talks par organisateur
-class TalksByOrganizerView(generics.ListAPIView):
+class TalksByOrganizerView(ConditionalListMixin, CachedResponseMixin, FastListMixin, CompactFieldsMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     serializer_class = TalkSerializer
+    pagination_class = TalkCursorPagination
     
     def get_queryset(self):
         organizer_id = self.kwargs['organizer_id']
         return Talk.objects.filter(organizer_id=organizer_id)
 
 # Vue pour récupérer les talks par jour
-class TalksByDateView(generics.ListAPIView):
+class TalksByDateView(ConditionalListMixin, CachedResponseMixin, FastListMixin, CompactFieldsMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     serializer_class = TalkSerializer
+    pagination_class = TalkCursorPagination
     
     def get_queryset(self):
         date_str = self.kwargs['date']
         return Talk.objects.filter(startdate=date_str)
 
+# Vue pour récupérer la grille salle × créneau d'un jour, précalculée (core.day_grid)
+class TalkDayGridView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, date):
+        try:
+            day = parse_date(date)
+        except ValueError:
+            day = None
+        if day is None:
+            raise NotFound('Date invalide (AAAA-MM-JJ).')
+
+        grid = get_day_grid(day)
+        # La version d'un jour ne fait qu'augmenter : elle suffit à identifier sa grille
+        etag = make_etag('grid', day, grid.version)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = Response(grid.data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        return response
+
 # Vue pour récupérer les talks par salle
-class TalksByRoomView(generics.ListAPIView):
+class TalksByRoomView(ConditionalListMixin, CachedResponseMixin, FastListMixin, CompactFieldsMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     serializer_class = TalkSerializer
+    pagination_class = TalkCursorPagination
     
     def get_queryset(self):
         room_id = self.kwargs['room_id']
         return Talk.objects.filter(room_id=room_id)
+
+
+# Vue pour consulter les compteurs hit/miss du cache des réponses (processus courant)
+class CacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats(), status=status.HTTP_200_OK)
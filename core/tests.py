@@ -1,3 +1,1677 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import asyncio
+import json
+import time
+from collections import Counter
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .benchmark import SCENARIOS, BenchmarkData, compare, run_benchmark, summarize
+from .cache import cache_stats, reset_cache_stats
+from .live import Subscription, broadcaster
+from .metrics import registry
+from .models import Room, Talk, User
+
+
+class ScheduleTestMixin:
+    """
+    Outils communs pour créer un jeu de données de planning dans les tests.
+    """
+
+    day = datetime.date(2025, 6, 12)
+
+    def setUp(self):
+        # Le cache local survit d'un test à l'autre
+        cache.clear()
+        reset_cache_stats()
+
+    def create_user(self, username, role='speaker'):
+        return User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='pass', role=role
+        )
+
+    def create_talks(self, count, speakers, rooms, organizer=None, day=None):
+        day = day or self.day
+        talks = []
+        for index in range(count):
+            start = timezone.make_aware(
+                datetime.datetime.combine(day, datetime.time(8)) + datetime.timedelta(hours=index)
+            )
+            talks.append(Talk.objects.create(
+                title=f'Talk {index}',
+                description='Description',
+                start=start,
+                end=start + datetime.timedelta(minutes=45),
+                startdate=start.date(),
+                level='beginner',
+                speaker=speakers[index % len(speakers)],
+                organizer=organizer,
+                room=rooms[index % len(rooms)],
+            ))
+        return talks
+
+
+class QueryCountTests(ScheduleTestMixin, TestCase):
+    """
+    Le nombre de requêtes d'un endpoint de liste ne doit pas dépendre du nombre de talks.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.organizer = self.create_user('orga', role='organizer')
+        self.client.force_authenticate(self.organizer)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url_factory):
+        speakers = [self.create_user('alice'), self.create_user('bob')]
+        rooms = [Room.objects.create(name='Amphi A'), Room.objects.create(name='Amphi B')]
+
+        Talk.objects.all().delete()
+        self.create_talks(1, speakers=speakers, rooms=rooms, organizer=self.organizer)
+        small = self.count_queries(url_factory(speakers[0], rooms[0]))
+
+        Talk.objects.all().delete()
+        self.create_talks(12, speakers=speakers, rooms=rooms, organizer=self.organizer)
+        large = self.count_queries(url_factory(speakers[0], rooms[0]))
+
+        self.assertEqual(small, large)
+
+    def test_talk_list(self):
+        self.assertConstantQueries(lambda speaker, room: '/talks/')
+
+    def test_talks_by_speaker(self):
+        self.assertConstantQueries(lambda speaker, room: f'/talks/speaker/{speaker.id}/')
+
+    def test_talks_by_organizer(self):
+        self.assertConstantQueries(lambda speaker, room: f'/talks/organizer/{self.organizer.id}/')
+
+    def test_talks_by_date(self):
+        self.assertConstantQueries(lambda speaker, room: f'/talks/date/{self.day}/')
+
+    def test_talks_by_room(self):
+        self.assertConstantQueries(lambda speaker, room: f'/talks/room/{room.id}/')
+
+    def test_nested_objects_are_serialized(self):
+        speaker = self.create_user('carol')
+        room = Room.objects.create(name='Amphi C')
+        self.create_talks(1, speakers=[speaker], rooms=[room], organizer=self.organizer)
+
+        talk = self.client.get('/talks/').json()['results'][0]
+
+        self.assertEqual(talk['speaker']['username'], 'carol')
+        self.assertEqual(talk['room']['name'], 'Amphi C')
+        self.assertEqual(talk['organizer']['email'], 'orga@example.com')
+
+
+class KeysetPaginationTests(ScheduleTestMixin, TestCase):
+    """
+    Pagination par curseur (start, id) des talks et (name, id) des salles.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.create_user('orga', role='organizer'))
+        self.speakers = [self.create_user('alice'), self.create_user('bob')]
+        self.rooms = [Room.objects.create(name='Amphi A'), Room.objects.create(name='Amphi B')]
+        self.talks = self.create_talks(12, speakers=self.speakers, rooms=self.rooms)
+
+    def walk(self, url):
+        pages, ids = [], []
+        while url:
+            page = self.client.get(url).json()
+            pages.append(page)
+            ids.extend(item['id'] for item in page['results'])
+            url = page['next']
+        return pages, ids
+
+    def test_pages_cover_every_talk_once_in_start_order(self):
+        pages, ids = self.walk('/talks/?page_size=5')
+
+        self.assertEqual([len(page['results']) for page in pages], [5, 5, 2])
+        self.assertEqual(ids, [str(talk.id) for talk in self.talks])
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_ties_on_start_are_broken_by_id(self):
+        Talk.objects.update(start=self.talks[0].start)
+
+        _, ids = self.walk('/talks/?page_size=5')
+
+        self.assertEqual(ids, sorted(str(talk.id) for talk in self.talks))
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get('/talks/?page_size=5').json()
+        second = self.client.get(first['next']).json()
+
+        previous = self.client.get(second['previous']).json()
+
+        self.assertEqual(previous['results'], first['results'])
+
+    def test_ordering_and_filters_are_kept(self):
+        _, ids = self.walk(f'/talks/?page_size=4&ordering=-start&room={self.rooms[0].id}')
+
+        expected = [talk for talk in reversed(self.talks) if talk.room_id == self.rooms[0].id]
+        self.assertEqual(ids, [str(talk.id) for talk in expected])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/talks/?cursor=garbage')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_rooms_are_paginated_by_name(self):
+        Room.objects.create(name='Amphi 0')
+
+        _, ids = self.walk('/rooms/?page_size=2')
+
+        names = list(Room.objects.order_by('name').values_list('id', flat=True))
+        self.assertEqual(ids, names)
+
+
+class ConflictDetectionTests(ScheduleTestMixin, TestCase):
+    """
+    Détection des chevauchements de salle et de conférencier.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.create_user('alice')
+        self.bob = self.create_user('bob')
+        self.room = Room.objects.create(name='Amphi A')
+        self.other_room = Room.objects.create(name='Amphi B')
+        self.talk = self.create_talks(1, speakers=[self.alice], rooms=[self.room])[0]
+
+    def candidate(self, speaker, room, offset=15, **kwargs):
+        start = self.talk.start + datetime.timedelta(minutes=offset)
+        return Talk(
+            title='Nouveau', description='', start=start,
+            end=start + datetime.timedelta(minutes=45), startdate=start.date(),
+            level='beginner', speaker=speaker, room=room, **kwargs
+        )
+
+    def test_clean_reports_room_and_speaker_conflicts_together(self):
+        from django.core.exceptions import ValidationError
+
+        with self.assertRaises(ValidationError) as context:
+            self.candidate(self.alice, self.room).clean()
+
+        self.assertEqual(len(context.exception.messages), 2)
+
+    def test_partial_room_overlap_is_detected(self):
+        from .scheduling import find_conflicts
+
+        conflicts = find_conflicts(self.candidate(self.bob, self.room))
+
+        self.assertEqual([(c.kind, c.other) for c in conflicts], [('room', self.talk)])
+
+    def test_adjacent_slots_do_not_conflict(self):
+        from .scheduling import find_conflicts
+
+        self.assertEqual(find_conflicts(self.candidate(self.alice, self.room, offset=45)), [])
+
+    def test_batch_conflicts_use_one_query(self):
+        from .scheduling import find_batch_conflicts
+
+        batch = [
+            self.candidate(self.bob, self.other_room, offset=60),
+            self.candidate(self.bob, self.other_room, offset=90),
+            self.candidate(self.alice, self.other_room, offset=200),
+        ]
+        with self.assertNumQueries(1):
+            conflicts = find_batch_conflicts(batch)
+
+        kinds = sorted((c.kind, c.talk.start, c.other.start) for c in conflicts)
+        self.assertEqual(kinds, [
+            ('room', batch[1].start, batch[0].start),
+            ('speaker', batch[1].start, batch[0].start),
+        ])
+
+    def test_api_rejects_overlapping_room_booking(self):
+        client = APIClient()
+        client.force_authenticate(self.create_user('orga', role='organizer'))
+        candidate = self.candidate(self.bob, self.room)
+
+        response = client.post('/talks/', {
+            'title': 'Nouveau', 'description': 'x', 'start': candidate.start.isoformat(),
+            'end': candidate.end.isoformat(), 'startdate': str(candidate.startdate),
+            'level': 'beginner', 'speaker': str(self.bob.id), 'room': self.room.id,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('« Talk 0 »', str(response.data))
+
+
+class BulkImportTests(ScheduleTestMixin, TestCase):
+    """
+    Import d'un programme complet par /talks/import/.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.create_user('orga', role='organizer'))
+        self.speakers = [self.create_user(f'speaker{i}') for i in range(10)]
+        self.rooms = [Room.objects.create(name=f'Salle {i}') for i in range(10)]
+
+    def row(self, index, **overrides):
+        start = datetime.datetime(2025, 6, 12, 8, tzinfo=datetime.timezone.utc)
+        start += datetime.timedelta(hours=index // 10)
+        row = {
+            'title': f'Talk {index}', 'description': 'x', 'level': 'beginner',
+            'start': start.isoformat(),
+            'end': (start + datetime.timedelta(minutes=45)).isoformat(),
+            'speaker': str(self.speakers[index % 10].id), 'room': self.rooms[index % 10].id,
+        }
+        row.update(overrides)
+        return row
+
+    def test_large_import_uses_a_constant_number_of_queries(self):
+        rows = [self.row(i) for i in range(200)]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/talks/import/', rows, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 200)
+        self.assertEqual(Talk.objects.count(), 200)
+        self.assertLess(len(context.captured_queries), 15)
+        self.assertEqual(Talk.objects.filter(speakerName='speaker0').count(), 20)
+
+    def test_errors_are_reported_per_row_and_nothing_is_inserted(self):
+        rows = [
+            self.row(0),
+            self.row(1, level='expert'),
+            self.row(2, speaker=str(self.create_user('public', role='public').id)),
+            self.row(3, room=self.rooms[0].id, speaker=str(self.speakers[0].id)),
+        ]
+
+        response = self.client.post('/talks/import/', rows, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3, 4])
+        self.assertIn('(ligne 1)', ' '.join(response.data['errors'][2]['errors']))
+        self.assertEqual(Talk.objects.count(), 0)
+
+    def test_partial_import_keeps_valid_rows(self):
+        rows = [self.row(0), self.row(1, level='expert')]
+
+        response = self.client.post('/talks/import/?partial=1', rows, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+
+    def test_integrity_error_is_reported_as_a_failed_import(self):
+        from unittest import mock
+
+        # Créneau pris par une écriture concurrente après la vérification des chevauchements
+        taken = self.row(0)
+        Talk.objects.create(
+            title='Déjà là', description='x', level='beginner',
+            start=datetime.datetime.fromisoformat(taken['start']),
+            end=datetime.datetime.fromisoformat(taken['end']),
+            startdate=self.day, speaker=self.speakers[1], room=self.rooms[0],
+        )
+
+        with mock.patch('core.bulk_import.find_batch_conflicts', return_value=[]):
+            response = self.client.post('/talks/import/?partial=1', [self.row(1), taken], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual(response.data['errors'][0]['row'], 0)
+        self.assertEqual(Talk.objects.count(), 1)
+
+    def test_csv_import(self):
+        rows = [self.row(i) for i in range(3)]
+        header = list(rows[0])
+        lines = [','.join(header)] + [','.join(str(row[key]) for key in header) for row in rows]
+
+        response = self.client.post(
+            '/talks/import/', '\n'.join(lines), content_type='text/csv'
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Talk.objects.count(), 3)
+
+    def test_speakers_cannot_import(self):
+        self.client.force_authenticate(self.speakers[0])
+
+        response = self.client.post('/talks/import/', [self.row(0)], format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ResponseCacheTests(ScheduleTestMixin, TestCase):
+    """
+    Cache des réponses de liste invalidé par le compteur de génération.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.create_user('orga', role='organizer'))
+        self.speaker = self.create_user('alice')
+        self.room = Room.objects.create(name='Amphi A')
+        self.talks = self.create_talks(3, speakers=[self.speaker], rooms=[self.room])
+
+    def test_second_read_is_served_from_cache(self):
+        url = f'/talks/date/{self.day}/'
+        first = self.client.get(url).json()
+
+        # L'ETag vient de la génération : aucune requête
+        with self.assertNumQueries(0):
+            second = self.client.get(url).json()
+
+        self.assertEqual(first, second)
+        self.assertEqual(cache_stats()['TalksByDateView'], {'hits': 1, 'misses': 1})
+
+    def test_talk_write_invalidates_cached_pages(self):
+        url = f'/talks/room/{self.room.id}/'
+        self.client.get(url)
+
+        self.talks[0].title = 'Nouveau titre'
+        self.talks[0].save()
+
+        titles = [talk['title'] for talk in self.client.get(url).json()['results']]
+        self.assertIn('Nouveau titre', titles)
+
+    def test_room_rename_invalidates_talk_pages(self):
+        self.client.get('/talks/')
+
+        self.room.name = 'Amphi Z'
+        self.room.save()
+
+        rooms = {talk['room']['name'] for talk in self.client.get('/talks/').json()['results']}
+        self.assertEqual(rooms, {'Amphi Z'})
+
+    def test_last_login_update_keeps_cache(self):
+        from .cache import get_generation
+
+        generation = get_generation()
+        self.speaker.last_login = timezone.now()
+        self.speaker.save(update_fields=['last_login'])
+
+        self.assertEqual(get_generation(), generation)
+
+    @override_settings(SCHEDULE_CACHE_TIMEOUT=60)
+    def test_local_generation_expires_after_cache_timeout(self):
+        import time
+        from unittest import mock
+
+        from .cache import bump_generation, get_generation
+
+        generation = get_generation()
+        bump_generation()
+        # Sans cache partagé, un worker qui n'a pas vu d'écriture change de génération
+        # au plus tard SCHEDULE_CACHE_TIMEOUT après
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertGreater(get_generation(), generation + 1)
+
+    @override_settings(SCHEDULE_GENERATION_STORE='database')
+    def test_database_generation_is_shared_by_workers(self):
+        from unittest import mock
+
+        from django.core.cache.backends.locmem import LocMemCache
+
+        first = self.client.get('/talks/')
+
+        # Écriture traitée par un autre worker : son cache en mémoire n'est pas celui-ci
+        with mock.patch('core.cache.cache', LocMemCache('other-worker', {})):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.talks[0].title = 'Modifié'
+                self.talks[0].save()
+
+        second = self.client.get('/talks/')
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertIn('Modifié', [talk['title'] for talk in second.json()['results']])
+
+
+class ConditionalGetTests(ScheduleTestMixin, TestCase):
+    """
+    ETag / Last-Modified sur les listes et les détails.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.create_user('orga', role='organizer'))
+        self.speaker = self.create_user('alice')
+        self.room = Room.objects.create(name='Amphi A')
+        self.talks = self.create_talks(3, speakers=[self.speaker], rooms=[self.room])
+
+    def test_list_returns_304_without_loading_rows(self):
+        etag = self.client.get('/talks/')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/talks/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        etags = {self.client.get('/talks/')['ETag']}
+
+        self.talks[0].title = 'Modifié'
+        self.talks[0].save()
+        etags.add(self.client.get('/talks/')['ETag'])
+
+        self.talks[1].delete()
+        etags.add(self.client.get('/talks/')['ETag'])
+
+        self.assertEqual(len(etags), 3)
+
+    def test_list_etag_varies_with_accept(self):
+        json_response = self.client.get('/talks/', HTTP_ACCEPT='application/json')
+        html_response = self.client.get('/talks/', HTTP_ACCEPT='text/html')
+
+        self.assertNotEqual(json_response['ETag'], html_response['ETag'])
+        self.assertIn('Accept', json_response['Vary'])
+        not_modified = self.client.get(
+            '/talks/', HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=json_response['ETag'],
+        )
+        self.assertEqual(not_modified.status_code, 200)
+
+    def test_room_rename_changes_talk_etags(self):
+        url = f'/talks/{self.talks[0].id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.room.name = 'Amphi Z'
+        self.room.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['room']['name'], 'Amphi Z')
+
+    def test_detail_supports_etag(self):
+        url = f'/talks/{self.talks[0].id}/'
+        first = self.client.get(url)
+
+        by_etag = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        # Last-Modified ne suit pas les lignes liées : il ne suffit pas pour un 304
+        by_date = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        self.assertEqual(by_etag.status_code, 304)
+        self.assertEqual(by_date.status_code, 200)
+
+    def test_speaker_role_change_changes_talk_etag(self):
+        url = f'/talks/{self.talks[0].id}/'
+        etag = self.client.get(url)['ETag']
+
+        # Ni le nom ni l'email : la copie dans le talk ne change pas, updated_at non plus
+        self.speaker.role = 'organizer'
+        self.speaker.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['speaker']['role'], 'organizer')
+
+    def test_detail_etag_varies_with_accept(self):
+        url = f'/talks/{self.talks[0].id}/'
+        json_response = self.client.get(url, HTTP_ACCEPT='application/json')
+        html_response = self.client.get(url, HTTP_ACCEPT='text/html')
+
+        self.assertNotEqual(json_response['ETag'], html_response['ETag'])
+        self.assertIn('Accept', json_response['Vary'])
+        not_modified = self.client.get(url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=json_response['ETag'])
+        self.assertEqual(not_modified.status_code, 200)
+
+    def test_unknown_detail_is_still_404(self):
+        import uuid
+
+        response = self.client.get(f'/talks/{uuid.uuid4()}/')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class CachedAuthenticationTests(ScheduleTestMixin, TestCase):
+    """
+    Cache des utilisateurs authentifiés par JWT et mode sans état.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from .authentication import user_cache
+
+        user_cache.clear()
+        self.user = self.create_user('orga', role='organizer')
+        self.token = AccessToken.for_user(self.user)
+        self.token['role'] = self.user.role
+        self.client = APIClient()
+        self.client.cookies['access_token'] = str(self.token)
+
+    def test_user_is_loaded_once_per_token(self):
+        with self.assertNumQueries(1):
+            self.client.get('/hello/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/hello/')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_authorization_header_is_accepted(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        self.assertEqual(client.get('/cache/stats/').status_code, 403)
+
+    def test_deactivation_evicts_cached_user(self):
+        self.client.get('/hello/')
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get('/hello/').status_code, 401)
+
+    def test_stateless_mode_skips_user_lookup_on_reads(self):
+        with self.settings(AUTH_USER_CACHE={'TTL': 30, 'MAX_SIZE': 10, 'STATELESS': True}):
+            with self.assertNumQueries(0):
+                self.client.get('/hello/')
+
+            # Les écritures chargent toujours le vrai utilisateur (clé étrangère organizer)
+            response = self.client.post('/rooms/', {'name': 'Amphi A'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+
+
+class TokenBlacklistFilterTests(ScheduleTestMixin, TestCase):
+    """
+    Filtre de Bloom devant les tables de liste noire.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from .token_blacklist import FilteredRefreshToken, blacklist_index
+
+        blacklist_index.reset()
+        self.index = blacklist_index
+        self.user = self.create_user('alice')
+        self.refresh = FilteredRefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.cookies['refresh_token'] = str(self.refresh)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        from .token_blacklist import BloomFilter
+
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_refresh_skips_blacklist_table_for_unknown_tokens(self):
+        self.client.post('/refresh/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/refresh/')
+
+        self.assertEqual(response.status_code, 200)
+        tables = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('token_blacklist_blacklistedtoken', tables)
+
+    def test_logout_blacklists_token_for_refresh(self):
+        self.client.post('/refresh/')
+        self.client.post('/logout/')
+        self.client.cookies['refresh_token'] = str(self.refresh)
+
+        response = self.client.post('/refresh/')
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_tokens_blacklisted_elsewhere_are_picked_up_by_sync(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        self.client.post('/refresh/')
+        # Mise en liste noire par un autre processus : seule la base est modifiée
+        RefreshToken(str(self.refresh)).blacklist()
+        self.index.sync(force=True)
+
+        self.assertEqual(self.client.post('/refresh/').status_code, 401)
+
+    def test_late_committed_blacklist_entry_is_picked_up_by_sync(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken,
+            OutstandingToken,
+        )
+
+        expires = timezone.now() + timedelta(days=1)
+        outstanding = OutstandingToken.objects.bulk_create(
+            OutstandingToken(user=self.user, jti=f'other-{i}', token='x', expires_at=expires)
+            for i in range(300)
+        )
+        BlacklistedToken.objects.bulk_create(
+            BlacklistedToken(id=1000 + i, token=token) for i, token in enumerate(outstanding)
+        )
+        self.index.sync(force=True)
+        # Transaction ouverte avant les 300 lignes ci-dessus, validée après la synchronisation :
+        # id bas, blacklisted_at antérieur à la dernière synchronisation
+        token = OutstandingToken.objects.get(jti=self.refresh['jti'])
+        entry = BlacklistedToken.objects.create(id=10, token=token)
+        BlacklistedToken.objects.filter(pk=entry.pk).update(
+            blacklisted_at=timezone.now() - timedelta(seconds=60)
+        )
+        self.index.sync(force=True)
+
+        self.assertTrue(self.index.might_contain(self.refresh['jti']))
+        self.assertEqual(self.client.post('/refresh/').status_code, 401)
+
+    @override_settings(TOKEN_BLACKLIST_FILTER={**settings.TOKEN_BLACKLIST_FILTER,
+                                               'REBUILD_INTERVAL': 0})
+    def test_sync_rebuilds_filter_after_rebuild_interval(self):
+        self.index.sync(force=True)
+        bloom = self.index._bloom
+
+        self.index.sync(force=True)
+
+        self.assertIsNot(self.index._bloom, bloom)
+
+
+class AsyncReadViewTests(ScheduleTestMixin, TestCase):
+    """
+    Les vues asynchrones renvoient le même JSON que les vues DRF.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        speakers = [self.create_user(f'speaker{i}') for i in range(3)]
+        rooms = [Room.objects.create(name=f'Salle {i}') for i in range(3)]
+        self.organizer = self.create_user('orga', role='organizer')
+        self.talks = self.create_talks(12, speakers, rooms, organizer=self.organizer)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+        self.token = str(AccessToken.for_user(self.organizer))
+        self.async_client.cookies['access_token'] = self.token
+
+    async def test_talk_pages_match_sync_view(self):
+        response = await self.async_client.get('/async/talks/?page_size=5&status=pending')
+
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.client.get)('/talks/?page_size=5&status=pending')
+        self.assertEqual(response.json()['results'], expected.json()['results'])
+
+        following = await self.async_client.get(response.json()['next'])
+        ids = [talk['id'] for talk in following.json()['results']]
+        self.assertEqual(ids, [str(talk.id) for talk in self.talks[5:10]])
+
+    async def test_detail_views(self):
+        talk = self.talks[0]
+        response = await self.async_client.get(f'/async/talks/{talk.id}/')
+        self.assertEqual(response.json()['room']['name'], talk.room.name)
+
+        response = await self.async_client.get(f'/async/rooms/{talk.room_id + 100}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_token_is_required(self):
+        response = self.client_class().get('/async/rooms/')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+    def test_list_uses_constant_queries_and_response_cache(self):
+        self.client.cookies['access_token'] = self.token
+        with self.assertNumQueries(2):  # Utilisateur + page
+            response = self.client.get(f'/async/talks/date/{self.day}/')
+
+        self.assertEqual(len(response.json()['results']), 12)
+        # Seconde lecture : utilisateur en cache, page servie par le cache des réponses
+        with self.assertNumQueries(0):
+            self.client.get(f'/async/talks/date/{self.day}/')
+
+    def test_inactive_user_is_rejected(self):
+        User.objects.filter(pk=self.organizer.pk).update(is_active=False)
+        self.client.cookies['access_token'] = self.token
+
+        self.assertEqual(self.client.get('/async/rooms/').status_code, 401)
+
+    def test_incomplete_view_fails_at_configuration(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        from .async_views import AsyncListView
+        from .serializers import TalkSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            type('IncompleteView', (AsyncListView,), {'serializer_class': TalkSerializer}).as_view()
+
+
+class LiveFeedTests(ScheduleTestMixin, TestCase):
+    """
+    Flux SSE : un changement de talk validé est poussé aux connexions dont le filtre correspond.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.speaker = self.create_user('speaker')
+        self.rooms = [Room.objects.create(name=f'Salle {i}') for i in range(2)]
+        self.talk = self.create_talks(1, [self.speaker], self.rooms)[0]
+        self.async_client.cookies['access_token'] = str(AccessToken.for_user(self.speaker))
+
+    def accept_talk(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.talk.status = 'accepted'
+            self.talk.save()
+
+    async def next_chunk(self, stream):
+        return await asyncio.wait_for(anext(stream), timeout=2)
+
+    async def test_status_change_is_pushed_to_matching_streams(self):
+        response = await self.async_client.get(f'/live/talks/?date={self.day}')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await self.next_chunk(stream), b'retry: 3000\n\n')
+        other_room = broadcaster.subscribe(room=self.rooms[1].id)
+
+        await sync_to_async(self.accept_talk)()
+
+        event, data = (await self.next_chunk(stream)).decode().strip().split('\n')
+        self.assertEqual(event, 'event: talk.updated')
+        change = json.loads(data.removeprefix('data: '))
+        self.assertEqual((change['id'], change['status']), (str(self.talk.id), 'accepted'))
+        self.assertEqual(change['previous_status'], 'pending')
+        self.assertTrue(other_room.queue.empty())
+        broadcaster.unsubscribe(other_room)
+
+        # Déconnexion : le serveur ASGI annule la tâche qui lit le flux
+        reading = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        reading.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await reading
+        self.assertEqual(broadcaster.subscriber_count(), 0)
+
+    async def test_slow_client_is_asked_to_reload(self):
+        subscription = Subscription(asyncio.get_running_loop(), queue_size=2)
+        for index in range(3):
+            subscription._put({'id': index})
+
+        self.assertIsNone(await subscription.get(timeout=1))
+        self.assertEqual(subscription.queue.qsize(), 0)
+
+    def test_notify_payloads_stay_under_postgresql_limit(self):
+        from .live import notify_payloads, talk_change
+
+        self.talk.title = 'Séance plénière : écologie, économie et société — ' * 5
+        changes = [talk_change('updated', self.talk) for _ in range(50)]
+
+        payloads = list(notify_payloads(changes))
+
+        self.assertGreater(len(payloads), 1)
+        self.assertTrue(all(len(payload.encode()) < 8000 for payload in payloads))
+        self.assertEqual(sum(len(json.loads(payload)) for payload in payloads), 50)
+
+    async def test_invalid_filters_are_rejected(self):
+        response = await self.async_client.get('/live/talks/?date=12-06-2025')
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client_class().get('/live/talks/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_wsgi_request_is_refused_without_blocking(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.client.cookies['access_token'] = str(AccessToken.for_user(self.speaker))
+        started = time.monotonic()
+        response = self.client.get('/live/talks/')
+
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+        self.assertLess(time.monotonic() - started, 5)
+
+
+class TalkSnapshotTests(ScheduleTestMixin, TestCase):
+    """
+    Copies des noms du conférencier, de l'organisateur et de la salle dans Talk.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.speaker = self.create_user('alice')
+        self.organizer = self.create_user('orga', role='organizer')
+        self.room = Room.objects.create(name='Amphi')
+        self.talk = self.create_talks(1, [self.speaker], [self.room], organizer=self.organizer)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def snapshot(self):
+        return Talk.objects.values(
+            'speakerName', 'speaker_email', 'organizer_name', 'organizer_email', 'room_name',
+        ).get()
+
+    def test_snapshots_follow_renames(self):
+        self.assertEqual(self.snapshot(), {
+            'speakerName': 'alice', 'speaker_email': 'alice@example.com',
+            'organizer_name': 'orga', 'organizer_email': 'orga@example.com', 'room_name': 'Amphi',
+        })
+        before = Talk.objects.get().updated_at
+
+        self.speaker.username, self.speaker.email = 'alice.martin', 'alice@martin.fr'
+        self.speaker.save()
+        self.room.name = 'Grand amphi'
+        self.room.save()
+
+        snapshot = self.snapshot()
+        self.assertEqual(
+            (snapshot['speakerName'], snapshot['speaker_email'], snapshot['room_name']),
+            ('alice.martin', 'alice@martin.fr', 'Grand amphi'),
+        )
+        self.assertGreater(Talk.objects.get().updated_at, before)
+        grid = self.client.get(f'/talks/date/{self.day}/grid/').json()
+        self.assertEqual(grid['rooms'][0]['name'], 'Grand amphi')
+        self.assertEqual(grid['rooms'][0]['talks'][0]['speaker']['username'], 'alice.martin')
+
+    def test_save_reads_related_rows_only_when_relation_changes(self):
+        talk = Talk.objects.get()
+        talk.title = 'Nouveau titre'
+        with CaptureQueriesContext(connection) as queries:
+            talk.save()
+        self.assertFalse([q for q in queries if 'core_user' in q['sql'] or 'core_room' in q['sql']])
+
+        other = self.create_user('bob')
+        talk.speaker_id = other.id
+        talk.save()
+        self.assertEqual(self.snapshot()['speakerName'], 'bob')
+
+    def test_save_of_loaded_talk_does_not_reread_it(self):
+        talk = Talk.objects.get()
+        talk.status = 'accepted'
+        with CaptureQueriesContext(connection) as queries:
+            talk.save()
+        self.assertFalse([q for q in queries if q['sql'].startswith('SELECT') and 'core_talk' in q['sql']])
+        self.assertEqual(talk._previous_state['status'], 'pending')
+
+        # L'état relevé suit les enregistrements successifs de la même instance
+        talk.status = 'rejected'
+        talk.save()
+        self.assertEqual(talk._previous_state['status'], 'accepted')
+
+    def test_only_talks_with_stale_copies_are_touched(self):
+        before = Talk.objects.get().updated_at
+
+        self.room.save()
+        self.speaker.first_name = 'Alice'
+        self.speaker.save()
+        self.assertEqual(Talk.objects.get().updated_at, before)
+
+        self.organizer.email = 'orga@talkback.fr'
+        self.organizer.save()
+        self.assertEqual(self.snapshot()['organizer_email'], 'orga@talkback.fr')
+        self.assertGreater(Talk.objects.get().updated_at, before)
+
+    def test_compact_list_reads_a_single_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/talks/date/{self.day}/?fields=compact')
+
+        talk = response.json()['results'][0]
+        self.assertEqual(talk['room_name'], 'Amphi')
+        self.assertEqual(talk['speaker'], str(self.speaker.id))
+        self.assertNotIn('description', talk)
+        self.assertFalse([q for q in queries if 'JOIN' in q['sql']])
+
+
+class TalkExportTests(ScheduleTestMixin, TestCase):
+    """
+    Export du programme en flux, à plat.
+    """
+
+    def setUp(self):
+        super().setUp()
+        speakers = [self.create_user(f'speaker{i}') for i in range(2)]
+        rooms = [Room.objects.create(name=f'Salle {i}') for i in range(2)]
+        self.talks = self.create_talks(6, speakers, rooms)
+        self.client = APIClient()
+        self.client.force_authenticate(speakers[0])
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_is_flat_and_ordered(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/talks/export/ndjson/')
+            lines = self.read(response).splitlines()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], [str(talk.id) for talk in self.talks])
+        self.assertEqual(rows[1]['room_name'], 'Salle 1')
+        self.assertEqual(rows[1]['speaker_name'], 'speaker1')
+        self.assertEqual(rows[0]['start'], '2025-06-12T08:00:00Z')
+
+    def test_csv_export_with_filters(self):
+        room = self.talks[0].room
+        content = self.read(self.client.get(f'/talks/export/csv/?room={room.id}'))
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['room_name'] for row in rows}, {room.name})
+        self.assertEqual(rows[0]['organizer_id'], '')
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get('/talks/export/xml/').status_code, 404)
+
+
+class DayGridTests(ScheduleTestMixin, TestCase):
+    """
+    Grille salle × créneau précalculée par jour.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.speakers = [self.create_user(f'speaker{i}') for i in range(2)]
+        self.rooms = [Room.objects.create(name=f'Salle {i}') for i in (1, 0)]
+        self.talks = self.create_talks(4, self.speakers, self.rooms)
+        self.client = APIClient()
+        self.client.force_authenticate(self.speakers[0])
+        self.url = f'/talks/date/{self.day}/grid/'
+
+    def test_grid_groups_talks_by_room_and_slot(self):
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(data['date'], str(self.day))
+        self.assertEqual(len(data['slots']), 4)
+        self.assertEqual([room['name'] for room in data['rooms']], ['Salle 0', 'Salle 1'])
+        self.assertEqual([talk['slot'] for talk in data['rooms'][1]['talks']], [0, 2])
+        self.assertEqual(data['rooms'][1]['talks'][0]['speaker']['username'], 'speaker0')
+
+    def test_materialized_grid_is_served_in_one_query(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_moving_a_talk_refreshes_both_days(self):
+        other_day = self.day + datetime.timedelta(days=1)
+        self.client.get(self.url)
+        self.client.get(f'/talks/date/{other_day}/grid/')
+
+        talk = self.talks[0]
+        talk.start += datetime.timedelta(days=1)
+        talk.end += datetime.timedelta(days=1)
+        talk.startdate = other_day
+        talk.save()
+
+        self.assertEqual(len(self.client.get(self.url).json()['slots']), 3)
+        moved = self.client.get(f'/talks/date/{other_day}/grid/').json()
+        self.assertEqual(moved['rooms'][0]['talks'][0]['id'], str(talk.id))
+
+    def test_room_rename_refreshes_grid(self):
+        self.client.get(self.url)
+
+        self.rooms[0].name = 'Amphi'
+        self.rooms[0].save()
+
+        names = [room['name'] for room in self.client.get(self.url).json()['rooms']]
+        self.assertEqual(names, ['Amphi', 'Salle 0'])
+
+    def test_emptied_day_keeps_its_version(self):
+        from .models import DayGrid
+
+        etags = {self.client.get(self.url)['ETag']}
+        for talk in self.talks:
+            talk.delete()
+        response = self.client.get(self.url)
+        etags.add(response['ETag'])
+
+        self.assertEqual(response.json()['rooms'], [])
+        self.assertEqual(len(etags), 2)
+        self.assertGreater(DayGrid.objects.get(day=self.day).version, 0)
+
+    def test_grid_built_during_a_write_is_not_stored(self):
+        from unittest import mock
+
+        from . import day_grid
+        from .models import DayGrid
+
+        build_grid = day_grid.build_grid
+
+        def build_then_write(day):
+            data = build_grid(day)
+            # Écriture validée pendant la construction : cette grille est déjà périmée
+            self.talks[0].title = 'Nouveau titre'
+            self.talks[0].save()
+            return data
+
+        with mock.patch.object(day_grid, 'build_grid', build_then_write):
+            self.client.get(self.url)
+
+        self.assertIsNone(DayGrid.objects.get(day=self.day).data)
+        titles = [talk['title'] for talk in self.client.get(self.url).json()['rooms'][1]['talks']]
+        self.assertIn('Nouveau titre', titles)
+
+    def test_empty_and_invalid_days(self):
+        from .models import DayGrid
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get('/talks/date/2030-01-01/grid/').json()['rooms'], [])
+        self.assertFalse(DayGrid.objects.filter(day='2030-01-01').exists())
+        self.assertEqual(self.client.get('/talks/date/2025-13-01/grid/').status_code, 404)
+
+
+class TalkSearchTests(ScheduleTestMixin, TestCase):
+    """
+    ?search= : plein texte sur PostgreSQL, ILIKE ailleurs, même contrat d'API.
+    """
+
+    def setUp(self):
+        super().setUp()
+        speaker = self.create_user('alice')
+        room = Room.objects.create(name='Salle A')
+        self.talks = self.create_talks(3, [speaker], [room])
+        for talk, title in zip(self.talks, ['Django et PostgreSQL', 'Python asynchrone', 'Docker']):
+            talk.title = title
+            talk.save()
+        self.client = APIClient()
+        self.client.force_authenticate(speaker)
+
+    def search(self, terms):
+        response = self.client.get('/talks/', {'search': terms})
+        return [talk['title'] for talk in response.json()['results']]
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('django postgres'), ['Django et PostgreSQL'])
+        self.assertEqual(self.search('django docker'), [])
+
+    def test_search_is_combined_with_filters_and_pagination(self):
+        response = self.client.get('/talks/', {'search': 'description', 'page_size': 2})
+
+        self.assertEqual(len(response.json()['results']), 2)
+        self.assertIsNotNone(response.json()['next'])
+
+    def test_full_text_query_uses_prefixes(self):
+        from .search import build_search_query, prefix_tsquery
+
+        self.assertIsNone(build_search_query(['!!', '-']))
+        self.assertEqual(prefix_tsquery(['perf', "l'async|"]), 'perf:* & l:* & async:*')
+
+
+class PerformanceMetricsTests(ScheduleTestMixin, TestCase):
+    """
+    Mesures par route de PerformanceMiddleware, exposées sur /metrics/.
+    """
+
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        speakers = [self.create_user(f'speaker{i}') for i in range(2)]
+        rooms = [Room.objects.create(name=f'Salle {i}') for i in range(2)]
+        self.organizer = self.create_user('orga', role='organizer')
+        self.create_talks(4, speakers, rooms)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def scrape(self):
+        response = self.client_class().get('/metrics/', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    @override_settings(PERFORMANCE={**settings.PERFORMANCE, 'METRICS_TOKEN': 'secret'})
+    def test_requests_are_aggregated_per_route(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f'/talks/date/{self.day}/')
+            self.client.get(f'/talks/date/{self.day}/')
+        query_count = len(queries)
+
+        text = self.scrape()
+        labels = 'method="GET",route="talks/date/<str:date>/"'
+        self.assertIn(f'talkback_http_requests_total{{{labels},status="200"}} 2', text)
+        self.assertIn(f'talkback_http_request_duration_seconds_count{{{labels}}} 2', text)
+        self.assertIn(f'talkback_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        # Seconde requête servie par le cache, sans aucune requête SQL
+        self.assertIn(f'talkback_db_queries_per_request_sum{{{labels}}} {query_count}', text)
+        self.assertIn(f'talkback_db_queries_per_request_bucket{{{labels},le="0"}} 1', text)
+        serializer_time = float(text.split(f'talkback_serializer_seconds_total{{{labels}}} ')[1].split()[0])
+        self.assertGreater(serializer_time, 0)
+        self.assertIn('talkback_cache_requests_total{endpoint="TalksByDateView",outcome="hits"} 1', text)
+
+    @override_settings(PERFORMANCE={**settings.PERFORMANCE, 'METRICS_TOKEN': 'secret'})
+    def test_metrics_require_token(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        response = self.client_class().get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(DEBUG=True, PERFORMANCE={**settings.PERFORMANCE, 'METRICS_TOKEN': ''})
+    def test_metrics_are_closed_without_configured_token(self):
+        response = self.client_class().get('/metrics/', HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(PERFORMANCE={**settings.PERFORMANCE, 'SLOW_REQUEST_MS': 0, 'LOG_SQL': True})
+    def test_slow_requests_are_logged_with_sql(self):
+        with self.assertLogs('core.metrics', 'WARNING') as logs:
+            self.client.get('/talks/?page_size=2')
+
+        self.assertIn('GET /talks/?page_size=2 -> 200', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+    def test_login_does_not_log_tokens(self):
+        with self.assertNoLogs('core.views'):
+            response = self.client_class().post(
+                '/login/', {'username': 'orga', 'password': 'pass'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class BenchmarkSuiteTests(ScheduleTestMixin, TestCase):
+    """
+    Les scénarios de manage.py benchmark s'exécutent sans erreur sur un petit jeu de données.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from .seeding import seed_schedule
+
+        seed_schedule(talks=60, rooms=3, speakers=10, organizers=1, password='pass')
+        self.data = BenchmarkData(prefix='seed', password='pass')
+
+    def test_scenarios_run_and_regressions_are_detected(self):
+        samples, wall_time = run_benchmark(self.data, list(SCENARIOS), iterations=1)
+        report = summarize(samples, wall_time)
+
+        failed = {endpoint: row for endpoint, row in report['endpoints'].items() if row['errors']}
+        self.assertEqual(failed, {})
+        self.assertIn('PUT update-talk', report['endpoints'])
+        self.assertIn('GET async-talk-list', report['endpoints'])
+        self.assertEqual(compare(report, report), [])
+
+        baseline = json.loads(json.dumps(report))
+        baseline['endpoints']['GET talk-detail']['queries_max'] -= 1
+        regressions = compare(baseline, report)
+        self.assertEqual([(endpoint, metric) for endpoint, metric, *_ in regressions],
+                         [('GET talk-detail', 'queries_max')])
+
+    def test_missing_dataset_is_reported(self):
+        with self.assertRaises(ValueError):
+            BenchmarkData(prefix='absent')
+
+
+class FastSerializerTests(ScheduleTestMixin, TestCase):
+    """
+    La sérialisation rapide des listes produit exactement le JSON de TalkSerializer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        speakers = [self.create_user(f'speaker{i}') for i in range(3)]
+        rooms = [Room.objects.create(name=f'Salle {i}') for i in range(2)]
+        self.organizer = self.create_user('orga', role='organizer')
+        self.talks = self.create_talks(8, speakers, rooms, organizer=self.organizer)
+        # Relations facultatives absentes : null dans le JSON
+        Talk.objects.filter(pk__in=[talk.pk for talk in self.talks[:2]]).update(room=None, organizer=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def test_output_is_byte_identical(self):
+        from rest_framework.renderers import JSONRenderer
+
+        from .fast_serializers import fast_serializer_for
+        from .serializers import TalkCompactSerializer, TalkSerializer
+
+        renderer = JSONRenderer()
+        for serializer_class in (TalkSerializer, TalkCompactSerializer):
+            fast = fast_serializer_for(serializer_class)
+            queryset = Talk.objects.order_by('start')
+            expected = renderer.render(serializer_class(queryset, many=True).data)
+            self.assertEqual(renderer.render(fast.serialize(queryset.values(*fast.columns))), expected)
+
+    def test_list_pages_and_cursors(self):
+        from rest_framework.renderers import JSONRenderer
+
+        from .serializers import TalkSerializer
+
+        with self.assertNumQueries(1):  # La page seule
+            response = self.client.get('/talks/?page_size=5')
+        expected = TalkSerializer(Talk.objects.order_by('start')[:5], many=True).data
+        self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(expected)))
+
+        following = self.client.get(response.json()['next']).json()
+        self.assertEqual([talk['id'] for talk in following['results']],
+                         [str(talk.id) for talk in self.talks[5:]])
+        self.assertIsNone(response.json()['results'][0]['room'])
+
+
+class FastJSONRendererTests(ScheduleTestMixin, TestCase):
+    """
+    FastJSONRenderer rend les mêmes octets que JSONRenderer, avec ou sans orjson.
+    """
+
+    def test_same_bytes_as_json_renderer(self):
+        import decimal
+        import uuid
+
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+
+        from .renderers import FastJSONRenderer
+
+        data = {
+            'id': uuid.uuid4(),
+            'start': timezone.make_aware(datetime.datetime(2025, 6, 12, 8, 30, 0, 1500)),
+            'day': self.day,
+            'title': 'Séparateur\u2028de ligne',
+            'price': decimal.Decimal('12.50'),
+            'label': gettext_lazy('Talk'),
+            'nested': [{'id': 1, 'tags': ('a', 'b')}, None, True],
+        }
+        expected = JSONRenderer().render(data)
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(data), expected)
+        # Entier hors de portée d'orjson : repli sur json
+        self.assertEqual(renderer.render({'n': 2 ** 70}), JSONRenderer().render({'n': 2 ** 70}))
+        self.assertEqual(
+            renderer.render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+        renderer.use_orjson = False
+        self.assertEqual(renderer.render(data), expected)
+
+    def test_talk_list_is_rendered(self):
+        speaker = self.create_user('speaker')
+        organizer = self.create_user('orga', role='organizer')
+        self.create_talks(3, [speaker], [Room.objects.create(name='Salle')], organizer=organizer)
+        client = APIClient()
+        client.force_authenticate(organizer)
+
+        response = client.get('/talks/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(response.json()['results']), 3)
+
+
+class ScheduleSolverTests(ScheduleTestMixin, TestCase):
+    """
+    Placement automatique des talks acceptés : programme sans conflit, appliqué en une fois.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.speakers = [self.create_user(f'speaker{i}') for i in range(3)]
+        self.rooms = [Room.objects.create(name=f'Salle {i}') for i in range(2)]
+        self.organizer = self.create_user('orga', role='organizer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def add_talk(self, hour, minute=0, speaker=0, room=0, status='accepted', level='beginner'):
+        start = timezone.make_aware(datetime.datetime.combine(self.day, datetime.time(hour, minute)))
+        return Talk.objects.create(
+            title=f'Talk {hour}:{minute}', description='', start=start,
+            end=start + datetime.timedelta(minutes=45), startdate=self.day, level=level, status=status,
+            speaker=self.speakers[speaker], room=self.rooms[room],
+        )
+
+    def test_conflicts_are_resolved_in_one_transaction(self):
+        from .scheduling import find_batch_conflicts
+
+        talks = [
+            self.add_talk(9), self.add_talk(9, 15, speaker=1), self.add_talk(9, 30, speaker=2),
+            self.add_talk(10, speaker=1, room=1), self.add_talk(10, 15, speaker=1, room=1),
+        ]
+        # Talk en attente : reste en place et bloque sa salle
+        pending = self.add_talk(11, status='pending', room=1)
+
+        response = self.client.post('/talks/schedule/?dry_run=1', {}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['applied'])
+        self.assertEqual(Talk.objects.get(pk=talks[1].pk).start, talks[1].start)
+
+        with self.assertNumQueries(11):
+            response = self.client.post('/talks/schedule/', {'step': 15}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['applied'])
+        self.assertEqual(response.json()['unplaced'], [])
+
+        scheduled = list(Talk.objects.all())
+        self.assertEqual(find_batch_conflicts(scheduled), [])
+        self.assertEqual(Talk.objects.get(pk=pending.pk).start, pending.start)
+        self.assertEqual(Talk.objects.get(pk=talks[0].pk).start, talks[0].start)
+        for talk in Talk.objects.filter(pk__in=[talk.pk for talk in talks]):
+            self.assertEqual(talk.end - talk.start, datetime.timedelta(minutes=45))
+            self.assertEqual(talk.room_name, talk.room.name)
+
+    def test_availability_and_level_constraints(self):
+        from .solver import ScheduleProblem, solve_schedule
+
+        first, second = self.add_talk(9), self.add_talk(10, speaker=1, room=1)
+        window_start = timezone.make_aware(datetime.datetime.combine(self.day, datetime.time(14)))
+        availability = [{
+            'speaker': self.speakers[1].pk, 'start': window_start,
+            'end': window_start + datetime.timedelta(hours=2),
+        }]
+        problem = ScheduleProblem.from_database(availability=availability, max_parallel_per_level=1)
+        result = solve_schedule(problem)
+
+        self.assertEqual(result.unplaced, [])
+        self.assertEqual(result.placements[first.pk].start, first.start)
+        placement = result.placements[second.pk]
+        self.assertGreaterEqual(placement.start, window_start)
+        self.assertLessEqual(placement.end, window_start + datetime.timedelta(hours=2))
+
+        # Un seul talk débutant à la fois, dans une journée d'une heure : un seul des trois passe
+        self.add_talk(9, 30, speaker=2, room=1)
+        response = self.client.post(
+            '/talks/schedule/', {'day_start': '09:00', 'day_end': '10:00', 'max_parallel_per_level': 1},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['unplaced']), 2)
+        self.assertEqual(Talk.objects.get(pk=second.pk).start, second.start)
+
+    def test_organizers_only(self):
+        self.client.force_authenticate(self.speakers[0])
+        self.assertEqual(self.client.post('/talks/schedule/', {}, format='json').status_code, 403)
+
+
+class TalkReviewTests(ScheduleTestMixin, TestCase):
+    """
+    Relecture en masse : statuts de nombreux talks changés en un seul UPDATE.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.speakers = [self.create_user('alice'), self.create_user('bob')]
+        self.room = Room.objects.create(name='Amphi A')
+        self.talks = self.create_talks(6, speakers=self.speakers, rooms=[self.room])
+        self.client = APIClient()
+        self.client.force_authenticate(self.create_user('orga', role='organizer'))
+
+    def test_statuses_are_written_in_one_update(self):
+        import uuid
+
+        accepted, rejected = self.talks[:3], self.talks[3:5]
+        Talk.objects.filter(pk=self.talks[5].pk).update(status='accepted')
+        missing = uuid.uuid4()
+        self.client.get(f'/talks/date/{self.day}/')
+        before = Talk.objects.get(pk=accepted[0].pk).updated_at
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/talks/review/', {
+                'decisions': [{'id': str(talk.id), 'status': 'rejected'} for talk in rejected]
+                + [{'id': str(self.talks[5].id), 'status': 'accepted'}, {'id': str(missing), 'status': 'accepted'}],
+                'status': 'accepted', 'ids': [str(talk.id) for talk in accepted],
+            }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['counts'], {'updated': 5, 'unchanged': 1, 'not_found': 1})
+        self.assertEqual(body['results'][str(missing)], 'not_found')
+        updates = [query for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE "core_talk"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            Counter(Talk.objects.values_list('status', flat=True)), Counter(accepted=4, rejected=2)
+        )
+        self.assertGreater(Talk.objects.get(pk=accepted[0].pk).updated_at, before)
+        # Le cache des listes est invalidé
+        page = self.client.get(f'/talks/date/{self.day}/').json()
+        statuses = {talk['id']: talk['status'] for talk in page['results']}
+        self.assertEqual(statuses[str(rejected[0].id)], 'rejected')
+
+    def test_speakers_only_review_their_own_talks(self):
+        alice, bob = self.speakers
+        self.client.force_authenticate(alice)
+
+        response = self.client.post('/talks/review/', {
+            'status': 'accepted', 'ids': [str(talk.id) for talk in self.talks[:2]],
+        }, format='json')
+
+        own, other = self.talks[:2]
+        self.assertEqual(response.json()['results'], {str(own.id): 'updated', str(other.id): 'forbidden'})
+        self.assertEqual(Talk.objects.get(pk=other.pk).status, 'pending')
+        self.assertEqual(self.client.post('/talks/review/', {'ids': [str(own.id)]}, format='json').status_code, 400)
+
+
+class RoomAvailabilityTests(ScheduleTestMixin, TestCase):
+    """
+    Créneaux libres et occupation des salles, calculés par jour et mis en cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.speakers = [self.create_user('alice'), self.create_user('bob')]
+        self.rooms = [Room.objects.create(name='Amphi A'), Room.objects.create(name='Amphi B')]
+        self.client = APIClient()
+        self.client.force_authenticate(self.speakers[0])
+
+    def add_talk(self, room, hour, minute=0, duration=45, speaker=0):
+        start = timezone.make_aware(datetime.datetime.combine(self.day, datetime.time(hour, minute)))
+        return Talk.objects.create(
+            title=f'Talk {hour}:{minute}', description='', start=start,
+            end=start + datetime.timedelta(minutes=duration), startdate=self.day, level='beginner',
+            speaker=self.speakers[speaker], room=self.rooms[room],
+        )
+
+    def availability(self, **params):
+        response = self.client.get('/rooms/availability/', {'date': self.day, **params})
+        self.assertEqual(response.status_code, 200)
+        return {room['name']: room for room in response.json()['rooms']}
+
+    def test_free_slots_and_occupancy(self):
+        # Deux talks qui se touchent forment un seul bloc occupé
+        self.add_talk(0, 14, 15)
+        self.add_talk(0, 15, speaker=1)
+        self.add_talk(1, 9)
+
+        rooms = self.availability(start='14:00', end='15:30')
+
+        self.assertEqual(rooms['Amphi A']['free'], [
+            {'start': '2025-06-12T14:00:00Z', 'end': '2025-06-12T14:15:00Z'},
+        ])
+        self.assertEqual(rooms['Amphi A']['busy_minutes'], 75)
+        self.assertAlmostEqual(rooms['Amphi A']['occupancy'], 75 / 90, places=3)
+        self.assertTrue(rooms['Amphi B']['is_free'])
+        # Créneaux trop courts écartés
+        self.assertEqual(self.availability(start='14:00', end='15:30', min_duration=30)['Amphi A']['free'], [])
+
+    def test_days_are_cached_until_a_talk_changes(self):
+        talk = self.add_talk(0, 14)
+        self.availability(end_date=self.day + datetime.timedelta(days=6))
+
+        with CaptureQueriesContext(connection) as context:
+            self.availability(end_date=self.day + datetime.timedelta(days=6))
+        self.assertFalse([query for query in context.captured_queries if 'core_talk' in query['sql']])
+
+        talk.start += datetime.timedelta(hours=2)
+        talk.end += datetime.timedelta(hours=2)
+        talk.save()
+        free = self.availability(start='14:00', end='15:00')['Amphi A']['free']
+        self.assertEqual(free, [{'start': '2025-06-12T14:00:00Z', 'end': '2025-06-12T15:00:00Z'}])
+
+    def test_talk_crossing_midnight_occupies_both_days(self):
+        start = timezone.make_aware(datetime.datetime.combine(self.day, datetime.time(23)))
+        Talk.objects.create(
+            title='Nocturne', description='', start=start, end=start + datetime.timedelta(hours=2),
+            startdate=self.day, level='beginner', speaker=self.speakers[0], room=self.rooms[0],
+        )
+
+        next_day = self.day + datetime.timedelta(days=1)
+        rooms = self.availability(date=next_day, start='00:00', end='02:00')
+        self.assertEqual(rooms['Amphi A']['busy_minutes'], 60)
+        self.assertEqual(rooms['Amphi A']['free'], [
+            {'start': '2025-06-13T01:00:00Z', 'end': '2025-06-13T02:00:00Z'},
+        ])
+        self.assertEqual(self.availability(start='23:00')['Amphi A']['busy_minutes'], 60)
+
+    def test_invalid_range_is_rejected(self):
+        response = self.client.get('/rooms/availability/', {'date': self.day, 'start': '15:00', 'end': '14:00'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """
+    Lectures GET sur un réplica, écritures et lectures qui suivent une écriture sur le primaire.
+    """
+
+    def route(self, request, write=False):
+        from .db_router import ReplicaRouter, ReplicaRoutingMiddleware
+
+        router, used = ReplicaRouter(), []
+
+        def view(request):
+            if write:
+                used.append(router.db_for_write(Talk))
+            used.append(router.db_for_read(Talk) or 'default')
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return used, response
+
+    def test_reads_go_to_replica_and_writes_pin_the_client(self):
+        from .db_router import PIN_COOKIE
+
+        factory = RequestFactory()
+        used, response = self.route(factory.get('/talks/'))
+        self.assertEqual(used, ['replica1'])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        # Après l'écriture, la requête elle-même puis le client relisent le primaire
+        used, response = self.route(factory.put('/talks/x/update/'), write=True)
+        self.assertEqual(used, ['default', 'default'])
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 5)
+
+        request = factory.get('/talks/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.route(request)[0], ['default'])
+
+    def test_outside_requests_use_primary(self):
+        from .db_router import ReplicaRouter
+
+        self.assertIsNone(ReplicaRouter().db_for_read(Talk))
+        self.assertFalse(ReplicaRouter().allow_migrate('replica1', 'core'))
+
+
+class ReplicaCacheFillTests(ScheduleTestMixin, TransactionTestCase):
+    """
+    Avec un réplica en retard, ce qui est mis en cache sous la génération courante (ou
+    renvoyé avec un ETag qui en dérive) est lu sur le primaire.
+    """
+
+    def setUp(self):
+        import sqlite3
+        import tempfile
+
+        from django.db import connections
+
+        super().setUp()
+        self.organizer = self.create_user('orga', role='organizer')
+        self.room = Room.objects.create(name='Salle A')
+        self.create_talks(1, [self.create_user('speaker')], [self.room])
+
+        # Réplica : copie de la base à cet instant, qui ne recevra pas les écritures suivantes
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = f'{directory.name}/replica.sqlite3'
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+        connections.settings['replica1'] = dict(connection.settings_dict, NAME=path)
+        self.addCleanup(connections.settings.pop, 'replica1')
+        self.addCleanup(connections.__delitem__, 'replica1')
+        # Alias créé après la mise en place de la classe : connexion ouverte ici
+        connections['replica1'].connect()
+        self.addCleanup(connections['replica1'].close)
+
+        routing = override_settings(DATABASE_REPLICAS=['replica1'])
+        routing.enable()
+        self.addCleanup(routing.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def write_on_primary(self):
+        # Écriture d'un autre client, pas encore répliquée
+        talk = Talk.objects.get()
+        talk.title = 'Nouveau titre'
+        talk.save()
+
+    def test_replica_is_lagging(self):
+        self.write_on_primary()
+
+        replica_titles = list(Talk.objects.using('replica1').values_list('title', flat=True))
+        self.assertEqual(replica_titles, ['Talk 0'])
+
+    def test_cached_list_and_etag_are_read_on_primary(self):
+        self.write_on_primary()
+
+        response = self.client.get('/talks/')
+        etag = response['ETag']
+        self.assertEqual(response.json()['results'][0]['title'], 'Nouveau titre')
+
+        # Réponse en cache : la même, et le même ETag
+        response = self.client.get('/talks/')
+        self.assertEqual(response.json()['results'][0]['title'], 'Nouveau titre')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_cached_occupancy_is_read_on_primary(self):
+        Room.objects.create(name='Salle B')
+        Talk.objects.update(room=None)
+
+        response = self.client.get('/rooms/availability/', {
+            'date': self.day.isoformat(), 'start': '08:00', 'end': '10:00',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        rooms = response.json()['rooms']
+        self.assertEqual([room['name'] for room in rooms], ['Salle A', 'Salle B'])
+        self.assertTrue(all(room['is_free'] for room in rooms))
+
+class ConnectionHealthTests(ScheduleTestMixin, TestCase):
+    """
+    Sonde de santé des bases et mesure des ouvertures de connexion.
+    """
+
+    def test_health_reports_each_database(self):
+        response = APIClient().get('/health/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['databases']['default']['ok'])
+
+    def test_connects_are_measured(self):
+        import tempfile
+
+        from django.db import connections
+
+        from .backends.sqlite3.base import DatabaseWrapper
+
+        registry.reset()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        probe = DatabaseWrapper(
+            dict(connections['default'].settings_dict, NAME=f'{directory.name}/probe.sqlite3'), alias='probe',
+        )
+        probe.ensure_connection()
+        try:
+            text = registry.render()
+            self.assertIn('talkback_db_connect_seconds_count{alias="probe"} 1', text)
+            self.assertIn('talkback_db_connections_open{alias="probe"} 1', text)
+        finally:
+            probe.close()
+        self.assertIn('talkback_db_connections_open{alias="probe"} 0', registry.render())
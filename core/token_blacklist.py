@@ -0,0 +1,133 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom : « absent » est certain, « présent » peut être un faux positif
+    (taux visé : error_rate tant que le nombre d'éléments reste sous capacity).
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hachage : h1 + i * h2 donne les k positions à partir d'un seul digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+
+class BlacklistIndex:
+    """
+    Jti en liste noire, en mémoire, devant la table BlacklistedToken.
+
+    Le filtre est construit au premier usage puis complété au plus toutes les
+    SYNC_INTERVAL secondes par les lignes dont blacklisted_at suit la synchronisation
+    précédente, moins OVERLAP secondes : une ligne validée en retard (blacklisted_at est
+    fixé à l'insertion, pas au commit) est rattrapée tant que sa transaction dure moins
+    que OVERLAP. Le filtre est en outre reconstruit toutes les REBUILD_INTERVAL secondes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+            # Début de la dernière synchronisation (horloge de l'application)
+            self._cursor = None
+            self._synced_at = 0.0
+            self._rebuilt_at = 0.0
+
+    @property
+    def options(self):
+        return settings.TOKEN_BLACKLIST_FILTER
+
+    def _rebuild(self):
+        capacity = self.options['CAPACITY']
+        count = BlacklistedToken.objects.count()
+        # Marge pour ne pas reconstruire dès les prochaines mises en liste noire
+        while capacity < count * 2:
+            capacity *= 2
+        self._bloom = BloomFilter(capacity, self.options['ERROR_RATE'])
+        self._load(BlacklistedToken.objects.all())
+        self._rebuilt_at = time.monotonic()
+
+    def _load(self, queryset):
+        for jti in queryset.values_list('token__jti', flat=True).iterator(chunk_size=10000):
+            # Les lignes relues (OVERLAP) ne doivent pas gonfler le compteur du filtre
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+
+    def sync(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._bloom is not None \
+                    and now - self._synced_at < self.options['SYNC_INTERVAL']:
+                return
+            # Pris avant la lecture : une ligne insérée pendant celle-ci sera relue
+            started = timezone.now()
+            if self._bloom is None or self._bloom.count > self._bloom.capacity \
+                    or now - self._rebuilt_at >= self.options['REBUILD_INTERVAL']:
+                self._rebuild()
+            else:
+                since = self._cursor - timedelta(seconds=self.options['OVERLAP'])
+                self._load(BlacklistedToken.objects.filter(blacklisted_at__gte=since))
+            self._cursor = started
+            self._synced_at = now
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def might_contain(self, jti):
+        self.sync()
+        return jti in self._bloom
+
+
+blacklist_index = BlacklistIndex()
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    RefreshToken dont la vérification de liste noire consulte d'abord le filtre en mémoire :
+    la base n'est interrogée que si le jti y figure peut-être.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if settings.TOKEN_BLACKLIST_FILTER['ENABLED'] and not blacklist_index.might_contain(jti):
+            return
+        super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM])
+        return result
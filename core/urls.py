@@ -5,19 +5,35 @@ from .views import (
     TokenRefreshView,
     RegisterView,
     HelloWorldView,
-    LogoutView
+    LogoutView,
+    MetricsView,
+    HealthView,
 
 )
 from .talk_views import (
     RoomListCreateView,
     RoomDetailView,
+    RoomAvailabilityView,
     TalkListCreateView,
     TalkDetailView,
     TalksBySpeakerView,
     TalksByOrganizerView,
     TalksByDateView,
+    TalkDayGridView,
     TalksByRoomView,
     UpdateTalkView,
+    TalkBulkImportView,
+    TalkScheduleView, TalkReviewView,
+    TalkExportView,
+    CacheStatsView,
+)
+from .async_views import (
+    AsyncRoomListView,
+    AsyncRoomDetailView,
+    AsyncTalkListView,
+    AsyncTalkDetailView,
+    AsyncTalksByDateView,
+    LiveTalkFeedView,
 )
 
 urlpatterns = [
@@ -32,17 +48,34 @@ urlpatterns = [
     
     # Vues salles
     path('rooms/', RoomListCreateView.as_view(), name='room-list-create'),
+    path('rooms/availability/', RoomAvailabilityView.as_view(), name='room-availability'),
     path('rooms/<int:pk>/', RoomDetailView.as_view(), name='room-detail'),
     
     # Vues talks
     path('talks/', TalkListCreateView.as_view(), name='talk-list-create'),
+    path('talks/import/', TalkBulkImportView.as_view(), name='talk-bulk-import'),
+    path('talks/schedule/', TalkScheduleView.as_view(), name='talk-schedule'),
+    path('talks/review/', TalkReviewView.as_view(), name='talk-review'),
+    path('talks/export/<str:fmt>/', TalkExportView.as_view(), name='talk-export'),
     path('talks/<uuid:pk>/', TalkDetailView.as_view(), name='talk-detail'),
     path('talks/<uuid:pk>/update/', UpdateTalkView.as_view(), name='update-talk'),
     path('talks/speaker/<uuid:speaker_id>/', TalksBySpeakerView.as_view(), name='talks-by-speaker'),
     path('talks/organizer/<uuid:organizer_id>/', TalksByOrganizerView.as_view(), name='talks-by-organizer'),
     path('talks/date/<str:date>/', TalksByDateView.as_view(), name='talks-by-date'),
+    path('talks/date/<str:date>/grid/', TalkDayGridView.as_view(), name='talks-day-grid'),
     path('talks/room/<int:room_id>/', TalksByRoomView.as_view(), name='talks-by-room'),
     
+    # Vues de lecture asynchrones (serveur ASGI)
+    path('async/rooms/', AsyncRoomListView.as_view(), name='async-room-list'),
+    path('async/rooms/<int:pk>/', AsyncRoomDetailView.as_view(), name='async-room-detail'),
+    path('async/talks/', AsyncTalkListView.as_view(), name='async-talk-list'),
+    path('async/talks/<uuid:pk>/', AsyncTalkDetailView.as_view(), name='async-talk-detail'),
+    path('async/talks/date/<str:date>/', AsyncTalksByDateView.as_view(), name='async-talks-by-date'),
+    path('live/talks/', LiveTalkFeedView.as_view(), name='live-talk-feed'),
+    
     # Autres vues
     path('hello/', HelloWorldView.as_view(), name='hello-world'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('health/', HealthView.as_view(), name='health'),
 ]
\ No newline at end of file
@@ -9,6 +9,13 @@ from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django.shortcuts import get_object_or_404
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import user_cache
+from .token_blacklist import FilteredRefreshToken
+from .metrics import registry
+from .db_health import check_databases
+from .permissions import HasMetricsToken
+from django.http import HttpResponse
 import logging
 logger = logging.getLogger(__name__)
 import datetime
@@ -18,6 +25,27 @@ class HelloWorldView(APIView):
     def get(self, request):
         return Response({"message": "Hello, world!"}, status=status.HTTP_200_OK)
 
+class MetricsView(APIView):
+    # Jeton dédié plutôt que JWT : lu par un collecteur Prometheus
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+class HealthView(APIView):
+    # Sonde de load balancer : sans authentification, 503 si le primaire ne répond pas
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        databases = check_databases()
+        healthy = databases['default']['ok']
+        return Response(
+            {'status': 'ok' if healthy else 'error', 'databases': databases},
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
 class CookieTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
@@ -29,7 +57,6 @@ class CookieTokenObtainPairView(TokenObtainPairView):
             refresh = response.data["refresh"]
             role = response.data["role"]
 
-            logger.error(response.data)
             res = Response({"message": "Login successful", "role" : role}, status=200)
             res.set_cookie("access_token", access, httponly=True, secure=True, samesite="Lax", max_age=1800)
             res.set_cookie("refresh_token", refresh, httponly=True, secure=True, samesite="Lax", max_age=7*24*60*60)
@@ -45,8 +72,9 @@ class LogoutView(APIView):
 
         try:
             # Révoquer le token de rafraîchissement
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
+            user_cache.evict_user(token[api_settings.USER_ID_CLAIM])
 
             # Supprimer les cookies
             response = Response({'detail': 'Logout successful'}, status=status.HTTP_200_OK)
@@ -65,7 +93,7 @@ class TokenRefreshView(APIView):
             return Response({'detail': 'Refresh token not found'}, status=status.HTTP_401_UNAUTHORIZED)
 
         try:
-            refresh = RefreshToken(refresh_token)
+            refresh = FilteredRefreshToken(refresh_token)
             access_token = str(refresh.access_token)
 
             response = Response({'access': access_token}, status=status.HTTP_200_OK)
@@ -0,0 +1,18 @@
+# Configuration gunicorn, lue depuis le répertoire de lancement
+# (gunicorn talkback_project.wsgi:application).
+
+import os
+
+
+def on_starting(server):
+    # Nombre de workers, lu par les settings de chaque worker (SCHEDULE_GENERATION_STORE) ;
+    # avec --preload, les settings sont lus avant : renseigner WEB_CONCURRENCY
+    os.environ["WEB_CONCURRENCY"] = str(server.cfg.workers)
+
+
+def post_worker_init(worker):
+    # Connexions (ou pool) ouvertes avant la première requête du worker
+    from core.db_health import warm_up_connections
+
+    timings = warm_up_connections()
+    worker.log.info("Connexions ouvertes au démarrage : %s", timings)
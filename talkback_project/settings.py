@@ -49,9 +49,14 @@ INSTALLED_APPS = [
 
 
 REST_FRAMEWORK = {
+    # CookieJWTAuthentication lit aussi l'en-tête Authorization : un seul décodage par requête
     "DEFAULT_AUTHENTICATION_CLASSES": (
           'core.authentication.CookieJWTAuthentication', 
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+    ),
+    # orjson si installé, json sinon (même sortie que JSONRenderer)
+    "DEFAULT_RENDERER_CLASSES": (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
@@ -69,7 +74,75 @@ SIMPLE_JWT = {
 }
 
 
+# Cache des utilisateurs authentifiés par JWT (core.authentication) :
+# évite le SELECT sur core_user à chaque requête. En mode STATELESS, les lectures
+# (GET, HEAD, OPTIONS) utilisent directement les claims du jeton (id, role).
+AUTH_USER_CACHE = {
+    "TTL": int(os.environ.get("AUTH_USER_CACHE_TTL", 30)),
+    "MAX_SIZE": int(os.environ.get("AUTH_USER_CACHE_MAX_SIZE", 10000)),
+    "STATELESS": os.environ.get("AUTH_STATELESS", "0") == "1",
+}
+
+# Filtre de Bloom des jetons en liste noire (core.token_blacklist), devant les tables
+# token_blacklist : un jti absent du filtre n'est pas cherché en base.
+# SYNC_INTERVAL (s) borne le délai avant qu'un worker voie une révocation faite ailleurs.
+# OVERLAP (s) doit dépasser la plus longue transaction qui met un jeton en liste noire ;
+# REBUILD_INTERVAL (s) : reconstruction complète périodique du filtre.
+TOKEN_BLACKLIST_FILTER = {
+    "ENABLED": os.environ.get("TOKEN_BLACKLIST_FILTER", "1") == "1",
+    "CAPACITY": int(os.environ.get("TOKEN_BLACKLIST_CAPACITY", 1_000_000)),
+    "ERROR_RATE": 0.001,
+    "SYNC_INTERVAL": float(os.environ.get("TOKEN_BLACKLIST_SYNC_INTERVAL", 2)),
+    "OVERLAP": float(os.environ.get("TOKEN_BLACKLIST_OVERLAP", 300)),
+    "REBUILD_INTERVAL": float(os.environ.get("TOKEN_BLACKLIST_REBUILD_INTERVAL", 3600)),
+}
+
+# Mesures par route de PerformanceMiddleware (core.metrics)
+PERFORMANCE = {
+    # Journalise les requêtes plus lentes que ce seuil (ms) ; None : désactivé
+    "SLOW_REQUEST_MS": (
+        float(os.environ["SLOW_REQUEST_MS"]) if os.environ.get("SLOW_REQUEST_MS") else None
+    ),
+    # Joint au journal les requêtes SQL les plus lentes de la requête
+    "LOG_SQL": os.environ.get("SLOW_REQUEST_LOG_SQL", "0") == "1",
+    # Jeton du collecteur Prometheus pour /metrics/ (Authorization: Bearer ...)
+    "METRICS_TOKEN": os.environ.get("METRICS_TOKEN", ""),
+    # Routes suivies au plus ; au-delà, regroupées sous "<other>"
+    "MAX_ROUTES": 500,
+}
+
+# Flux en direct des changements de talks (SSE, serveur ASGI)
+LIVE_FEED = {
+    # Canal LISTEN/NOTIFY (PostgreSQL)
+    "CHANNEL": "talk_changes",
+    # Événements en attente par connexion avant de demander au client de recharger
+    "QUEUE_SIZE": int(os.environ.get("LIVE_FEED_QUEUE_SIZE", 100)),
+    # Commentaire envoyé en l'absence d'événement (proxies, détection des déconnexions)
+    "HEARTBEAT": float(os.environ.get("LIVE_FEED_HEARTBEAT", 15)),
+}
+
+# Livraison des webhooks (webhooks.delivery, manage.py webhook_worker)
+WEBHOOKS = {
+    "TIMEOUT": float(os.environ.get("WEBHOOK_TIMEOUT", 10)),
+    "MAX_ATTEMPTS": int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", 8)),
+    # Délai avant la 2e tentative (s), doublé à chaque échec jusqu'à BACKOFF_MAX
+    "BACKOFF_BASE": 30,
+    "BACKOFF_MAX": 6 * 3600,
+    # Événements envoyés au plus par requête vers une même URL
+    "BATCH_SIZE": 50,
+    "CONCURRENCY": int(os.environ.get("WEBHOOK_CONCURRENCY", 16)),
+    # Durée de réservation d'une livraison par un worker (s)
+    "LEASE": 120,
+    # Adresses locales et privées acceptées (développement uniquement) : vérifiées à
+    # l'abonnement et à chaque envoi sinon
+    "ALLOW_PRIVATE_TARGETS": os.environ.get("WEBHOOK_ALLOW_PRIVATE_TARGETS") == "1",
+}
+
 MIDDLEWARE = [
+    # En tête : mesure la requête entière (core.metrics, exposé sur /metrics/)
+    "core.metrics.PerformanceMiddleware",
+    # Lectures GET sur les réplicas (DB_REPLICAS), écritures sur le primaire
+    "core.db_router.ReplicaRoutingMiddleware",
      'corsheaders.middleware.CorsMiddleware', 
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -136,7 +209,8 @@ WSGI_APPLICATION = "talkback_project.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # Moteurs de Django avec mesure des connexions (core.backends, /metrics/)
+        "ENGINE": "core.backends.postgresql",
         "NAME": os.environ.get("DB_NAME", "appdb"),
         "USER": os.environ.get("DB_USER", "postgres"),
         "PASSWORD": os.environ.get("DB_PASSWORD", "postgres"),
@@ -145,6 +219,86 @@ DATABASES = {
     }
 }
 
+# DB_ENGINE=sqlite : base SQLite locale (développement, benchmarks sans PostgreSQL)
+if os.environ.get("DB_ENGINE") == "sqlite":
+    DATABASES["default"] = {
+        "ENGINE": "core.backends.sqlite3",
+        "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+    }
+
+# Connexions, réglables par environnement. DB_CONN_MAX_AGE : durée de réutilisation d'une
+# connexion (secondes, 0 : une par requête), vérifiée avant réutilisation si
+# DB_CONN_HEALTH_CHECKS=1. DB_POOL=1 : pool psycopg 3 (pip install "psycopg[binary,pool]"),
+# partagé par les threads du worker, à la place des connexions persistantes ; à préférer
+# sous ASGI. Ouverture au démarrage des workers : gunicorn.conf.py.
+DATABASES["default"].update(
+    CONN_MAX_AGE=int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+    CONN_HEALTH_CHECKS=os.environ.get("DB_CONN_HEALTH_CHECKS", "1") == "1",
+)
+if os.environ.get("DB_POOL") == "1" and DATABASES["default"]["ENGINE"] == "core.backends.postgresql":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            # Attente maximale d'une connexion libre (secondes)
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        },
+    }
+
+# Réplicas en lecture (core.db_router) : DB_REPLICAS="hôte1:5432,hôte2" pour PostgreSQL,
+# ou des chemins de fichiers pour SQLite. Les requêtes GET y lisent ; les écritures et
+# les lectures qui suivent une écriture du même client restent sur le primaire.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(","))):
+    alias = f"replica{index + 1}"
+    DATABASES[alias] = dict(DATABASES["default"], TEST={"MIRROR": "default"})
+    if DATABASES[alias]["ENGINE"] == "core.backends.sqlite3":
+        DATABASES[alias]["NAME"] = replica.strip()
+    else:
+        host, _, port = replica.strip().partition(":")
+        DATABASES[alias].update(HOST=host, PORT=port or DATABASES[alias]["PORT"])
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+# Durée (secondes) pendant laquelle un client qui vient d'écrire lit sur le primaire
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Mémoire locale par défaut ; REDIS_URL permet de partager le cache entre workers
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "talkback",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    }
+}
+
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
+# Durée de vie maximale (secondes) des réponses du planning mises en cache.
+SCHEDULE_CACHE_TIMEOUT = int(os.environ.get("SCHEDULE_CACHE_TIMEOUT", 60))
+
+# Nombre de processus qui servent l'application : WEB_CONCURRENCY, lu aussi par gunicorn
+# et uvicorn comme nombre de workers par défaut (gunicorn.conf.py le renseigne d'après
+# --workers).
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+# Où tenir le compteur de génération du planning (core.cache), qui invalide les réponses
+# en cache et fonde les ETag : "cache" (partagé avec REDIS_URL) ou "database". En mémoire
+# locale, un compteur par worker laisserait les autres workers en retard sur une
+# écriture : avec plusieurs workers et sans REDIS_URL, il est tenu en base.
+SCHEDULE_GENERATION_STORE = os.environ.get("SCHEDULE_GENERATION_STORE") or (
+    "database" if not os.environ.get("REDIS_URL") and WEB_CONCURRENCY > 1 else "cache"
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -21,4 +21,5 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),  # Inclure les URLs de l'application 'core'
+    path('webhooks/', include('webhooks.urls')),
 ]
@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import WebhookDelivery, WebhookEndpoint
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ('url', 'owner', 'is_active', 'rate_limit', 'created_at')
+    list_filter = ('is_active',)
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ('event', 'endpoint', 'status', 'attempts', 'next_attempt_at', 'response_status')
+    list_filter = ('status', 'event')
+    raw_id_fields = ('endpoint',)
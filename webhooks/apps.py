@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WebhooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "webhooks"
+
+    def ready(self):
+        # Connexion des receivers : les changements de talks alimentent l'outbox
+        from . import signals  # noqa: F401
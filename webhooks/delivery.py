@@ -0,0 +1,333 @@
+import hashlib
+import hmac
+import http.client
+import ipaddress
+import json
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import WebhookDelivery, WebhookEndpoint
+
+SIGNATURE_HEADER = 'X-Talkback-Signature'
+TIMESTAMP_HEADER = 'X-Talkback-Timestamp'
+
+
+def _iso(value):
+    return value.isoformat().replace('+00:00', 'Z') if value is not None else None
+
+
+def talk_payload(talk, previous_status=None):
+    """Contenu d'un événement talk.* : champs du talk, à plat, sans requête"""
+    payload = {
+        'id': str(talk.pk),
+        'title': talk.title,
+        'start': _iso(talk.start),
+        'end': _iso(talk.end),
+        'startdate': _iso(talk.startdate),
+        'level': talk.level,
+        'status': talk.status,
+        'speaker': str(talk.speaker_id),
+        'room': talk.room_id,
+        'organizer': str(talk.organizer_id) if talk.organizer_id else None,
+        'updated_at': _iso(talk.updated_at),
+    }
+    if previous_status is not None:
+        payload['previous_status'] = previous_status
+    return payload
+
+
+def enqueue(events):
+    """
+    Ajoute à l'outbox une livraison par (événement, webhook abonné).
+    events : liste de (nom d'événement, contenu). Appelé dans la transaction de l'écriture :
+    l'événement n'existe que si le changement est validé.
+    """
+    if not events:
+        return []
+    endpoints = list(WebhookEndpoint.objects.filter(is_active=True).only('id', 'events'))
+    now = timezone.now()
+    deliveries = [
+        WebhookDelivery(endpoint=endpoint, event=event, payload=payload, next_attempt_at=now)
+        for event, payload in events
+        for endpoint in endpoints
+        if endpoint.subscribes_to(event)
+    ]
+    return WebhookDelivery.objects.bulk_create(deliveries)
+
+
+def sign(secret, timestamp, body):
+    message = f'{timestamp}.'.encode() + body
+    return 'sha256=' + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret, timestamp, body, signature, tolerance=300):
+    """Vérification côté partenaire : signature valide et horodatage récent"""
+    if abs(time.time() - int(timestamp)) > tolerance:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), signature)
+
+
+def backoff(attempts, options):
+    # Exponentiel avec gigue : les livraisons en échec ne repartent pas toutes ensemble
+    delay = min(options['BACKOFF_BASE'] * 2 ** (attempts - 1), options['BACKOFF_MAX'])
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+class RateLimiter:
+    """
+    Seau à jetons par webhook (rate_limit requêtes par minute), propre au worker.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint):
+        """Prend un jeton ; sinon renvoie le nombre de secondes à attendre"""
+        rate = endpoint.rate_limit / 60
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(endpoint.pk, (endpoint.rate_limit, now))
+            tokens = min(endpoint.rate_limit, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[endpoint.pk] = (tokens - 1, now)
+                return 0
+            self._buckets[endpoint.pk] = (tokens, now)
+            return (1 - tokens) / rate if rate else 60
+
+
+def claim(limit, lease):
+    """
+    Réserve jusqu'à limit livraisons échues. SKIP LOCKED (PostgreSQL) : plusieurs workers
+    se partagent la file sans se bloquer ; la réservation expire si un worker s'arrête.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        deliveries = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(status='pending', next_attempt_at__lte=now)
+            .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+            .select_related('endpoint')
+            .order_by('next_attempt_at')[:limit]
+        )
+        WebhookDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(
+            locked_until=now + timedelta(seconds=lease)
+        )
+    return deliveries
+
+
+class UnsafeTarget(Exception):
+    """L'hôte d'un webhook résout vers une adresse locale ou privée"""
+
+
+def resolve_public(hostname, port, allow_private=False):
+    """
+    Adresses de l'hôte, toutes publiques (ni boucle locale, ni réseau privé, ni lien
+    local), sinon UnsafeTarget. socket.gaierror si l'hôte est introuvable.
+    """
+    infos = socket.getaddrinfo(hostname, port, proto=socket.IPPROTO_TCP)
+    addresses = [ipaddress.ip_address(info[4][0].split('%')[0]) for info in infos]
+    if not allow_private:
+        for address in addresses:
+            if not address.is_global or address.is_multicast:
+                raise UnsafeTarget(f"{hostname} résout vers une adresse refusée ({address})")
+    return addresses
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Une redirection pourrait viser une adresse interne refusée à l'abonnement
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class PinnedHTTPConnection(http.client.HTTPConnection):
+    """
+    Connexion à l'adresse vérifiée par resolve_public, sans nouvelle résolution DNS :
+    l'hôte de l'URL reste dans l'en-tête Host (et, en HTTPS, dans le SNI et la
+    vérification du certificat).
+    """
+
+    def __init__(self, host, *, address, **kwargs):
+        super().__init__(host, **kwargs)
+        self._create_connection = self._connect_pinned
+        self.pinned_address = address
+
+    def _connect_pinned(self, address, *args, **kwargs):
+        return socket.create_connection((self.pinned_address, address[1]), *args, **kwargs)
+
+
+class PinnedHTTPSConnection(PinnedHTTPConnection, http.client.HTTPSConnection):
+    pass
+
+
+class PinnedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, address):
+        super().__init__()
+        self.address = address
+
+    def http_open(self, req):
+        return self.do_open(PinnedHTTPConnection, req, address=self.address)
+
+
+class PinnedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, address):
+        super().__init__()
+        self.address = address
+
+    def https_open(self, req):
+        return self.do_open(PinnedHTTPSConnection, req, address=self.address, context=self._context)
+
+
+def post(url, headers, body, timeout, allow_private=False):
+    """
+    Envoi HTTP (thread du pool, sans accès à la base, sans suivre les redirections) :
+    (code HTTP, erreur). L'hôte est résolu et vérifié à chaque envoi, puis la connexion
+    est ouverte vers l'adresse vérifiée : un DNS qui change après l'abonnement (DNS
+    rebinding) ne mène pas vers le réseau interne. UnsafeTarget si l'hôte est refusé.
+    """
+    parts = urlsplit(url)
+    try:
+        addresses = resolve_public(
+            parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80), allow_private,
+        )
+    except (socket.gaierror, UnicodeError, ValueError) as exc:
+        return None, str(exc)
+    address = str(addresses[0])
+    # Sans proxy : c'est lui qui résoudrait l'hôte, hors de la vérification
+    opener = urllib.request.build_opener(
+        urllib.request.ProxyHandler({}), NoRedirect,
+        PinnedHTTPHandler(address), PinnedHTTPSHandler(address),
+    )
+    request = urllib.request.Request(url, data=body, headers=headers, method='POST')
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            return response.status, ''
+    except urllib.error.HTTPError as exc:
+        return exc.code, f'HTTP {exc.code}'
+    except (urllib.error.URLError, OSError) as exc:
+        return None, str(getattr(exc, 'reason', exc))
+
+
+def build_request(endpoint, deliveries):
+    body = json.dumps({
+        'deliveries': [
+            {
+                'id': delivery.pk,
+                'event': delivery.event,
+                'created_at': delivery.created_at,
+                'data': delivery.payload,
+            }
+            for delivery in deliveries
+        ]
+    }, cls=JSONEncoder).encode()
+    timestamp = str(int(time.time()))
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'Talkback-Webhooks/1.0',
+        TIMESTAMP_HEADER: timestamp,
+        SIGNATURE_HEADER: sign(endpoint.secret, timestamp, body),
+    }
+    return headers, body
+
+
+def process_batch(executor, limiter, options=None):
+    """
+    Un passage du worker : réserve, regroupe par webhook (BATCH_SIZE événements par
+    requête), envoie en parallèle puis enregistre les résultats. Renvoie le nombre de
+    livraisons traitées (envoyées ou reportées).
+    """
+    options = options or settings.WEBHOOKS
+    limit = options['BATCH_SIZE'] * options['CONCURRENCY']
+    deliveries = claim(limit, options['LEASE'])
+    if not deliveries:
+        return 0
+
+    by_endpoint = defaultdict(list)
+    for delivery in deliveries:
+        by_endpoint[delivery.endpoint_id].append(delivery)
+
+    futures, throttled = {}, []
+    for group in by_endpoint.values():
+        endpoint = group[0].endpoint
+        for offset in range(0, len(group), options['BATCH_SIZE']):
+            chunk = group[offset:offset + options['BATCH_SIZE']]
+            wait = limiter.acquire(endpoint)
+            if wait:
+                throttled.append((chunk, wait))
+                continue
+            headers, body = build_request(endpoint, chunk)
+            future = executor.submit(
+                post, endpoint.url, headers, body, options['TIMEOUT'],
+                options.get('ALLOW_PRIVATE_TARGETS', False),
+            )
+            futures[future] = chunk
+
+    now = timezone.now()
+    updated = []
+    for future, chunk in futures.items():
+        rejected = False
+        try:
+            status, error = future.result()
+        except UnsafeTarget as exc:
+            # Hôte refusé, comme à l'abonnement : livraison abandonnée sans nouvelle tentative
+            status, error, rejected = None, str(exc), True
+        for delivery in chunk:
+            delivery.attempts += 1
+            delivery.response_status = status
+            delivery.locked_until = None
+            if status is not None and 200 <= status < 300:
+                delivery.status = 'delivered'
+                delivery.delivered_at = now
+                delivery.last_error = ''
+            elif rejected or delivery.attempts >= options['MAX_ATTEMPTS']:
+                delivery.status = 'failed'
+                delivery.last_error = error
+            else:
+                delivery.next_attempt_at = now + backoff(delivery.attempts, options)
+                delivery.last_error = error
+            updated.append(delivery)
+
+    # Limite de débit atteinte : remis en file sans compter de tentative
+    for chunk, wait in throttled:
+        for delivery in chunk:
+            delivery.locked_until = None
+            delivery.next_attempt_at = now + timedelta(seconds=wait)
+            updated.append(delivery)
+
+    WebhookDelivery.objects.bulk_update(updated, [
+        'status', 'attempts', 'response_status', 'locked_until', 'next_attempt_at',
+        'last_error', 'delivered_at',
+    ])
+    return len(updated)
+
+
+def run_worker(once=False, poll_interval=1.0, options=None, stop=None):
+    """Boucle du worker ; once=True traite la file jusqu'à ce qu'elle soit vide"""
+    options = options or settings.WEBHOOKS
+    limiter = RateLimiter()
+    processed = 0
+    with ThreadPoolExecutor(max_workers=options['CONCURRENCY']) as executor:
+        while not (stop and stop.is_set()):
+            count = process_batch(executor, limiter, options)
+            processed += count
+            if count:
+                continue
+            if once:
+                break
+            time.sleep(poll_interval)
+    return processed
@@ -0,0 +1,37 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from webhooks.delivery import run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Envoie les webhooks en attente (outbox) : requêtes groupées par URL, envoyées en "
+        "parallèle, avec nouvelles tentatives espacées et limite de débit par webhook. "
+        "Plusieurs workers peuvent tourner en même temps sur PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Vide la file puis s'arrête")
+        parser.add_argument('--concurrency', type=int, default=settings.WEBHOOKS['CONCURRENCY'])
+        parser.add_argument('--batch-size', type=int, default=settings.WEBHOOKS['BATCH_SIZE'])
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        webhook_options = {
+            **settings.WEBHOOKS,
+            'CONCURRENCY': options['concurrency'],
+            'BATCH_SIZE': options['batch_size'],
+        }
+        # Arrêt propre : le passage en cours se termine avant la sortie
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *args: stop.set())
+
+        processed = run_worker(
+            once=options['once'], poll_interval=options['poll_interval'],
+            options=webhook_options, stop=stop,
+        )
+        self.stdout.write(self.style.SUCCESS(f"{processed} livraisons traitées"))
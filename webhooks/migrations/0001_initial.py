@@ -0,0 +1,126 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:57
+
+import django.db.models.deletion
+import webhooks.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookEndpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("url", models.URLField(max_length=500, verbose_name="URL")),
+                (
+                    "secret",
+                    models.CharField(
+                        default=webhooks.models.generate_secret,
+                        max_length=64,
+                        verbose_name="Secret",
+                    ),
+                ),
+                ("events", models.JSONField(default=list, verbose_name="Événements")),
+                ("is_active", models.BooleanField(default=True, verbose_name="Actif")),
+                (
+                    "rate_limit",
+                    models.PositiveIntegerField(default=60, verbose_name="Limite par minute"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Date de création"),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="webhook_endpoints",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Propriétaire",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Webhook",
+                "verbose_name_plural": "Webhooks",
+            },
+        ),
+        migrations.CreateModel(
+            name="WebhookDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("event", models.CharField(max_length=50, verbose_name="Événement")),
+                ("payload", models.JSONField(verbose_name="Contenu")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "En attente"),
+                            ("delivered", "Livré"),
+                            ("failed", "Abandonné"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Statut",
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0, verbose_name="Tentatives")),
+                ("next_attempt_at", models.DateTimeField(verbose_name="Prochaine tentative")),
+                (
+                    "locked_until",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Réservé jusqu'à"),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="Dernière erreur")),
+                (
+                    "response_status",
+                    models.PositiveIntegerField(blank=True, null=True, verbose_name="Code HTTP"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Date de création"),
+                ),
+                (
+                    "delivered_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Date de livraison"),
+                ),
+                (
+                    "endpoint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="webhooks.webhookendpoint",
+                        verbose_name="Webhook",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Livraison de webhook",
+                "verbose_name_plural": "Livraisons de webhooks",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["next_attempt_at"],
+                        name="webhook_delivery_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
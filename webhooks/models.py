@@ -1,3 +1,95 @@
+import secrets
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookEndpoint(models.Model):
+    """
+    Abonnement d'un partenaire aux changements du programme.
+    """
+
+    EVENT_CHOICES = [
+        ("talk.created", "Talk créé"),
+        ("talk.updated", "Talk modifié"),
+        ("talk.status_changed", "Statut d'un talk modifié"),
+        ("talk.deleted", "Talk supprimé"),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="webhook_endpoints",
+        verbose_name="Propriétaire",
+    )
+    url = models.URLField(max_length=500, verbose_name="URL")
+    # Clé HMAC des signatures (en-tête X-Talkback-Signature)
+    secret = models.CharField(max_length=64, default=generate_secret, verbose_name="Secret")
+    events = models.JSONField(default=list, verbose_name="Événements")
+    is_active = models.BooleanField(default=True, verbose_name="Actif")
+    # Requêtes par minute au plus vers cette URL
+    rate_limit = models.PositiveIntegerField(default=60, verbose_name="Limite par minute")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+
+    class Meta:
+        verbose_name = "Webhook"
+        verbose_name_plural = "Webhooks"
+
+    def __str__(self):
+        return self.url
+
+    def subscribes_to(self, event):
+        # Liste vide : tous les événements
+        return not self.events or event in self.events
+
+
+class WebhookDelivery(models.Model):
+    """
+    Événement à livrer (outbox) : écrit dans la même transaction que le changement,
+    puis envoyé par le worker (manage.py webhook_worker).
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "En attente"),
+        ("delivered", "Livré"),
+        ("failed", "Abandonné"),
+    ]
+
+    endpoint = models.ForeignKey(
+        WebhookEndpoint,
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+        verbose_name="Webhook",
+    )
+    event = models.CharField(max_length=50, verbose_name="Événement")
+    payload = models.JSONField(verbose_name="Contenu")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default="pending", verbose_name="Statut"
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentatives")
+    next_attempt_at = models.DateTimeField(verbose_name="Prochaine tentative")
+    # Réservation par un worker : passé ce délai, un autre worker peut la reprendre
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Réservé jusqu'à")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+    response_status = models.PositiveIntegerField(null=True, blank=True, verbose_name="Code HTTP")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    delivered_at = models.DateTimeField(null=True, blank=True, verbose_name="Date de livraison")
+
+    class Meta:
+        verbose_name = "Livraison de webhook"
+        verbose_name_plural = "Livraisons de webhooks"
+        indexes = [
+            # File du worker : livraisons en attente par échéance
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="webhook_delivery_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event} -> {self.endpoint_id}"
@@ -0,0 +1,61 @@
+import socket
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from rest_framework import serializers
+
+from .delivery import UnsafeTarget, resolve_public
+from .models import WebhookDelivery, WebhookEndpoint
+
+EVENTS = [event for event, _ in WebhookEndpoint.EVENT_CHOICES]
+
+
+def validate_public_url(url):
+    """
+    Le worker envoie des requêtes vers cette URL : http(s) seulement, vers un hôte dont
+    toutes les adresses sont publiques (ni boucle locale, ni réseau privé, ni lien local).
+    Le worker refait la même vérification à chaque envoi (webhooks.delivery.post).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        raise serializers.ValidationError("Seules les URL http et https sont acceptées.")
+    if not parts.hostname:
+        raise serializers.ValidationError("Hôte manquant.")
+    try:
+        resolve_public(parts.hostname, parts.port or None,
+                       settings.WEBHOOKS.get('ALLOW_PRIVATE_TARGETS', False))
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise serializers.ValidationError("Hôte introuvable.")
+    except UnsafeTarget:
+        raise serializers.ValidationError("Les adresses locales ou privées sont refusées.")
+    return url
+
+
+class WebhookEndpointSerializer(serializers.ModelSerializer):
+    events = serializers.ListField(
+        child=serializers.ChoiceField(choices=EVENTS), allow_empty=True, required=False
+    )
+
+    class Meta:
+        model = WebhookEndpoint
+        fields = ['id', 'url', 'events', 'is_active', 'rate_limit', 'secret', 'created_at']
+        read_only_fields = ['id', 'secret', 'created_at']
+
+    def validate_url(self, value):
+        return validate_public_url(value)
+
+    def validate_rate_limit(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Au moins une requête par minute.")
+        return value
+
+
+class WebhookDeliverySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WebhookDelivery
+        fields = [
+            'id', 'event', 'payload', 'status', 'attempts', 'next_attempt_at',
+            'response_status', 'last_error', 'created_at', 'delivered_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Talk
+from core.signals import talks_saved_in_bulk
+
+from .delivery import enqueue, talk_payload
+
+
+def talk_events(talk, created, previous_status=None):
+    if created:
+        return [('talk.created', talk_payload(talk))]
+    events = [('talk.updated', talk_payload(talk))]
+    if previous_status is not None and previous_status != talk.status:
+        events.append(('talk.status_changed', talk_payload(talk, previous_status=previous_status)))
+    return events
+
+
+@receiver(post_save, sender=Talk)
+def enqueue_talk_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # Ancien statut lu par core.signals.remember_talk_state
+    previous = getattr(instance, '_previous_state', None) or {}
+    enqueue(talk_events(instance, created, previous.get('status')))
+
+
+@receiver(post_delete, sender=Talk)
+def enqueue_talk_deletion(sender, instance, **kwargs):
+    enqueue([('talk.deleted', {'id': str(instance.pk)})])
+
+
+@receiver(talks_saved_in_bulk)
+def enqueue_bulk_talk_changes(sender, talks, created, previous=None, **kwargs):
+    previous = previous or {}
+    enqueue([
+        event
+        for talk in talks
+        for event in talk_events(talk, created, previous.get(talk.pk))
+    ])
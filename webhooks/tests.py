@@ -1,3 +1,331 @@
+import datetime
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.bulk_import import import_talks
+from core.models import Room, Talk, User
+from core.review import review_talks
+
+from .delivery import (
+    SIGNATURE_HEADER, TIMESTAMP_HEADER, RateLimiter, process_batch, run_worker, verify_signature,
+)
+from .models import WebhookDelivery, WebhookEndpoint
+
+
+class StubServer:
+    """
+    Serveur HTTP local qui enregistre les requêtes reçues ; les `failures` premières
+    réponses sont des 500.
+    """
+
+    def __init__(self, failures=0):
+        self.requests = []
+        self.failures = failures
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                stub.requests.append((dict(self.headers), body))
+                failing = stub.failures > 0
+                stub.failures -= failing
+                self.send_response(500 if failing else 200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/hook'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def events(self):
+        return [
+            delivery['event']
+            for _, body in self.requests
+            for delivery in json.loads(body)['deliveries']
+        ]
+
+
+class WebhookTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.organizer = User.objects.create_user(
+            username='orga', email='orga@example.com', password='pass', role='organizer'
+        )
+        self.speaker = User.objects.create_user(
+            username='alice', email='alice@example.com', password='pass', role='speaker'
+        )
+        self.room = Room.objects.create(name='Salle A')
+
+    def subscribe(self, url, **kwargs):
+        return WebhookEndpoint.objects.create(owner=self.organizer, url=url, **kwargs)
+
+    def create_talk(self, hour=9, **kwargs):
+        start = timezone.make_aware(datetime.datetime(2025, 6, 12, hour))
+        return Talk.objects.create(
+            title=f'Talk {hour}', description='Description', start=start,
+            end=start + datetime.timedelta(minutes=45), startdate=start.date(),
+            level='beginner', speaker=self.speaker, room=self.room, **kwargs,
+        )
+
+    def deliver(self, **overrides):
+        # Le serveur de test écoute sur 127.0.0.1
+        options = {**settings.WEBHOOKS, 'CONCURRENCY': 4, 'ALLOW_PRIVATE_TARGETS': True, **overrides}
+        return run_worker(once=True, options=options)
+
+
+class OutboxTests(WebhookTestMixin, TestCase):
+    """
+    Les changements de talks alimentent l'outbox, sans appel HTTP dans la requête.
+    """
+
+    def test_failed_enqueue_rolls_back_the_talk_write(self):
+        talk = self.create_talk()
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+
+        with mock.patch('webhooks.signals.enqueue', side_effect=RuntimeError('outbox')):
+            with self.assertRaises(RuntimeError):
+                client.patch(f'/talks/{talk.pk}/', {
+                    'title': 'Renommé', 'speaker': str(self.speaker.pk), 'room': self.room.pk,
+                }, format='json')
+
+        talk.refresh_from_db()
+        self.assertEqual(talk.title, 'Talk 9')
+
+    def test_create_update_and_status_change_are_queued(self):
+        self.subscribe('http://partner.invalid/hook')
+
+        talk = self.create_talk()
+        talk.title = 'Nouveau titre'
+        talk.save()
+        talk.status = 'accepted'
+        talk.save()
+
+        events = list(WebhookDelivery.objects.order_by('id').values_list('event', flat=True))
+        self.assertEqual(events, [
+            'talk.created', 'talk.updated', 'talk.updated', 'talk.status_changed',
+        ])
+        changed = WebhookDelivery.objects.get(event='talk.status_changed')
+        self.assertEqual(changed.payload['previous_status'], 'pending')
+
+    def test_only_subscribed_events_are_queued(self):
+        self.subscribe('http://partner.invalid/hook', events=['talk.status_changed'])
+        self.subscribe('http://inactive.invalid/hook', is_active=False)
+
+        talk = self.create_talk()
+        talk.status = 'rejected'
+        talk.save()
+
+        self.assertEqual(WebhookDelivery.objects.get().event, 'talk.status_changed')
+
+    def test_bulk_import_queues_created_events(self):
+        self.subscribe('http://partner.invalid/hook')
+        rows = [
+            {'title': f'Import {hour}', 'start': f'2025-06-13T{hour}:00:00Z',
+             'end': f'2025-06-13T{hour}:45:00Z', 'level': 'advanced', 'speaker': str(self.speaker.id)}
+            for hour in (10, 11, 12)
+        ]
+
+        import_talks(rows, organizer=self.organizer)
+
+        self.assertEqual(WebhookDelivery.objects.filter(event='talk.created').count(), 3)
+
+    def test_bulk_review_queues_status_changes(self):
+        self.subscribe('http://partner.invalid/hook', events=['talk.status_changed'])
+        talks = [self.create_talk(hour) for hour in (9, 10)]
+
+        review_talks(self.organizer, {talks[0].pk: 'accepted', talks[1].pk: 'pending'})
+
+        changed = WebhookDelivery.objects.get()
+        self.assertEqual(changed.payload['id'], str(talks[0].pk))
+        self.assertEqual(changed.payload['previous_status'], 'pending')
+
+
+class DeliveryTests(WebhookTestMixin, TestCase):
+    """
+    Envoi par le worker vers un serveur HTTP local.
+    """
+
+    def test_events_are_batched_and_signed(self):
+        with StubServer() as stub:
+            endpoint = self.subscribe(stub.url)
+            for hour in (9, 10, 11):
+                self.create_talk(hour)
+
+            self.deliver()
+
+        self.assertEqual(len(stub.requests), 1)
+        headers, body = stub.requests[0]
+        self.assertTrue(verify_signature(
+            endpoint.secret, headers[TIMESTAMP_HEADER], body, headers[SIGNATURE_HEADER]
+        ))
+        self.assertFalse(verify_signature('autre', headers[TIMESTAMP_HEADER], body,
+                                          headers[SIGNATURE_HEADER]))
+        self.assertEqual(stub.events(), ['talk.created'] * 3)
+        self.assertEqual(WebhookDelivery.objects.filter(status='delivered').count(), 3)
+
+    def test_failures_are_retried_with_backoff(self):
+        with StubServer(failures=1) as stub:
+            self.subscribe(stub.url)
+            self.create_talk()
+
+            self.deliver()
+            delivery = WebhookDelivery.objects.get()
+            self.assertEqual((delivery.status, delivery.attempts), ('pending', 1))
+            self.assertEqual(delivery.response_status, 500)
+            self.assertGreater(delivery.next_attempt_at, timezone.now())
+
+            # Échéance atteinte : la tentative suivante réussit
+            WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+            self.deliver()
+
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.attempts), ('delivered', 2))
+
+    def test_delivery_is_abandoned_after_max_attempts(self):
+        self.subscribe('http://127.0.0.1:9/unreachable')
+        self.create_talk()
+
+        self.deliver(MAX_ATTEMPTS=1, TIMEOUT=1)
+
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, 'failed')
+        self.assertTrue(delivery.last_error)
+
+    def test_rate_limit_defers_without_counting_an_attempt(self):
+        with StubServer() as stub:
+            self.subscribe(stub.url, rate_limit=1)
+            for hour in (9, 10, 11):
+                self.create_talk(hour)
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                process_batch(executor, RateLimiter(), {
+                    **settings.WEBHOOKS, 'BATCH_SIZE': 2, 'ALLOW_PRIVATE_TARGETS': True,
+                })
+
+        self.assertEqual(len(stub.requests), 1)
+        deferred = WebhookDelivery.objects.get(status='pending')
+        self.assertEqual(deferred.attempts, 0)
+        self.assertGreater(deferred.next_attempt_at, timezone.now() + datetime.timedelta(seconds=30))
+
+    def resolve_as(self, addresses):
+        # Résolution DNS simulée au moment de l'envoi ; renvoie la liste des hôtes résolus
+        resolve, lookups = socket.getaddrinfo, []
+
+        def getaddrinfo(host, *args, **kwargs):
+            lookups.append(host)
+            if host in addresses:
+                return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (addresses[host], 80))]
+            return resolve(host, *args, **kwargs)
+
+        patcher = mock.patch('webhooks.delivery.socket.getaddrinfo', getaddrinfo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return lookups
+
+    def test_host_rebound_to_private_address_is_rejected_at_send_time(self):
+        with StubServer() as stub:
+            port = stub.server.server_port
+            # Public à l'abonnement, puis résolu vers la boucle locale
+            self.subscribe(f'http://partner.example.com:{port}/hook')
+            self.create_talk()
+            self.resolve_as({'partner.example.com': '127.0.0.1'})
+
+            self.deliver(ALLOW_PRIVATE_TARGETS=False)
+
+        self.assertEqual(stub.requests, [])
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual((delivery.status, delivery.attempts), ('failed', 1))
+        self.assertIn('127.0.0.1', delivery.last_error)
+
+    def test_connection_goes_to_the_checked_address(self):
+        with StubServer() as stub:
+            port = stub.server.server_port
+            self.subscribe(f'http://partner.example.com:{port}/hook')
+            self.create_talk()
+            lookups = self.resolve_as({'partner.example.com': '127.0.0.1'})
+
+            self.deliver()
+
+        # Une seule résolution : la connexion ne redemande pas l'adresse au DNS
+        self.assertEqual(lookups.count('partner.example.com'), 1)
+        headers, _ = stub.requests[0]
+        self.assertEqual(headers['Host'], f'partner.example.com:{port}')
+        self.assertEqual(WebhookDelivery.objects.get().status, 'delivered')
+
+
+class WebhookApiTests(WebhookTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # Résolution DNS simulée : partner.example.com est public, internal.example.com privé
+        addresses = {'partner.example.com': '93.184.215.14', 'internal.example.com': '10.0.0.5'}
+        resolve = socket.getaddrinfo
+
+        def getaddrinfo(host, *args, **kwargs):
+            if host in addresses:
+                return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (addresses[host], 443))]
+            return resolve(host, *args, **kwargs)
+
+        patcher = mock.patch('webhooks.serializers.socket.getaddrinfo', getaddrinfo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_organizer_manages_own_webhooks(self):
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+
+        response = client.post('/webhooks/', {
+            'url': 'https://partner.example.com/hook', 'events': ['talk.created'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['secret']), 64)
+        self.create_talk()
+        deliveries = client.get(f"/webhooks/{response.json()['id']}/deliveries/").json()
+        self.assertEqual([d['event'] for d in deliveries['results']], ['talk.created'])
+
+    def test_invalid_events_and_other_roles_are_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+        response = client.post('/webhooks/', {
+            'url': 'https://partner.example.com/hook', 'events': ['talk.exploded'],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        client.force_authenticate(self.speaker)
+        self.assertEqual(client.get('/webhooks/').status_code, 403)
 
-# Create your tests here.
+    def test_local_and_private_targets_are_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+        for url in [
+            'ftp://partner.example.com/hook',
+            'http://127.0.0.1:8000/hook',
+            'http://[::1]/hook',
+            'http://169.254.169.254/latest/meta-data/',
+            'http://192.168.1.10/hook',
+            'https://internal.example.com/hook',
+        ]:
+            response = client.post('/webhooks/', {'url': url}, format='json')
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('url', response.json())
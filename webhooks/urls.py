@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import WebhookDeliveryListView, WebhookEndpointDetailView, WebhookEndpointListCreateView
+
+urlpatterns = [
+    path('', WebhookEndpointListCreateView.as_view(), name='webhook-list-create'),
+    path('<int:pk>/', WebhookEndpointDetailView.as_view(), name='webhook-detail'),
+    path('<int:pk>/deliveries/', WebhookDeliveryListView.as_view(), name='webhook-deliveries'),
+]
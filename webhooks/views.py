@@ -1,3 +1,46 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
 
-# Create your views here.
+from core.pagination import KeysetCursorPagination
+from core.permissions import IsOrganizer
+
+from .models import WebhookEndpoint
+from .serializers import WebhookDeliverySerializer, WebhookEndpointSerializer
+
+
+class DeliveryCursorPagination(KeysetCursorPagination):
+    ordering = ('-created_at', '-id')
+    tiebreaker = 'id'
+
+
+# Vue pour lister et créer les webhooks de l'organisateur connecté
+class WebhookEndpointListCreateView(generics.ListCreateAPIView):
+    serializer_class = WebhookEndpointSerializer
+    permission_classes = [IsOrganizer]
+    pagination_class = None
+
+    def get_queryset(self):
+        return WebhookEndpoint.objects.filter(owner=self.request.user).order_by('created_at')
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+
+# Vue pour consulter, modifier ou supprimer un de ses webhooks
+class WebhookEndpointDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = WebhookEndpointSerializer
+    permission_classes = [IsOrganizer]
+
+    def get_queryset(self):
+        return WebhookEndpoint.objects.filter(owner=self.request.user)
+
+
+# Vue pour suivre les livraisons d'un webhook (plus récentes d'abord)
+class WebhookDeliveryListView(generics.ListAPIView):
+    serializer_class = WebhookDeliverySerializer
+    permission_classes = [IsOrganizer]
+    pagination_class = DeliveryCursorPagination
+
+    def get_queryset(self):
+        endpoint = get_object_or_404(WebhookEndpoint, pk=self.kwargs['pk'], owner=self.request.user)
+        return endpoint.deliveries.all()